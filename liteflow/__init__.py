@@ -1,10 +1,12 @@
 from flask import Flask, send_from_directory, redirect, url_for, jsonify, request
 from pathlib import Path
-from .utils.workflow import ConfigManager
+from .utils.workflow import ConfigManager, ImportJobManager, PipelineLoader, RefreshScheduler, SearchIndex
 from dotenv import load_dotenv
 from .config import Config
 from . import models
 from .utils.cache import init_cache
+from .utils.blob_store import init_blob_store
+from .utils.github_http import init_github_http
 from flask_jwt_extended import JWTManager, create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from datetime import timedelta
 import json
@@ -19,9 +21,21 @@ def create_app():
     models.db.init_app(app)
     with app.app_context():
         models.db.create_all()
+        # Full-text search table (FTS5 virtual table, not a model)
+        SearchIndex(app).create_table()
         
     # Initialize cache
     init_cache(app)
+    init_blob_store(app)
+    init_github_http(app)
+
+    # One pipeline loader (thread pool, in-flight loads) shared by the
+    # pipelines page, its API and the refresh scheduler
+    app.extensions['pipeline_loader'] = PipelineLoader(app)
+    # One import job pool shared by the import page and the import APIs
+    app.extensions['import_job_manager'] = ImportJobManager(app)
+    # The refresh scheduler of this process, whose status the refresh API serves
+    app.extensions['refresh_scheduler'] = RefreshScheduler(app)
     
     # Configure JWT
     app.config["JWT_SECRET_KEY"] = app.config["JWT_SECRET_KEY"]
@@ -98,6 +112,14 @@ def create_app():
     from .routes.api.storage_download import init_app as init_api__storage_download
     from .routes.api.cache import init_app as init_api__cache
     from .routes.api.create_run_config import init_app as init_api__create_run_config
+    from .routes.api.refresh import init_app as init_api__refresh
+    from .routes.api.metrics import init_app as init_api__metrics
+    from .routes.api.import_jobs import init_app as init_api__import_jobs
+    from .routes.api.import_pipelines import init_app as init_api__import_pipelines
+    from .routes.api.commits import init_app as init_api__commits
+    from .routes.api.pipelines import init_app as init_api__pipelines
+    from .routes.api.search import init_app as init_api__search
+    from .routes.api.schema_diff import init_app as init_api__schema_diff
 
     # Create required directories
     root_dir = Path(app.config['ROOT_DIR'])
@@ -125,5 +147,16 @@ def create_app():
     init_api__storage_download(app)
     init_api__cache(app)
     init_api__create_run_config(app)
+    init_api__refresh(app)
+    init_api__metrics(app)
+    init_api__import_jobs(app)
+    init_api__import_pipelines(app)
+    init_api__commits(app)
+    init_api__pipelines(app)
+    init_api__search(app)
+    init_api__schema_diff(app)
+
+    # Keep pipelines refs warm in the background (one process only)
+    app.extensions['refresh_scheduler'].start()
 
     return app
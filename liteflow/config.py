@@ -23,12 +23,61 @@ LITEFLOW_LOGIN_PASSWORD: The password for logging in to LiteFlow. Default is a
 LITEFLOW_SECRET_KEY: The secret key for LiteFlow. Default is a random string.
 LITEFLOW_GITHUB_TOKEN: The GitHub token for LiteFlow. Default is an empty
     string.
+LITEFLOW_GITHUB_HOST: Host of the GitHub instance. Other hosts than github.com
+    are reached as GitHub Enterprise ({protocol}://{host}/api/v3), which also
+    allows pointing LiteFlow to a local stub server. Default is 'github.com'.
+LITEFLOW_GITHUB_PROTOCOL: Protocol used with LITEFLOW_GITHUB_HOST. Default is
+    'https'.
+LITEFLOW_GITHUB_TIMEOUT: Read timeout in seconds of GitHub API calls. Default
+    is 30 seconds.
+LITEFLOW_GITHUB_MAX_RETRIES: Number of retries of GitHub API calls failing
+    with a connection error, a 5xx or a rate limit answer. Default is 3.
+LITEFLOW_GITHUB_MAX_WAIT: Longest delay in seconds waited before retrying a
+    rate limited GitHub API call; longer delays fail immediately. Default is
+    60 seconds.
+LITEFLOW_GITHUB_REQUESTS_PER_SECOND: Sustained rate of GitHub API calls shared
+    by all threads of a process. Default is 10.
+LITEFLOW_GITHUB_REQUESTS_BURST: Number of GitHub API calls allowed in a burst
+    above LITEFLOW_GITHUB_REQUESTS_PER_SECOND. Default is 50.
 LITEFLOW_SQLALCHEMY_DATABASE_URI: The database URI for LiteFlow. Default is
     'sqlite:/{root_dir}/liteflow.db'.
 LITEFLOW_STORAGE_CONFIG: Path to a YAML file containing storage backend
     configurations. If not provided, default storage backends will be used.
     The YAML file can use {{ROOT_DIR}} as a placeholder for the LiteFlow root
     directory.
+LITEFLOW_PIPELINES_LOAD_TIMEOUT: Deadline in seconds for loading the metadata
+    of all pipelines on the pipelines page. Pipelines not loaded in time are
+    shown as loading. Default is 10 seconds.
+LITEFLOW_PIPELINES_LOAD_WORKERS: Number of threads used to load pipelines
+    metadata concurrently. Default is 8.
+LITEFLOW_REFRESH_INTERVAL: Interval in seconds between two background
+    refreshes of the refs, default branch and manifest of all imported
+    pipelines. 0 disables the background refresh. Default is 1800 seconds.
+LITEFLOW_REFRESH_MIN_RATE_LIMIT: Remaining GitHub API quota under which the
+    background refresh pauses until the quota resets. Default is 100.
+LITEFLOW_IMPORT_WARM_TAGS: Number of most recent tags (by version order) whose
+    config, schema and README are fetched in the background when a pipeline
+    is imported, in addition to the default branch. Default is 3.
+LITEFLOW_CACHE_STALE_TIMEOUT: How long in seconds GitHub cache entries are kept
+    after expiring, to be served while they are refreshed in the background
+    or when GitHub is unreachable. Default is 604800 seconds (7 days).
+LITEFLOW_CACHE_NEGATIVE_TIMEOUT: How long in seconds the absence of a file
+    or value (e.g. a file answering 404 on GitHub) is cached before asking
+    again. Default is 300 seconds.
+LITEFLOW_CACHE_MEMORY_MAX_SIZE: Maximum size in bytes of the in-process
+    cache kept by each worker in front of the filesystem cache. 0 disables it.
+    Default is 67108864 bytes (64 MiB).
+LITEFLOW_CACHE_MEMORY_TIMEOUT: How long in seconds a worker serves a cache
+    entry from memory before reading the filesystem cache again. 0 disables
+    the in-process cache. Default is 30 seconds.
+LITEFLOW_CACHE_FILL_TIMEOUT: How long in seconds a worker missing a cache
+    entry waits for another worker or thread filling it before fetching it
+    itself. Default is 10 seconds.
+LITEFLOW_CACHE_LOG_SAMPLE_RATE: Share (0 to 1) of the cache hits, misses and
+    fills logged per key at DEBUG level. Aggregated counters are served at
+    /api/cache/stats. Default is 0.01.
+LITEFLOW_BLOB_STORE_MAX_SIZE: Maximum size in bytes of the store of pipeline
+    files at a given commit. Default is 536870912 bytes (512 MiB).
 JWT_SECRET_KEY: The secret key for JWT. Default is the same as
     LITEFLOW_SECRET_KEY.
 JWT_ACCESS_TOKEN_EXPIRES: The expiration time for JWT access tokens.
@@ -48,6 +97,15 @@ class Config:
     PASSWORD_HASH = os.getenv('LITEFLOW_LOGIN_PASSWORD_HASH', None)
     if not PASSWORD_HASH: password = os.getenv('LITEFLOW_LOGIN_PASSWORD', None)
     GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')
+    GITHUB_HOST = os.getenv('LITEFLOW_GITHUB_HOST', 'github.com')
+    GITHUB_PROTOCOL = os.getenv('LITEFLOW_GITHUB_PROTOCOL', 'https')
+    GITHUB_TIMEOUT = float(os.getenv('LITEFLOW_GITHUB_TIMEOUT', 30))
+    GITHUB_MAX_RETRIES = int(os.getenv('LITEFLOW_GITHUB_MAX_RETRIES', 3))
+    GITHUB_MAX_WAIT = float(os.getenv('LITEFLOW_GITHUB_MAX_WAIT', 60))
+    GITHUB_REQUESTS_PER_SECOND = float(
+        os.getenv('LITEFLOW_GITHUB_REQUESTS_PER_SECOND', 10)
+    )
+    GITHUB_REQUESTS_BURST = int(os.getenv('LITEFLOW_GITHUB_REQUESTS_BURST', 50))
     SQLALCHEMY_DATABASE_URI = os.getenv(
         "LITEFLOW_SQLALCHEMY_DATABASE_URI",
         f'sqlite:///{str(ROOT_DIR)}/liteflow.db'
@@ -63,6 +121,17 @@ class Config:
         "LITEFLOW_STORAGE_CONFIG",
         Path(__file__).parent / 'assets' / 'storage_backends.yaml'
     ))
+    PIPELINES_LOAD_TIMEOUT = float(
+        os.getenv('LITEFLOW_PIPELINES_LOAD_TIMEOUT', 10)
+    )
+    PIPELINES_LOAD_WORKERS = int(
+        os.getenv('LITEFLOW_PIPELINES_LOAD_WORKERS', 8)
+    )
+    REFRESH_INTERVAL = int(os.getenv('LITEFLOW_REFRESH_INTERVAL', 1800))
+    REFRESH_MIN_RATE_LIMIT = int(
+        os.getenv('LITEFLOW_REFRESH_MIN_RATE_LIMIT', 100)
+    )
+    IMPORT_WARM_TAGS = int(os.getenv('LITEFLOW_IMPORT_WARM_TAGS', 3))
     
     # make sure the root dir exists
     ROOT_DIR.mkdir(parents=True, exist_ok=True)
@@ -75,7 +144,32 @@ class Config:
     CACHE_DIR = ROOT_DIR / "cache"
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
     CACHE_DEFAULT_TIMEOUT = 3600  # Cache timeout in seconds
+    # Revalidated entries (GitHub) are kept this long past their freshness
+    # to be served stale while refreshing or when GitHub is unreachable
+    CACHE_STALE_TIMEOUT = int(os.getenv('LITEFLOW_CACHE_STALE_TIMEOUT', 604800))
     CACHE_THRESHOLD = 1000  # Maximum number of items in the cache
+    # Values known to be absent (e.g. files answering 404) are cached too
+    CACHE_NEGATIVE_TIMEOUT = int(os.getenv('LITEFLOW_CACHE_NEGATIVE_TIMEOUT', 300))
+    # Generation of each cache namespace, folded into the keys so that
+    # clearing a namespace is a single write seen by every worker
+    CACHE_GENERATIONS_DIR = ROOT_DIR / "cache_generations"
+    # In-process tier in front of the filesystem cache
+    CACHE_MEMORY_MAX_SIZE = int(
+        os.getenv('LITEFLOW_CACHE_MEMORY_MAX_SIZE', 64 * 1024 * 1024)
+    )
+    CACHE_MEMORY_TIMEOUT = int(os.getenv('LITEFLOW_CACHE_MEMORY_TIMEOUT', 30))
+    # Concurrent fills of a missing key are coalesced, across workers with
+    # file locks (kept out of CACHE_DIR, which FileSystemCache prunes)
+    CACHE_LOCKS_DIR = ROOT_DIR / "cache_locks"
+    CACHE_FILL_TIMEOUT = float(os.getenv('LITEFLOW_CACHE_FILL_TIMEOUT', 10))
+    # Share of per-key cache events logged at DEBUG (see /api/cache/stats)
+    CACHE_LOG_SAMPLE_RATE = float(os.getenv('LITEFLOW_CACHE_LOG_SAMPLE_RATE', 0.01))
+
+    # Immutable file contents at a commit SHA, evicted LRU past max size
+    BLOB_STORE_DIR = ROOT_DIR / "blobs"
+    BLOB_STORE_MAX_SIZE = int(
+        os.getenv('LITEFLOW_BLOB_STORE_MAX_SIZE', 512 * 1024 * 1024)
+    )
 
     DATA_DIR = ROOT_DIR / "data"
     DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -73,6 +73,114 @@ class Pipeline(db.Model):
     def __repr__(self):
         return f'<Pipeline {self.org_name}/{self.project_name}>'
 
+class ImportJob(db.Model):
+    __tablename__ = 'import_jobs'
+
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    provider = db.Column(db.String(50), nullable=False)
+    org_name = db.Column(db.String(100), nullable=False)
+    project_name = db.Column(db.String(100), nullable=False)
+    # pending, validating, warming (imported, caches being filled), done or error
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    error = db.Column(db.Text)
+    refs_warmed = db.Column(db.Integer, nullable=False, default=0)
+    refs_to_warm = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def _to_dict(self) -> dict:
+        """Convert import job to dictionary
+
+        Returns:
+            Dictionary representation of import job
+        """
+        return {
+            'id': self.id,
+            'provider': self.provider,
+            'organization': self.org_name,
+            'project': self.project_name,
+            'status': self.status,
+            'error': self.error,
+            'refs_warmed': self.refs_warmed,
+            'refs_to_warm': self.refs_to_warm,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+    def __repr__(self):
+        return f'<ImportJob {self.org_name}/{self.project_name} {self.status}>'
+
+class PipelineCommit(db.Model):
+    """Commit of the default branch history of a repository"""
+    __tablename__ = 'pipeline_commits'
+    __table_args__ = (
+        db.UniqueConstraint('provider', 'org_name', 'project_name', 'sha'),
+        db.Index('ix_pipeline_commits_history', 'provider', 'org_name', 'project_name', 'committed_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    provider = db.Column(db.String(50), nullable=False)
+    org_name = db.Column(db.String(100), nullable=False)
+    project_name = db.Column(db.String(100), nullable=False)
+    sha = db.Column(db.String(64), nullable=False)
+    message = db.Column(db.Text)
+    author = db.Column(db.String(255))
+    committed_at = db.Column(db.DateTime, nullable=False)  # UTC
+
+    def _to_dict(self) -> dict:
+        """Convert commit to dictionary
+
+        Returns:
+            Dictionary representation of commit
+        """
+        return {
+            'sha': self.sha,
+            'short_sha': self.sha[:7],
+            'message': self.message,
+            'author': self.author,
+            'committed_at': self.committed_at.isoformat() + 'Z'
+        }
+
+    def __repr__(self):
+        return f'<PipelineCommit {self.org_name}/{self.project_name}@{self.sha[:7]}>'
+
+class CommitHistoryState(db.Model):
+    """Synchronization state of the stored history of a repository"""
+    __tablename__ = 'commit_history_state'
+    __table_args__ = (
+        db.UniqueConstraint('provider', 'org_name', 'project_name'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    provider = db.Column(db.String(50), nullable=False)
+    org_name = db.Column(db.String(100), nullable=False)
+    project_name = db.Column(db.String(100), nullable=False)
+    branch = db.Column(db.String(255))
+    etag = db.Column(db.String(255))  # Of the last request for new commits
+    complete = db.Column(db.Boolean, nullable=False, default=False)  # Root commit stored
+    synced_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<CommitHistoryState {self.org_name}/{self.project_name}>'
+
+class PipelineRef(db.Model):
+    """Branch, tag or known commit of a repository, for indexed ref lookups"""
+    __tablename__ = 'pipeline_refs'
+    __table_args__ = (
+        db.UniqueConstraint('repo', 'kind', 'name'),
+        # Sorted SHAs: prefix lookups are range scans
+        db.Index('ix_pipeline_refs_sha', 'repo', 'sha'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    repo = db.Column(db.String(255), nullable=False)  # GitRepo.repo_id
+    kind = db.Column(db.String(10), nullable=False)  # branch, tag or commit
+    name = db.Column(db.String(255), nullable=False)  # Full SHA for commits
+    sha = db.Column(db.String(64), nullable=False)
+
+    def __repr__(self):
+        return f'<PipelineRef {self.repo} {self.kind} {self.name}>'
+
 class RunConfig(db.Model):
     __tablename__ = 'run_configs'
     
@@ -1,5 +1,6 @@
 from flask import jsonify
-from ...utils.cache import clear_github_cache, clear_s3_cache
+from ...utils.cache import cache, clear_github_cache, clear_s3_cache
+from ...utils.cache_metrics import cache_metrics
 from flask_jwt_extended import jwt_required
 
 def init_app(app):
@@ -18,3 +19,34 @@ def init_app(app):
             return jsonify({"status": "success", "message": "S3 cache cleared successfully"})
         except Exception as e:
             return jsonify({"status": "error", "message": str(e)}), 500
+
+    @app.route('/api/cache/clear/github/<organization>/<project>', methods=['POST'])
+    def clear_github_repo_cache_endpoint(organization, project):
+        try:
+            clear_github_cache(organization, project)
+            return jsonify({"status": "success", "message": f"GitHub cache of {organization}/{project} cleared successfully"})
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
+
+    @app.route('/api/cache/clear/s3/<storage>/<bucket>', methods=['POST'])
+    def clear_s3_bucket_cache_endpoint(storage, bucket):
+        try:
+            clear_s3_cache(storage, bucket)
+            return jsonify({"status": "success", "message": f"S3 cache of {bucket} cleared successfully"})
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
+
+    @app.route('/api/cache/stats', methods=['GET'])
+    def cache_stats_endpoint():
+        try:
+            return jsonify({**cache_metrics.snapshot(), **cache.stats()})
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
+
+    @app.route('/api/cache/stats/reset', methods=['POST'])
+    def reset_cache_stats_endpoint():
+        try:
+            cache_metrics.reset()
+            return jsonify({"status": "success", "message": "Cache statistics reset successfully"})
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
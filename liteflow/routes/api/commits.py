@@ -0,0 +1,24 @@
+from flask import jsonify, request
+from ... import models
+from ...utils.workflow import CommitHistory
+from flask_jwt_extended import jwt_required
+
+def init_app(app):
+    commit_history = CommitHistory(app)
+
+    # Default branch history, newest first: ?page=1&per_page=50
+    @app.route('/api/pipelines/<organization>/<project>/commits', methods=['GET'])
+    def pipeline_commits(organization: str, project: str):
+        try:
+            page = request.args.get('page', 1, type=int)
+            per_page = request.args.get('per_page', 50, type=int)
+            if page < 1 or not 1 <= per_page <= 100:
+                return jsonify({"status": "error", "message": "page must be >= 1 and per_page within 1-100"}), 400
+            item = models.Pipeline.query.filter_by(org_name=organization, project_name=project).first()
+            if item is None:
+                return jsonify({"status": "error", "message": "Pipeline not found"}), 404
+            return jsonify(commit_history.get_page(item.provider, organization, project, page, per_page))
+        except FileNotFoundError as e:
+            return jsonify({"status": "error", "message": str(e)}), 404
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
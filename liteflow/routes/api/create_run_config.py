@@ -1,6 +1,7 @@
 from flask import jsonify, request
 from ... import models
 from ...utils.workflow.run_config import RunConfigManager
+from ...utils.workflow import get_git_repo, Pipeline
 from flask_jwt_extended import jwt_required
 
 def init_app(app):
@@ -26,7 +27,21 @@ def init_app(app):
                 config = models.Config.query.filter_by(filename=data['selected_config']).first()
                 if config:
                     config_id = config.id
-                    
+
+            # Validate parameters against the schema of the selected ref
+            repo = get_git_repo(pipeline.provider, data['organization'], data['project'])
+            try:
+                pipeline_schema = Pipeline(repo, data['ref'], data['ref_type']).load_schema()
+            except FileNotFoundError as e:
+                return jsonify({'error': f"Pipeline schema not found at {data['ref']}: {e}"}), 404
+            # A config file may provide the required parameters
+            errors = pipeline_schema.validate(data['parameters'], allow_missing=config_id is not None)
+            if errors:
+                return jsonify({
+                    'error': 'Invalid parameters: ' + '; '.join(errors),
+                    'errors': errors
+                }), 400
+
             # Create run config
             run_config = run_config_manager.create_run_config(
                 organization=data['organization'],
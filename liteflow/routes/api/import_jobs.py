@@ -0,0 +1,15 @@
+from flask import jsonify
+from flask_jwt_extended import jwt_required
+
+def init_app(app):
+    import_job_manager = app.extensions['import_job_manager']
+
+    @app.route('/api/import_jobs/<job_id>', methods=['GET'])
+    def import_job_status(job_id: str):
+        try:
+            job = import_job_manager.get(job_id)
+            if job is None:
+                return jsonify({"status": "error", "message": "Import job not found"}), 404
+            return jsonify(job)
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
@@ -0,0 +1,51 @@
+import fnmatch
+from flask import jsonify, request, current_app
+from ...utils.workflow.github_provider import list_repositories
+from ...utils.workflow.registry import PROVIDERS
+from flask_jwt_extended import jwt_required
+
+def init_app(app):
+    import_job_manager = app.extensions['import_job_manager']
+
+    # JSON body: {"repositories": ["org/name", ...]} or
+    # {"organization": "org", "pattern": "glob on repository names"},
+    # optionally with "provider" ("github" by default, or "mirror")
+    @app.route('/api/import_pipelines', methods=['POST'])
+    def import_pipelines():
+        try:
+            data = request.get_json(silent=True) or {}
+            provider_name = data.get('provider', 'github')
+            if provider_name not in PROVIDERS:
+                return jsonify({"status": "error", "message": f"Unsupported provider: {provider_name}"}), 400
+            if data.get('repositories') is not None:
+                repositories = data['repositories']
+                if not isinstance(repositories, list):
+                    return jsonify({"status": "error", "message": "repositories must be a list"}), 400
+            elif data.get('organization'):
+                organization = data['organization']
+                pattern = data.get('pattern') or '*'
+                names = list_repositories(
+                    organization,
+                    host=current_app.config['GITHUB_HOST'],
+                    protocol=current_app.config['GITHUB_PROTOCOL']
+                )
+                repositories = [
+                    f"{organization}/{name}" for name in names
+                    if fnmatch.fnmatchcase(name, pattern)
+                ]
+            else:
+                return jsonify({
+                    "status": "error",
+                    "message": "Provide repositories or an organization"
+                }), 400
+
+            results = import_job_manager.import_many(provider_name, repositories)
+            return jsonify({
+                "status": "success",
+                "imported": sum(result['status'] == 'imported' for result in results),
+                "results": results
+            })
+        except FileNotFoundError as e:
+            return jsonify({"status": "error", "message": str(e)}), 404
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
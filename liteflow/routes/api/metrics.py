@@ -0,0 +1,19 @@
+from flask import jsonify
+from ...utils.github_metrics import github_metrics
+from flask_jwt_extended import jwt_required
+
+def init_app(app):
+    @app.route('/api/metrics/github', methods=['GET'])
+    def github_metrics_endpoint():
+        try:
+            return jsonify(github_metrics.snapshot())
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
+
+    @app.route('/api/metrics/github/reset', methods=['POST'])
+    def reset_github_metrics_endpoint():
+        try:
+            github_metrics.reset()
+            return jsonify({"status": "success", "message": "GitHub metrics reset successfully"})
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
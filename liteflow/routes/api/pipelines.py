@@ -0,0 +1,37 @@
+from flask import jsonify, request
+from ... import models
+from ...utils.workflow import get_git_repo
+from flask_jwt_extended import jwt_required
+
+def init_app(app):
+    pipeline_loader = app.extensions['pipeline_loader']
+
+    def conditional(response):
+        # ETag of the body: unchanged data is answered with 304 Not Modified
+        response.add_etag()
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response.make_conditional(request)
+
+    # Pipeline summaries (no refs), ordered by organization and name:
+    # ?page=1&per_page=50
+    @app.route('/api/pipelines', methods=['GET'])
+    def list_pipelines():
+        try:
+            page = request.args.get('page', 1, type=int)
+            per_page = request.args.get('per_page', 50, type=int)
+            if page < 1 or not 1 <= per_page <= 100:
+                return jsonify({"status": "error", "message": "page must be >= 1 and per_page within 1-100"}), 400
+            return conditional(jsonify(pipeline_loader.load_page(page, per_page)))
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
+
+    @app.route('/api/pipelines/<organization>/<project>/refs', methods=['GET'])
+    def pipeline_refs(organization: str, project: str):
+        try:
+            item = models.Pipeline.query.filter_by(org_name=organization, project_name=project).first()
+            if item is None:
+                return jsonify({"status": "error", "message": "Pipeline not found"}), 404
+            refs = get_git_repo(item.provider, organization, project).get_refs()
+            return conditional(jsonify(refs))
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
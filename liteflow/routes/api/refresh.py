@@ -0,0 +1,12 @@
+from flask import jsonify
+from flask_jwt_extended import jwt_required
+
+def init_app(app):
+    refresh_scheduler = app.extensions['refresh_scheduler']
+
+    @app.route('/api/refresh/status', methods=['GET'])
+    def refresh_status():
+        try:
+            return jsonify(refresh_scheduler.status())
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
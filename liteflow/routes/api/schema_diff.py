@@ -0,0 +1,63 @@
+from flask import jsonify, request
+from ... import models
+from ...utils.workflow import get_git_repo, RunConfigManager
+from ...utils.workflow.schema_diff import get_schema_diff
+from flask_jwt_extended import jwt_required
+
+REF_TYPES = ('branch', 'tag', 'commit')
+
+def init_app(app):
+    run_config_manager = RunConfigManager(app)
+
+    # ?from_ref=1.0&from_type=tag&to_ref=1.1&to_type=tag
+    @app.route('/api/pipelines/<organization>/<project>/schema_diff', methods=['GET'])
+    def pipeline_schema_diff(organization: str, project: str):
+        try:
+            refs = {}
+            for side in ('from', 'to'):
+                ref = request.args.get(f'{side}_ref')
+                ref_type = request.args.get(f'{side}_type', 'tag')
+                if not ref or ref_type not in REF_TYPES:
+                    return jsonify({"status": "error", "message": f"Provide {side}_ref and {side}_type (branch, tag or commit)"}), 400
+                refs[side] = (ref, ref_type)
+            item = models.Pipeline.query.filter_by(org_name=organization, project_name=project).first()
+            if item is None:
+                return jsonify({"status": "error", "message": "Pipeline not found"}), 404
+            repo = get_git_repo(item.provider, organization, project)
+            diff = get_schema_diff(repo, repo.resolve_ref(*refs['from']), repo.resolve_ref(*refs['to']))
+            return jsonify(diff)
+        except KeyError as e:
+            return jsonify({"status": "error", "message": f"Unknown ref: {e}"}), 404
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
+
+    # JSON body: {"organization", "pipeline_name", "run_names": [...],
+    # "to_ref", "to_ref_type", "dry_run": true}
+    @app.route('/api/run_configs/migrate', methods=['POST'])
+    def migrate_run_configs():
+        try:
+            data = request.get_json(silent=True) or {}
+            missing = [field for field in ('organization', 'pipeline_name', 'run_names', 'to_ref') if not data.get(field)]
+            if missing:
+                return jsonify({"status": "error", "message": f"Missing fields: {', '.join(missing)}"}), 400
+            to_ref_type = data.get('to_ref_type', 'tag')
+            if to_ref_type not in REF_TYPES:
+                return jsonify({"status": "error", "message": "to_ref_type must be branch, tag or commit"}), 400
+            dry_run = data.get('dry_run', True)
+            if not isinstance(dry_run, bool):
+                return jsonify({"status": "error", "message": "dry_run must be true or false"}), 400
+            results = run_config_manager.migrate_run_configs(
+                data['organization'],
+                data['pipeline_name'],
+                data['run_names'],
+                data['to_ref'],
+                to_ref_type,
+                dry_run=dry_run
+            )
+            return jsonify({"dry_run": dry_run, "results": results})
+        except FileNotFoundError as e:
+            return jsonify({"status": "error", "message": str(e)}), 404
+        except KeyError as e:
+            return jsonify({"status": "error", "message": f"Unknown ref: {e}"}), 404
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
@@ -0,0 +1,25 @@
+from flask import jsonify, request
+from ...utils.workflow import SearchIndex
+from flask_jwt_extended import jwt_required
+
+def init_app(app):
+    search_index = SearchIndex(app)
+
+    # Full-text search over the imported pipelines: ?q=words&field=params&limit=20
+    # (field: manifest, params or readme)
+    @app.route('/api/search', methods=['GET'])
+    def search_pipelines():
+        try:
+            limit = request.args.get('limit', 20, type=int)
+            if not 1 <= limit <= 100:
+                return jsonify({"status": "error", "message": "limit must be within 1-100"}), 400
+            results = search_index.search(
+                request.args.get('q', ''),
+                field=request.args.get('field') or None,
+                limit=limit
+            )
+            return jsonify({"results": results})
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
@@ -1,12 +1,13 @@
 from flask import render_template, request, redirect, url_for, session, flash, jsonify, make_response
 import os
-from ..utils.workflow.github_provider import GitHubProvider
-from ..utils.workflow.git_repo import GitRepo
 from .. import models
+from ..utils.workflow.registry import PROVIDERS
 from flask_jwt_extended import jwt_required
 from pathlib import Path
 
 def init_app(app):
+    import_job_manager = app.extensions['import_job_manager']
+
     @app.route('/import_pipeline', methods=['GET', 'POST'])
     def import_pipeline():
         if request.method == 'POST':
@@ -17,6 +18,9 @@ def init_app(app):
             if len(repo_data) != 2:
                 error_msg = 'Invalid repository format. Use "organization/pipeline_name".'
                 return jsonify({'error': error_msg}), 400
+            provider_name = request.form.get('provider', 'github')
+            if provider_name not in PROVIDERS:
+                return jsonify({'error': f"Unsupported provider: {provider_name}"}), 400
             
             root_dir = Path(app.config['ROOT_DIR'])
             pipelines_path = root_dir / 'pipelines'
@@ -36,25 +40,16 @@ def init_app(app):
                     flash(success_msg)
                     return response
                 
-                # Initialize provider and repo
-                provider = GitHubProvider(organization, pipeline_name)
-                repo = GitRepo(provider)
-                repo.update_refs()
-                
-                # Create new pipeline record
-                new_pipeline = models.Pipeline(
-                    provider='github',
-                    org_name=organization,
-                    project_name=pipeline_name
-                )
-                
-                models.db.session.add(new_pipeline)
-                models.db.session.commit()
-                
-                success_msg = 'Pipeline imported successfully.'
-                response = jsonify({'success': True, 'message': success_msg})
-                flash(success_msg)
-                return response
+                # Checking the repository and filling the caches happen in
+                # a background job, polled through its status URL
+                job = import_job_manager.submit(provider_name, organization, pipeline_name)
+                return jsonify({
+                    'success': True,
+                    'message': 'Import started.',
+                    'job_id': job['id'],
+                    'status': job['status'],
+                    'status_url': url_for('import_job_status', job_id=job['id'])
+                }), 202
 
             except Exception as e:
                 error_msg = f'Error importing pipeline: {str(e)}'
@@ -4,36 +4,43 @@ from markdown import markdown
 from ..utils.storage import StorageManager
 from ..utils.workflow.config import ConfigManager
 from ..utils.workflow import RunConfigManager
-from ..utils.workflow import GitHubProvider
-from ..utils.workflow import GitRepo
+from ..utils.workflow import get_git_repo
 from ..utils.workflow import Pipeline
+from ..utils.workflow import CommitHistory
+from ..utils.workflow.ref_index import AmbiguousRefError, is_short_sha, recent_tags
+from ..utils.blob_store import is_commit_sha
+from .. import models
 from flask_jwt_extended import jwt_required
 
 def init_app(app):
     storage_manager = StorageManager(app.config)
     config_manager = ConfigManager(app)
     run_config_manager = RunConfigManager(app)
+    commit_history = CommitHistory(app)
 
     @app.route('/pipeline/<organization>/<project>/<ref_type>/<ref>', methods=['GET', 'POST'])
     def pipeline_page(organization: str, project: str, ref_type: str, ref: str):
 
         # Validate ref_type
-        provider = GitHubProvider(organization, project)
-        repo = GitRepo(provider)
-        pipeline_data = Pipeline(repo)
-
         if ref_type not in ['branch', 'tag', 'commit']:
             flash('Invalid reference type', 'error')
             return redirect(url_for('pipelines'))
-        
-        refs = repo.get_refs()
-        
-        if ref_type == 'branch':
-            commit_sha = refs["branches"][ref]
-        elif ref_type == 'tag':
-            commit_sha = refs["tags"][ref]
-        elif ref_type == 'commit':
-            commit_sha = refs["commits"][ref]
+
+        item = models.Pipeline.query.filter_by(org_name=organization, project_name=project).first()
+        if item is None:
+            flash('Pipeline not found', 'error')
+            return redirect(url_for('pipelines'))
+        repo = get_git_repo(item.provider, organization, project)
+        try:
+            commit_sha = repo.resolve_ref(ref, ref_type)
+            if ref_type == 'commit' and not is_commit_sha(commit_sha) and is_short_sha(ref):
+                # Older commits than the indexed ones are found in the stored history
+                commit_sha = commit_history.resolve(item.provider, organization, project, ref) or ref
+        except AmbiguousRefError as e:
+            flash(str(e), 'error')
+            return redirect(url_for('pipelines'))
+
+        pipeline_data = Pipeline(repo, commit_sha if ref_type == 'commit' else ref, ref_type)
 
         # Get list of configs
         all_configs = config_manager.list_configs()
@@ -57,15 +64,9 @@ def init_app(app):
                 flash(f'Error creating run configuration: {str(e)}', category='error')
 
         # Render the template with data
-        schema = json.loads(repo.fetch_file('nextflow_schema.json', commit_sha))
-        if not "definitions" in schema.keys():
-            if "defs" in schema.keys():
-                schema["definitions"] = schema["defs"]
-            elif "$defs" in schema.keys():
-                schema["definitions"] = schema["$defs"]
-            else:
-                schema["definitions"] = {}
-        metadata = pipeline_data.parse_metadata()
+        schema = pipeline_data.load_schema().schema
+        nf_config = pipeline_data.parse_config()
+        metadata = nf_config['manifest']
         return render_template(
             'pipeline.html',
             pipeline = {
@@ -74,11 +75,12 @@ def init_app(app):
                 "name": f"{organization}/{project}",
                 "nextflowVersion": metadata['nextflowVersion'],
                 "head": commit_sha[:7],
-                "description": metadata["description"]
+                "description": metadata["description"],
+                "version": metadata["version"],
+                "author": metadata["author"],
+                "homePage": metadata["homePage"],
+                "profiles": nf_config["profiles"]
             },
-            branches=refs["branches"],
-            tags=refs["tags"],
-            commits=refs["commits"],
             schema=schema,
             readme=repo.get_readme_processed(commit_sha),
             config_files=all_configs,
@@ -86,3 +88,31 @@ def init_app(app):
             ref=ref,
             ref_type=ref_type
         )
+
+    @app.route('/pipeline/<organization>/<project>/schema_diff')
+    def pipeline_schema_diff_page(organization: str, project: str):
+        item = models.Pipeline.query.filter_by(org_name=organization, project_name=project).first()
+        if item is None:
+            flash('Pipeline not found', 'error')
+            return redirect(url_for('pipelines'))
+        repo = get_git_repo(item.provider, organization, project)
+        refs = repo.get_refs()
+        tags = recent_tags(refs['tags'], len(refs['tags']))
+        run_configs = models.RunConfig.query.filter_by(
+            organization=organization,
+            pipeline_name=project
+        ).all()
+        return render_template(
+            'schema_diff.html',
+            pipeline={"organization": organization, "project": project},
+            branches=sorted(refs['branches']),
+            tags=tags,
+            run_configs=[
+                {"run_name": rc.run_name, "ref": rc.ref, "ref_type": rc.ref_type}
+                for rc in run_configs
+            ],
+            from_ref=request.args.get('from_ref', tags[1] if len(tags) > 1 else repo.default_branch),
+            from_type=request.args.get('from_type', 'tag' if len(tags) > 1 else 'branch'),
+            to_ref=request.args.get('to_ref', tags[0] if tags else repo.default_branch),
+            to_type=request.args.get('to_type', 'tag' if tags else 'branch')
+        )
@@ -1,3 +1,10 @@
+// Get the CSRF token from the cookie
+function getCookie(name) {
+    const value = `; ${document.cookie}`;
+    const parts = value.split(`; ${name}=`);
+    if (parts.length === 2) return parts.pop().split(';').shift();
+}
+
 function clearCache(type) {
     const button = document.querySelector('#cacheDropdown');
     const icon = button.querySelector('i');
@@ -11,7 +18,8 @@ function clearCache(type) {
     fetch(`/api/cache/clear/${type}`, {
         method: 'POST',
         headers: {
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            'X-CSRF-TOKEN': getCookie('csrf_access_token')
         }
     })
     .then(response => response.json())
@@ -37,6 +45,89 @@ function clearCache(type) {
     });
 }
 
+function formatBytes(bytes) {
+    const units = ['B', 'KiB', 'MiB', 'GiB'];
+    let value = bytes;
+    let unit = 0;
+    while (value >= 1024 && unit < units.length - 1) {
+        value /= 1024;
+        unit++;
+    }
+    return `${value.toFixed(unit ? 1 : 0)} ${units[unit]}`;
+}
+
+function loadCacheStats() {
+    const rows = document.querySelector('#cacheStatsRows');
+    const summary = document.querySelector('#cacheStatsSummary');
+
+    fetch('/api/cache/stats')
+    .then(response => response.json())
+    .then(data => {
+        if (data.status === 'error') {
+            throw new Error(data.message);
+        }
+        const shared = data.shared.items === null ? 'unknown' : data.shared.items;
+        summary.textContent =
+            `Worker ${data.pid} since ${new Date(data.since * 1000).toLocaleString()}. ` +
+            `Memory tier: ${data.memory.items} items, ${formatBytes(data.memory.bytes)} of ${formatBytes(data.memory.max_size)}. ` +
+            `Shared tier (${data.shared.type}): ${shared} items of ${data.shared.threshold}.`;
+
+        rows.replaceChildren();
+        for (const [prefix, stats] of Object.entries(data.prefixes).sort()) {
+            const latency = stats.fill_latency_avg === null ? '-' : `${(stats.fill_latency_avg * 1000).toFixed(0)} ms`;
+            const ratio = stats.hit_ratio === null ? '-' : `${(stats.hit_ratio * 100).toFixed(1)}%`;
+            const cells = [
+                prefix, ratio, stats.hits, stats.memory_hits, stats.stale_hits, stats.negative_hits,
+                stats.misses, stats.coalesced, stats.fills, stats.fill_errors, latency,
+                formatBytes(stats.bytes_stored), stats.evictions
+            ];
+            const row = document.createElement('tr');
+            cells.forEach((value, index) => {
+                const cell = document.createElement('td');
+                if (index > 0) cell.className = 'text-end';
+                cell.textContent = value;
+                row.appendChild(cell);
+            });
+            // Fill latency histogram as a tooltip
+            row.title = stats.fill_latency
+                .filter(bucket => bucket.count)
+                .map(bucket => `${bucket.le === null ? '> 10' : '<= ' + bucket.le} s: ${bucket.count}`)
+                .join('\n');
+            rows.appendChild(row);
+        }
+    })
+    .catch(error => {
+        console.error('Cache stats error:', error);
+        summary.textContent = 'Failed to load cache statistics: ' + error.message;
+    });
+}
+
+function showCacheStats() {
+    bootstrap.Modal.getOrCreateInstance(document.querySelector('#cacheStatsModal')).show();
+    loadCacheStats();
+}
+
+function resetCacheStats() {
+    fetch('/api/cache/stats/reset', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRF-TOKEN': getCookie('csrf_access_token')
+        }
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.status !== 'success') {
+            throw new Error(data.message);
+        }
+        loadCacheStats();
+    })
+    .catch(error => {
+        console.error('Cache stats reset error:', error);
+        alert('Failed to reset cache statistics: ' + error.message);
+    });
+}
+
 // Add CSS for spin animation
 const style = document.createElement('style');
 style.textContent = `
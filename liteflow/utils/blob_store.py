@@ -0,0 +1,114 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+from typing import Optional
+
+# Full commit SHA (SHA-1 or SHA-256 repositories)
+_FULL_SHA = re.compile(r'^(?:[0-9a-f]{40}|[0-9a-f]{64})$')
+
+def is_commit_sha(ref: str) -> bool:
+    """Whether ref is a full commit SHA, i.e. designates immutable content"""
+    return bool(_FULL_SHA.match(ref))
+
+class BlobStore:
+    """On-disk store for file contents at a given commit
+
+    Content at a full commit SHA never changes, so entries never expire.
+    Blobs are zlib-compressed, written atomically and evicted least recently
+    used first once the store grows over BLOB_STORE_MAX_SIZE bytes (the
+    modification time of a blob is bumped on every read).
+    """
+
+    def __init__(self):
+        self.root = None
+        self.max_size = 0
+        self._size = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Configure the store from the application config"""
+        self.root = Path(app.config['BLOB_STORE_DIR'])
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_size = app.config['BLOB_STORE_MAX_SIZE']
+        self._size = None
+
+    def _path(self, repo: str, commit: str, path: str) -> Path:
+        digest = hashlib.sha256(f"{repo}\0{commit}\0{path}".encode('utf-8')).hexdigest()
+        return self.root / digest[:2] / f"{digest}.z"
+
+    def get(self, repo: str, commit: str, path: str) -> Optional[bytes]:
+        """Get the content of path at commit, None if not stored
+
+        Args:
+            repo: Repository identifier (e.g. 'github.com/org/project')
+            commit: Full commit SHA
+            path: File path in the repository
+        """
+        blob_path = self._path(repo, commit, path)
+        try:
+            data = blob_path.read_bytes()
+            os.utime(blob_path)
+        except FileNotFoundError:
+            return None
+        return zlib.decompress(data)
+
+    def put(self, repo: str, commit: str, path: str, content: bytes) -> None:
+        """Store the content of path at commit
+
+        Args:
+            repo: Repository identifier (e.g. 'github.com/org/project')
+            commit: Full commit SHA
+            path: File path in the repository
+            content: Raw file content
+        """
+        blob_path = self._path(repo, commit, path)
+        blob_path.parent.mkdir(exist_ok=True)
+        data = zlib.compress(content)
+        fd, tmp_path = tempfile.mkstemp(dir=blob_path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, blob_path)
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_size:
+                self._evict()
+
+    def _blobs(self):
+        return self.root.glob('*/*.z')
+
+    def _scan_size(self) -> int:
+        return sum(blob.stat().st_size for blob in self._blobs())
+
+    def _evict(self) -> None:
+        """Remove least recently used blobs down to 90% of max_size"""
+        blobs = []
+        for blob in self._blobs():
+            try:
+                stat = blob.stat()
+            except FileNotFoundError:
+                continue
+            blobs.append((stat.st_mtime, stat.st_size, blob))
+        blobs.sort()
+        size = sum(blob_size for _, blob_size, _ in blobs)
+        target = self.max_size * 0.9
+        for _, blob_size, blob in blobs:
+            if size <= target:
+                break
+            blob.unlink(missing_ok=True)
+            size -= blob_size
+        self._size = size
+
+# Process-wide store, configured by init_blob_store
+blob_store = BlobStore()
+
+def init_blob_store(app):
+    """Initialize the blob store with the application"""
+    blob_store.init_app(app)
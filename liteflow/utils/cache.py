@@ -1,65 +1,624 @@
+import fcntl
+import hashlib
+import logging
+import os
+import pickle
+import random
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional
 from flask import current_app
 from flask_caching import Cache
+from .cache_metrics import cache_metrics
+
+class TwoTierCache:
+    """Flask-Caching cache fronted by a bounded in-process LRU
+
+    The shared tier (FileSystemCache, see CACHE_TYPE) is seen by every
+    worker; the memory tier keeps recently used values of this process for
+    at most CACHE_MEMORY_TIMEOUT seconds, within CACHE_MEMORY_MAX_SIZE bytes.
+    Writes go through to the shared tier. Values are pickled once and the
+    same bytes are held by both tiers, so callers get their own copy.
+
+    Namespace clears need no special handling: they change the stored keys
+    (see stored_key), so memory entries of a cleared namespace are no longer
+    looked up and age out of the LRU.
+    """
+
+    def __init__(self):
+        self.shared = Cache()
+        self.max_size = 0
+        self.timeout = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.shared.init_app(app)
+        self.max_size = app.config['CACHE_MEMORY_MAX_SIZE']
+        self.timeout = app.config['CACHE_MEMORY_TIMEOUT']
+        self.clear_memory()
+
+    def _remember(self, key: str, data: bytes, timeout: Optional[int] = None) -> None:
+        """Put a pickled value in the memory tier, evicting least recently used ones"""
+        if self.timeout <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._forget(key)
+            if len(data) > self.max_size:
+                return
+            fresh_for = self.timeout if not timeout else min(timeout, self.timeout)
+            self._entries[key] = (time.monotonic() + fresh_for, data)
+            self._size += len(data)
+            while self._size > self.max_size:
+                evicted_key, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                cache_metrics.record(evicted_key, 'evictions')
+
+    def _forget(self, key: str) -> None:
+        """Drop a key from the memory tier (lock held)"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+    def get(self, key: str, shared: bool = False, count: bool = False) -> Any:
+        """Get a value, from the shared tier only if shared (e.g. to see
+        the value just written by another worker). Memory hits are counted
+        in cache_metrics if count (lookups of callers, not internal reads)"""
+        data = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic() and not shared:
+                    self._entries.move_to_end(key)
+                    data = entry[1]
+                else:
+                    self._forget(key)
+        if data is not None:
+            if count:
+                cache_metrics.record(key, 'memory_hits')
+            return pickle.loads(data)
+        data = self.shared.get(key)
+        if not isinstance(data, bytes):
+            # Missing, or written by a version storing unpickled values
+            return None
+        self._remember(key, data)
+        return pickle.loads(data)
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        stored = self.shared.set(key, data, timeout=timeout)
+        cache_metrics.record_set(key, len(data))
+        self._remember(key, data, timeout)
+        return stored
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            self._forget(key)
+        return self.shared.delete(key)
+
+    def clear_memory(self) -> None:
+        """Empty the memory tier of this process"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def clear(self) -> bool:
+        self.clear_memory()
+        return self.shared.clear()
+
+    def stats(self) -> dict:
+        """Occupancy of both tiers"""
+        with self._lock:
+            memory = {
+                'items': len(self._entries),
+                'bytes': self._size,
+                'max_size': self.max_size,
+                'timeout': self.timeout
+            }
+        # Item count maintained by FileSystemCache, None for other backends
+        items = getattr(self.shared.cache, '_file_count', None)
+        return {
+            'memory': memory,
+            'shared': {
+                'type': current_app.config['CACHE_TYPE'],
+                'items': items,
+                'threshold': current_app.config.get('CACHE_THRESHOLD')
+            }
+        }
 
 # Initialize cache
-cache = Cache()
+cache = TwoTierCache()
+
+# Generation of a namespace never invalidated
+INITIAL_GENERATION = '0'
+
+# Seconds a generation read from CACHE_GENERATIONS_DIR is reused by this
+# process: clears made by other workers are seen after at most this long
+GENERATION_TTL = 1.0
+
+# Returned by revalidation fetchers when the origin answered 304 Not Modified
+NOT_MODIFIED = object()
+
+# Seconds before retrying the refresh of a stale entry after an error
+REVALIDATE_ERROR_BACKOFF = 60
+
+# Errors meaning the value does not exist at the origin (e.g. a 404),
+# cached for CACHE_NEGATIVE_TIMEOUT seconds like values
+NEGATIVE_ERRORS = (FileNotFoundError,)
+
+# Cache lookup outcomes (see CacheResult)
+CACHE_MISS = 'miss'
+CACHE_HIT = 'hit'
+CACHE_NEGATIVE = 'negative'
+
+class CacheResult(NamedTuple):
+    """Outcome of a cache lookup
+
+    status is CACHE_MISS (nothing stored), CACHE_HIT (value) or
+    CACHE_NEGATIVE (known to be absent: error is the NEGATIVE_ERRORS
+    exception raised when filling it, None if the value was None).
+    """
+    status: str
+    value: Any = None
+    error: Optional[Exception] = None
+
+# cache_metrics counter of each lookup outcome
+_LOOKUP_EVENTS = {CACHE_MISS: 'misses', CACHE_HIT: 'hits', CACHE_NEGATIVE: 'negative_hits'}
+
+class _Negative:
+    """Stored in place of a value known to be absent"""
 
-# Keep track of cache keys by prefix
-_cache_keys = {}
+    def __init__(self, error: Optional[Exception] = None):
+        self.error = error
+
+# Seconds between two attempts to take the fill lock of a key
+FILL_LOCK_POLL_INTERVAL = 0.05
+
+# Cache fills in flight in this process, by backend key
+_fills = {}
+_fills_lock = threading.Lock()
+# Fill lock files held by the current thread (nested fills)
+_held_fill_locks = threading.local()
+
+# Background refreshes of stale entries, one in flight per key
+_refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='cache-refresh')
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+# Generations known to this process: namespace -> (read at, generation)
+_generations = {}
 
 def init_cache(app):
     """Initialize the cache with the application"""
     cache.init_app(app)
 
-def get_or_set_cache(key: str, value_func=None):
+def _log_key(event: str, key: str):
+    """Log a per-key event at DEBUG, for CACHE_LOG_SAMPLE_RATE of them
+    (counters are in cache_metrics)"""
+    logger = current_app.logger
+    if logger.isEnabledFor(logging.DEBUG) and random.random() < current_app.config['CACHE_LOG_SAMPLE_RATE']:
+        logger.debug(f"Cache {event} - Key: {key}")
+
+@lru_cache(maxsize=4096)
+def _generation_file(namespace: str) -> str:
+    return hashlib.sha256(namespace.encode('utf-8')).hexdigest()
+
+def _generation_path(namespace: str) -> str:
+    return os.path.join(current_app.config['CACHE_GENERATIONS_DIR'], _generation_file(namespace))
+
+def get_generation(namespace: str) -> str:
+    """Current generation of a cache namespace (e.g. 'github', 's3:storage:bucket')
+
+    Kept in memory GENERATION_TTL seconds, so lookups (memory hits
+    included) do not read the generation file every time.
+    """
+    now = time.monotonic()
+    known = _generations.get(namespace)
+    if known is not None and now - known[0] < GENERATION_TTL:
+        return known[1]
+    try:
+        with open(_generation_path(namespace)) as f:
+            generation = f.read()
+    except FileNotFoundError:
+        generation = INITIAL_GENERATION
+    _generations[namespace] = (now, generation)
+    return generation
+
+def invalidate_namespace(namespace: str) -> str:
+    """
+    Invalidate every cache entry of a namespace by starting a new generation.
+
+    The generation is persisted in CACHE_GENERATIONS_DIR (written atomically),
+    so the invalidation survives restarts and is seen by this process at once
+    and by other worker processes within GENERATION_TTL seconds.
+    Entries of previous generations are never read again and are reclaimed by
+    the backend (expiry, CACHE_THRESHOLD pruning).
+
+    Returns:
+        The new generation
+    """
+    path = _generation_path(namespace)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    generation = f"{time.time_ns():x}"
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        f.write(generation)
+    os.replace(tmp_path, path)
+    _generations[namespace] = (time.monotonic(), generation)
+    current_app.logger.info(f"Cache clear - Namespace: {namespace}")
+    return generation
+
+def stored_key(key: str, namespace: Optional[str] = None) -> str:
+    """
+    Backend key of a cache entry, with its namespace generations folded in.
+
+    A key belongs to the namespace of its prefix ('github' for
+    'github:repo:owner:name') and, if given, to a narrower namespace
+    (e.g. 'github:owner:name'); invalidating either changes the stored key.
+    """
+    namespaces = [key.split(':')[0]] + ([namespace] if namespace else [])
+    return f"{key}#{'.'.join(get_generation(name) for name in namespaces)}"
+
+def _fill_lock_path(backend_key: str) -> str:
+    # Keys are spread over 4096 lock files
+    digest = hashlib.sha256(backend_key.encode('utf-8')).hexdigest()
+    return os.path.join(current_app.config['CACHE_LOCKS_DIR'], f"{digest[:3]}.lock")
+
+@contextmanager
+def _fill_lock(backend_key: str, timeout: float):
+    """
+    Lock the fill of a key across processes (file lock in CACHE_LOCKS_DIR).
+
+    Re-entrant per thread: a fill nested in another one whose key shares the
+    lock file does not wait on itself.
+
+    Yields whether the lock was acquired within timeout seconds.
+    """
+    path = _fill_lock_path(backend_key)
+    held = _held_fill_locks.__dict__.setdefault('paths', set())
+    if path in held:
+        yield True
+        return
+    os.makedirs(current_app.config['CACHE_LOCKS_DIR'], exist_ok=True)
+    deadline = time.monotonic() + timeout
+    with open(path, 'w') as lock_file:
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    yield False
+                    return
+                time.sleep(FILL_LOCK_POLL_INTERVAL)
+        held.add(path)
+        try:
+            yield True
+        finally:
+            held.discard(path)
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _single_flight(key: str, backend_key: str, load, compute):
+    """
+    Fill a missing cache entry once, however many callers miss it at once.
+
+    Threads of this process missing the same key wait for the first one.
+    Processes take turns on the fill lock of the key, and re-read the cache
+    with load before calling compute. After CACHE_FILL_TIMEOUT seconds
+    waiting for another thread or process, compute is called anyway.
+
+    Returns:
+        The result of load, or of compute if load returned None
+    """
+    with _fills_lock:
+        future = _fills.get(backend_key)
+        leader = future is None
+        if leader:
+            future = _fills[backend_key] = Future()
+    if not leader:
+        cache_metrics.record(key, 'coalesced')
+        _log_key('fill joined', key)
+        try:
+            return future.result(timeout=current_app.config['CACHE_FILL_TIMEOUT'])
+        except FutureTimeoutError:
+            current_app.logger.warning(f"Cache fill wait timeout - Key: {key}")
+            value = load()
+            return compute() if value is None else value
+
+    try:
+        with _fill_lock(backend_key, current_app.config['CACHE_FILL_TIMEOUT']) as locked:
+            if not locked:
+                current_app.logger.warning(f"Cache fill lock timeout - Key: {key}")
+            value = load()
+            if value is None:
+                value = compute()
+        future.set_result(value)
+        return value
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _fills_lock:
+            del _fills[backend_key]
+
+def _lookup(backend_key: str, count: bool = False) -> CacheResult:
+    value = cache.get(backend_key, count=count)
+    if value is None:
+        return CacheResult(CACHE_MISS)
+    if isinstance(value, _Negative):
+        return CacheResult(CACHE_NEGATIVE, error=value.error)
+    return CacheResult(CACHE_HIT, value)
+
+def lookup_cache(key: str, namespace: str = None) -> CacheResult:
+    """Look a get_or_set_cache key up, without filling it"""
+    return _lookup(stored_key(key, namespace), count=True)
+
+def set_negative_cache(key: str, error: Optional[Exception] = None, namespace: str = None,
+                       timeout: int = None):
+    """Record that the value of key is absent (e.g. the origin answered 404)
+
+    Kept CACHE_NEGATIVE_TIMEOUT seconds unless timeout is given.
+    """
+    if timeout is None:
+        timeout = current_app.config['CACHE_NEGATIVE_TIMEOUT']
+    cache.set(stored_key(key, namespace), _Negative(error), timeout=timeout)
+    _log_key('set negative', key)
+
+def _result_value(result: CacheResult):
+    """Value of a lookup, None on a miss; raises the error of a negative"""
+    if result.error is not None:
+        raise result.error
+    return result.value
+
+def get_or_set_cache(key: str, value_func=None, timeout: int = None, namespace: str = None,
+                     negative_timeout: int = None):
     """
     Get or set a cache value with explicit key.
-    Returns a tuple (hit: bool, value: Any)
-    
+
+    Values are kept CACHE_DEFAULT_TIMEOUT seconds unless timeout is given.
+    A None value, or a NEGATIVE_ERRORS exception raised by value_func, is
+    cached as absent for CACHE_NEGATIVE_TIMEOUT seconds unless
+    negative_timeout is given: until then lookups return None, or raise the
+    exception again, without calling value_func. namespace is an additional
+    namespace of the key (see stored_key). Concurrent misses of a key, in any
+    thread or worker, call value_func once.
+
+    Use lookup_cache to tell a miss from a cached absence.
+
     Usage:
-        # Try to get from cache
-        hit, value = get_or_set_cache('github:repo:owner/name')
-        if not hit:
-            # Cache miss, compute value
-            value = compute_expensive_value()
-            # Store in cache
-            _, value = get_or_set_cache('github:repo:owner/name', lambda: value)
-    """
-    # Extract prefix for tracking
-    prefix = key.split(':')[0]
-    if prefix not in _cache_keys:
-        _cache_keys[prefix] = set()
-    _cache_keys[prefix].add(key)
-    
+        # Try to get from cache (None on a miss)
+        value = get_or_set_cache('github:repo:owner:name')
+        # Get from cache, computing and storing the value on a miss
+        value = get_or_set_cache('github:repo:owner:name', compute_expensive_value)
+    """
+    backend_key = stored_key(key, namespace)
+
     # Try to get from cache
-    value = cache.get(key)
-    if value is not None:
-        current_app.logger.info(f"Cache hit - Key: {key}")
-        return value
-        
-    # If no value_func provided, return cache miss
-    if value_func is None:
-        current_app.logger.info(f"Cache miss - Key: {key}")
-        return None
-        
+    result = _lookup(backend_key, count=True)
+    cache_metrics.record(key, _LOOKUP_EVENTS[result.status])
+    if result.status != CACHE_MISS or value_func is None:
+        _log_key(result.status, key)
+        return _result_value(result)
+
+    if timeout is None:
+        timeout = current_app.config['CACHE_DEFAULT_TIMEOUT']
+    if negative_timeout is None:
+        negative_timeout = current_app.config['CACHE_NEGATIVE_TIMEOUT']
+
     # Compute and store value
-    value = value_func()
-    cache.set(key, value, timeout=current_app.config['CACHE_DEFAULT_TIMEOUT'])
-    current_app.logger.info(f"Cache set - Key: {key}")
-    return value
+    def compute():
+        started = time.monotonic()
+        try:
+            value = value_func()
+        except NEGATIVE_ERRORS as e:
+            cache_metrics.record_fill(key, time.monotonic() - started)
+            cache.set(backend_key, _Negative(e), timeout=negative_timeout)
+            _log_key('set negative', key)
+            return CacheResult(CACHE_NEGATIVE, error=e)
+        except Exception:
+            cache_metrics.record_fill(key, time.monotonic() - started, error=True)
+            raise
+        cache_metrics.record_fill(key, time.monotonic() - started)
+        if value is None:
+            cache.set(backend_key, _Negative(), timeout=negative_timeout)
+            _log_key('set negative', key)
+            return CacheResult(CACHE_NEGATIVE)
+        cache.set(backend_key, value, timeout=timeout)
+        _log_key('set', key)
+        return CacheResult(CACHE_HIT, value)
+
+    def load():
+        result = _lookup(backend_key)
+        return None if result.status == CACHE_MISS else result
+
+    return _result_value(_single_flight(key, backend_key, load, compute))
+
+def _store_entry(backend_key: str, value, validators: dict, fresh_for: float,
+                 expired_at: Optional[float] = None):
+    """Store a revalidatable entry, kept on disk beyond its freshness
+
+    An entry kept after failed revalidations carries the time it first
+    expired (expired_at) and is only kept CACHE_STALE_TIMEOUT seconds past it.
+    """
+    entry = {
+        'value': value,
+        'validators': validators or {},
+        'expires_at': time.time() + fresh_for
+    }
+    timeout = current_app.config['CACHE_STALE_TIMEOUT']
+    if expired_at is not None:
+        entry['expired_at'] = expired_at
+        # At least 1: a timeout of 0 never expires
+        timeout = max(1, int(expired_at + timeout - time.time()))
+    cache.set(backend_key, entry, timeout=timeout)
+    return entry
+
+def _revalidate(key: str, backend_key: str, entry: dict, fetch_func, stale_if_error: bool = True):
+    """Refresh entry with fetch_func, keeping it when the origin fails"""
+    timeout = current_app.config['CACHE_DEFAULT_TIMEOUT']
+    if entry is not None and entry.get('error') is not None:
+        entry = None
+    started = time.monotonic()
+    try:
+        result = fetch_func(entry['validators'] if entry else {})
+    except Exception as e:
+        cache_metrics.record_fill(key, time.monotonic() - started, error=not isinstance(e, NEGATIVE_ERRORS))
+        if isinstance(e, NEGATIVE_ERRORS):
+            # Known to be absent (deleted if it was stored): fetched again
+            # once CACHE_NEGATIVE_TIMEOUT elapsed
+            negative_timeout = current_app.config['CACHE_NEGATIVE_TIMEOUT']
+            cache.set(backend_key, {
+                'value': None,
+                'validators': {},
+                'expires_at': time.time() + negative_timeout,
+                'error': e
+            }, timeout=negative_timeout)
+            _log_key('set negative', key)
+            raise
+        if entry is None or not stale_if_error:
+            raise
+        expired_at = entry.get('expired_at', entry['expires_at'])
+        if time.time() >= expired_at + current_app.config['CACHE_STALE_TIMEOUT']:
+            raise
+        # Stale-if-error: keep serving the stored value, at most
+        # CACHE_STALE_TIMEOUT seconds past its first expiry
+        current_app.logger.warning(f"Cache revalidation failed - Key: {key}: {e}")
+        _store_entry(backend_key, entry['value'], entry['validators'], REVALIDATE_ERROR_BACKOFF, expired_at)
+        return entry['value']
+    cache_metrics.record_fill(key, time.monotonic() - started, not_modified=result is NOT_MODIFIED)
+    if result is NOT_MODIFIED and entry is not None:
+        _log_key('revalidated', key)
+        return _store_entry(backend_key, entry['value'], entry['validators'], timeout)['value']
+    value, validators = result
+    _log_key('set', key)
+    return _store_entry(backend_key, value, validators, timeout)['value']
+
+def _refresh_in_background(key: str, backend_key: str, entry: dict, fetch_func):
+    """Schedule _revalidate in a worker thread unless already running"""
+    with _refreshing_lock:
+        if backend_key in _refreshing:
+            return
+        _refreshing.add(backend_key)
+    app = current_app._get_current_object()
+
+    def run():
+        try:
+            with app.app_context(), _fill_lock(backend_key, 0) as locked:
+                # Another worker is refreshing it: keep serving the stale entry
+                if not locked:
+                    return
+                current = cache.get(backend_key, shared=True)
+                if current is not None and current.get('error') is None and current['expires_at'] > time.time():
+                    return
+                _revalidate(key, backend_key, current or entry, fetch_func)
+        except Exception as e:
+            app.logger.error(f"Cache background refresh failed - Key: {key}: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(backend_key)
+
+    _refresh_executor.submit(run)
+
+def get_or_revalidate_cache(key: str, fetch_func, namespace: str = None):
+    """
+    Get a cache value that is revalidated against its origin once stale.
+
+    fetch_func receives the validators stored with the previous response
+    (e.g. {'etag': ..., 'last_modified': ...}, empty on first fetch) and
+    returns either NOT_MODIFIED or a tuple (value, validators). namespace is
+    an additional namespace of the key (see stored_key).
+
+    Fresh entries are served directly. Stale entries are served as is while
+    a background refresh runs (stale-while-revalidate), and keep being served
+    if the origin is unreachable (stale-if-error), up to CACHE_STALE_TIMEOUT
+    seconds after they first expired. Only a missing entry blocks on
+    fetch_func, called once for all the threads and workers missing it at
+    the same time. A NEGATIVE_ERRORS exception raised by fetch_func, for a
+    missing or a stale entry, is cached CACHE_NEGATIVE_TIMEOUT seconds and
+    raised again meanwhile.
+
+    Usage:
+        def fetch(validators):
+            response = conditional_get(url, validators)
+            if response.status_code == 304:
+                return NOT_MODIFIED
+            return response.json(), {'etag': response.headers.get('ETag')}
+        value = get_or_revalidate_cache('github:file:owner:name:path:ref', fetch)
+    """
+    backend_key = stored_key(key, namespace)
+    entry = cache.get(backend_key, count=True)
+    if entry is not None and entry.get('error') is not None:
+        if entry['expires_at'] > time.time():
+            cache_metrics.record(key, 'negative_hits')
+            _log_key('negative', key)
+            raise entry['error']
+        entry = None
+    if entry is None:
+        cache_metrics.record(key, 'misses')
+        _log_key('miss', key)
+
+        def load():
+            entry = cache.get(backend_key)
+            if entry is None or (entry.get('error') is not None and entry['expires_at'] <= time.time()):
+                return None
+            return entry
+
+        entry = _single_flight(
+            key, backend_key, load,
+            lambda: {'value': _revalidate(key, backend_key, None, fetch_func)}
+        )
+        if entry.get('error') is not None:
+            raise entry['error']
+        return entry['value']
+
+    if entry['expires_at'] > time.time():
+        cache_metrics.record(key, 'hits')
+        _log_key('hit', key)
+    else:
+        cache_metrics.record(key, 'stale_hits')
+        _log_key('stale', key)
+        _refresh_in_background(key, backend_key, entry, fetch_func)
+    return entry['value']
+
+def refresh_cache(key: str, fetch_func, namespace: str = None):
+    """
+    Revalidate a get_or_revalidate_cache entry now, whatever its freshness.
+
+    Used to keep entries warm ahead of interactive requests. Unlike the
+    lazy path, errors from fetch_func are raised (the stored entry is left
+    untouched).
+    """
+    backend_key = stored_key(key, namespace)
+    return _revalidate(key, backend_key, cache.get(backend_key), fetch_func, stale_if_error=False)
 
 def clear_cache_by_prefix(prefix: str):
-    """Clear all cache entries with given prefix"""
-    if prefix in _cache_keys:
-        for key in _cache_keys[prefix]:
-            cache.delete(key)
-            current_app.logger.info(f"Cache clear - Key: {key}")
-        _cache_keys[prefix].clear()
-
-def clear_github_cache():
-    """Clear all GitHub API cache entries"""
-    clear_cache_by_prefix('github')
-
-def clear_s3_cache():
-    """Clear all S3 listing cache entries"""
-    clear_cache_by_prefix('s3')
+    """Clear all cache entries with given prefix (e.g. 'github')"""
+    invalidate_namespace(prefix)
+
+def github_namespace(org: str, project: str) -> str:
+    """Cache namespace of the GitHub API entries of a repository"""
+    return f"github:{org}:{project}"
+
+def s3_namespace(storage: str, bucket: str) -> str:
+    """Cache namespace of the S3 entries of a bucket"""
+    return f"s3:{storage}:{bucket}"
+
+def clear_github_cache(org: str = None, project: str = None):
+    """Clear the GitHub API cache entries, of one repository if given"""
+    if org and project:
+        invalidate_namespace(github_namespace(org, project))
+    else:
+        clear_cache_by_prefix('github')
+
+def clear_s3_cache(storage: str = None, bucket: str = None):
+    """Clear the S3 listing cache entries, of one bucket if given"""
+    if storage is not None and bucket:
+        invalidate_namespace(s3_namespace(storage, bucket))
+    else:
+        clear_cache_by_prefix('s3')
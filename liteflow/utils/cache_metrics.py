@@ -0,0 +1,103 @@
+import bisect
+import os
+import threading
+import time
+from typing import Dict
+
+# Upper bounds in seconds of the fill latency histogram buckets
+FILL_LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def key_prefix(key: str) -> str:
+    """Prefix under which a cache key is counted (e.g. 'github')"""
+    return key.split(':', 1)[0]
+
+class CacheMetrics:
+    """In-memory counters of the cache lookups of this process
+
+    Counters are aggregated per key prefix (github, s3, readme...): lookups
+    by outcome, fills (calls to the origin) with a latency histogram, bytes
+    written and evictions from the in-process tier.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.started = time.time()
+            self.prefixes: Dict[str, Dict] = {}
+
+    def _counters(self, prefix: str) -> Dict:
+        return self.prefixes.setdefault(prefix, {
+            'hits': 0,
+            'memory_hits': 0,
+            'stale_hits': 0,
+            'negative_hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'fills': 0,
+            'fill_errors': 0,
+            'not_modified': 0,
+            'fill_latency_total': 0.0,
+            'fill_latency': [0] * (len(FILL_LATENCY_BUCKETS) + 1),
+            'sets': 0,
+            'bytes_stored': 0,
+            'evictions': 0
+        })
+
+    def record(self, key: str, event: str, count: int = 1) -> None:
+        """Count a lookup outcome (hits, misses...) of key"""
+        with self.lock:
+            self._counters(key_prefix(key))[event] += count
+
+    def record_fill(self, key: str, latency: float, error: bool = False,
+                    not_modified: bool = False) -> None:
+        """Record a call to the origin filling or revalidating key"""
+        bucket = bisect.bisect_left(FILL_LATENCY_BUCKETS, latency)
+        with self.lock:
+            counters = self._counters(key_prefix(key))
+            counters['fills'] += 1
+            counters['fill_latency_total'] += latency
+            counters['fill_latency'][bucket] += 1
+            if error:
+                counters['fill_errors'] += 1
+            if not_modified:
+                counters['not_modified'] += 1
+
+    def record_set(self, key: str, size: int) -> None:
+        """Record a value of size bytes (pickled) written for key"""
+        with self.lock:
+            counters = self._counters(key_prefix(key))
+            counters['sets'] += 1
+            counters['bytes_stored'] += size
+
+    def snapshot(self) -> Dict:
+        """Aggregated view of the counters, for /api/cache/stats"""
+        with self.lock:
+            prefixes = {}
+            totals = {'hits': 0, 'misses': 0, 'fills': 0, 'bytes_stored': 0, 'evictions': 0}
+            for prefix, counters in self.prefixes.items():
+                view = dict(counters)
+                lookups = counters['hits'] + counters['stale_hits'] + counters['negative_hits'] + counters['misses']
+                view['hit_ratio'] = (lookups - counters['misses']) / lookups if lookups else None
+                view['fill_latency_avg'] = (
+                    counters['fill_latency_total'] / counters['fills'] if counters['fills'] else None
+                )
+                del view['fill_latency_total']
+                view['fill_latency'] = [
+                    {'le': bound, 'count': count}
+                    for bound, count in zip(FILL_LATENCY_BUCKETS + (None,), counters['fill_latency'])
+                ]
+                prefixes[prefix] = view
+                for key in totals:
+                    totals[key] += counters[key]
+            return {
+                'pid': os.getpid(),
+                'since': self.started,
+                'totals': totals,
+                'prefixes': prefixes
+            }
+
+# Process-wide metrics
+cache_metrics = CacheMetrics()
@@ -0,0 +1,134 @@
+import random
+import threading
+import time
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from .github_metrics import github_metrics
+
+# Seconds allowed to establish a connection (read timeout is configurable)
+CONNECT_TIMEOUT = 5
+# Status codes retried with exponential backoff
+RETRY_STATUSES = (500, 502, 503, 504)
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the rate of outbound requests"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, waiting for one to be available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class GitHubHTTPClient:
+    """Process-wide HTTP client for every raw GitHub API call
+
+    One requests.Session keeps connections alive across threads. Requests
+    go through a shared token bucket, have bounded timeouts and are retried
+    with exponential backoff on connection errors and 5xx answers. Rate
+    limit answers (429, or 403 with Retry-After / exhausted quota) are
+    retried after the delay GitHub asks for, as long as it is shorter than
+    GITHUB_MAX_WAIT; otherwise the response is returned to the caller.
+    """
+
+    def __init__(self):
+        self.session = None
+        self.timeout = 30
+        self.max_retries = 3
+        self.backoff = 1.0
+        self.max_wait = 60
+        self.bucket = None
+
+    def init_app(self, app):
+        """Configure the client from the application config"""
+        self.timeout = app.config['GITHUB_TIMEOUT']
+        self.max_retries = app.config['GITHUB_MAX_RETRIES']
+        self.max_wait = app.config['GITHUB_MAX_WAIT']
+        self.bucket = TokenBucket(
+            app.config['GITHUB_REQUESTS_PER_SECOND'],
+            app.config['GITHUB_REQUESTS_BURST']
+        )
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        self.session = session
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying response, None if final"""
+        if response.status_code in RETRY_STATUSES:
+            return self.backoff * 2 ** attempt
+        retry_after = response.headers.get('Retry-After')
+        exhausted = response.headers.get('X-RateLimit-Remaining') == '0'
+        if response.status_code == 429 or (response.status_code == 403 and (retry_after or exhausted)):
+            if retry_after:
+                return float(retry_after)
+            reset = response.headers.get('X-RateLimit-Reset')
+            if exhausted and reset:
+                return max(0.0, float(reset) - time.time()) + 1
+            return self.backoff * 2 ** attempt
+        return None
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request with rate limiting, timeouts and retries
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            **kwargs: Passed to requests.Session.request
+
+        Returns:
+            The last response received
+
+        Raises:
+            requests.ConnectionError, requests.Timeout: When every attempt
+                failed to connect or timed out
+        """
+        kwargs.setdefault('timeout', (CONNECT_TIMEOUT, self.timeout))
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                github_metrics.record_call(method, url, None, time.monotonic() - started, 0)
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+            else:
+                github_metrics.record_call(
+                    method, url, response.status_code, time.monotonic() - started,
+                    len(response.content), response.headers
+                )
+                delay = self._retry_delay(response, attempt)
+                if delay is None or attempt == self.max_retries or delay > self.max_wait:
+                    return response
+            # Jitter spreads the retries of concurrent threads
+            time.sleep(delay * random.uniform(1, 1.25))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+# Process-wide client, configured by init_github_http
+github_http = GitHubHTTPClient()
+
+def init_github_http(app):
+    """Initialize the GitHub HTTP client with the application"""
+    github_http.init_app(app)
@@ -0,0 +1,196 @@
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+from flask import has_request_context, request
+
+# Window in seconds over which the quota consumption rate is measured
+RATE_WINDOW = 300
+# Number of individual calls kept for the live view
+RECENT_CALLS = 100
+
+# Route label of calls made outside of a request (worker threads)
+_route_label = contextvars.ContextVar('github_route_label', default=None)
+# Counter of the calls made in a count_calls block
+_call_counter = contextvars.ContextVar('github_call_counter', default=None)
+
+def _kind(url: str) -> str:
+    """Classify a GitHub API URL as the provider lookup it serves"""
+    if url.endswith('/graphql'):
+        return 'refs'  # GraphQL is only used to fetch refs
+    path = url.split('?')[0]
+    parts = path.split('/repos/', 1)
+    if len(parts) == 1:
+        if path.endswith('/rate_limit'):
+            return 'rate_limit'
+        return 'org_repos' if path.endswith('/repos') else 'other'
+    segments = parts[1].split('/')
+    if len(segments) == 2:
+        return 'repo'
+    if segments[2] in ('branches', 'tags', 'commits'):
+        return 'refs'
+    if segments[2] == 'git' and len(segments) > 3:
+        return segments[3]  # git/trees
+    return segments[2]
+
+class GitHubMetrics:
+    """In-memory accounting of the GitHub API calls of this process
+
+    Calls are aggregated per route (Flask endpoint or worker label) and per
+    kind (repo, refs, contents...), together with the calls the caches
+    avoided and the last quota reported by GitHub per resource.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.started = time.time()
+            self.routes: Dict[str, Dict[str, Dict]] = {}
+            self.quota: Dict[str, Dict] = {}
+            self.recent = deque(maxlen=RECENT_CALLS)
+            self.consumed: Dict[str, deque] = {}
+
+    @contextmanager
+    def label(self, route: str):
+        """Attribute the calls made in this block to route"""
+        token = _route_label.set(route)
+        try:
+            yield
+        finally:
+            _route_label.reset(token)
+
+    @contextmanager
+    def count_calls(self):
+        """Count the calls made in this block that use quota (not 304s)
+
+        Yields a dictionary whose 'calls' item is updated as calls are made.
+        """
+        counter = {'calls': 0}
+        token = _call_counter.set(counter)
+        try:
+            yield counter
+        finally:
+            _call_counter.reset(token)
+
+    def current_route(self) -> str:
+        label = _route_label.get()
+        if label:
+            return label
+        if has_request_context() and request.endpoint:
+            return request.endpoint
+        return 'background'
+
+    def _counters(self, route: str, kind: str) -> Dict:
+        return self.routes.setdefault(route, {}).setdefault(kind, {
+            'calls': 0,
+            'errors': 0,
+            'not_modified': 0,
+            'avoided': 0,
+            'bytes': 0,
+            'latency_total': 0.0,
+            'latency_max': 0.0
+        })
+
+    def record_call(self, method: str, url: str, status: Optional[int], latency: float,
+                    size: int, headers: Optional[Dict] = None) -> None:
+        """Record one HTTP call (status None for a connection failure)"""
+        route = self.current_route()
+        kind = _kind(url)
+        headers = headers or {}
+        now = time.time()
+        resource = headers.get('X-RateLimit-Resource')
+        counter = _call_counter.get()
+        if counter is not None and status is not None and status != 304:
+            counter['calls'] += 1
+        with self.lock:
+            counters = self._counters(route, kind)
+            counters['calls'] += 1
+            counters['bytes'] += size
+            counters['latency_total'] += latency
+            counters['latency_max'] = max(counters['latency_max'], latency)
+            if status is None or status >= 400:
+                counters['errors'] += 1
+            if status == 304:
+                counters['not_modified'] += 1
+            if resource and headers.get('X-RateLimit-Remaining') is not None:
+                self.quota[resource] = {
+                    'limit': int(headers.get('X-RateLimit-Limit', 0)),
+                    'remaining': int(headers['X-RateLimit-Remaining']),
+                    'reset': int(headers.get('X-RateLimit-Reset', 0)),
+                    'updated_at': now
+                }
+                # 304 answers to conditional requests are free
+                if status != 304:
+                    self.consumed.setdefault(resource, deque(maxlen=10000)).append(now)
+            self.recent.append({
+                'time': now,
+                'route': route,
+                'kind': kind,
+                'method': method,
+                'url': url.split('?')[0],
+                'status': status,
+                'latency': latency,
+                'bytes': size,
+                'remaining': headers.get('X-RateLimit-Remaining')
+            })
+
+    def record_avoided(self, kind: str) -> None:
+        """Record a lookup served without calling GitHub"""
+        route = self.current_route()
+        with self.lock:
+            self._counters(route, kind)['avoided'] += 1
+
+    def snapshot(self) -> Dict:
+        """Aggregated view of the calls, for /api/metrics/github"""
+        now = time.time()
+        with self.lock:
+            routes = {}
+            totals = {'calls': 0, 'avoided': 0, 'not_modified': 0, 'errors': 0, 'bytes': 0}
+            for route, kinds in self.routes.items():
+                routes[route] = {}
+                for kind, counters in kinds.items():
+                    view = dict(counters)
+                    view['latency_avg'] = (
+                        counters['latency_total'] / counters['calls'] if counters['calls'] else None
+                    )
+                    del view['latency_total']
+                    routes[route][kind] = view
+                    for key in totals:
+                        totals[key] += counters[key]
+
+            quota = {}
+            for resource, state in self.quota.items():
+                calls = self.consumed.get(resource, ())
+                window = min(RATE_WINDOW, max(now - self.started, 1))
+                rate = sum(1 for t in calls if t > now - window) / window
+                seconds_to_reset = max(0, state['reset'] - now)
+                if rate > 0:
+                    exhaustion = state['remaining'] / rate
+                    projected = exhaustion if exhaustion < seconds_to_reset else None
+                else:
+                    projected = None
+                quota[resource] = {
+                    **state,
+                    'calls_per_minute': rate * 60,
+                    'seconds_to_reset': seconds_to_reset,
+                    # None when the quota lasts until its reset at this rate
+                    'projected_exhaustion_in': projected
+                }
+
+            return {
+                'pid': os.getpid(),
+                'since': self.started,
+                'totals': totals,
+                'routes': routes,
+                'quota': quota,
+                'recent': list(self.recent)
+            }
+
+# Process-wide metrics
+github_metrics = GitHubMetrics()
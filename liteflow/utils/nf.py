@@ -1,45 +1,230 @@
 import re
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-def parse_nf_manifest(content):
-    within_manifest_scope = False
-    open_brackets = 0
-    closed_brackets = 0
-    i = 0
-    description = ""
-    nextflowVersion = ""
-    for line in content.split("\n"):
-        i += 1
-        match = re.match(r"^\s*manifest\.description\s*=\s*['\"](.*)['\"]\s*$", line)
-        if match:
-            description = match.group(1)
-            continue
-        match = re.match(r"^\s*manifest\.nextflowVersion\s*=\s*['\"](.*)['\"]\s*$", line)
-        if match:
-            nextflowVersion = match.group(1)
-            continue
-        match = re.match(r"^\s*manifest\s*\{\s*$", line)
-        if match:
-            within_manifest_scope = True
-            open_brackets = 1
+class Token(NamedTuple):
+    kind: str  # 'name', 'string', 'number', 'op' or 'newline'
+    value: Any
+    start: int
+    end: int
+
+_TOKEN = re.compile(r'''
+    (?P<space>[ \t\r\f]+|\\\r?\n)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<newline>[\n;])
+  | (?P<string>\'\'\'.*?\'\'\'|"""(?:\\.|.)*?"""|'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*")
+  | (?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?[lLgGdDfF]?)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<op>\?:|\?\.|\*\.|==|!=|<=|>=|&&|\|\||\*\*|->|\.\.|[{}()\[\]=,:.+\-*/%<>!?~&|^@])
+  | (?P<other>.)
+''', re.VERBOSE | re.DOTALL)
+
+_ESCAPE = re.compile(r'\\(\r?\n|.)', re.DOTALL)
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', '\n': '', '\r\n': ''}
+
+# Operators after which an expression continues on the next line
+_CONTINUATION = {'=', '+', '-', '*', '/', '%', '?', ':', '?:', '&&', '||', ',', '.', '==', '!=',
+                 '<', '>', '<=', '>=', '->'}
+_OPENING = {'(': ')', '[': ']', '{': '}'}
+
+# Manifest fields always present in parse_nf_config results
+MANIFEST_FIELDS = ('name', 'version', 'homePage', 'defaultBranch', 'author', 'description',
+                   'nextflowVersion')
+
+def _unquote(literal: str) -> str:
+    quote = 3 if literal[:3] in ("'''", '"""') else 1
+    return _ESCAPE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), literal[quote:-quote])
+
+def tokenize(content: str) -> Iterator[Token]:
+    """Split Nextflow/Groovy config source into tokens
+
+    Comments and whitespace are dropped, ';' is reported as a newline and
+    string tokens carry their unescaped value.
+    """
+    for match in _TOKEN.finditer(content):
+        kind = match.lastgroup
+        if kind in ('space', 'comment'):
             continue
-        if within_manifest_scope and open_brackets ==1:
-            open_brackets += line.count('{')
-            open_brackets -= line.count('}')
-            match = re.match(r"^\s*description\s*=\s*['\"](.*)['\"]\s*$", line)
-            if match:
-                description = match.group(1)
-                continue
-            match = re.match(r"^\s*nextflowVersion\s*=\s*['\"](.*)['\"]\s*$", line)
-            if match:
-                nextflowVersion = match.group(1)
+        text = match.group()
+        if kind == 'string':
+            yield Token(kind, _unquote(text), match.start(), match.end())
+        elif kind == 'newline':
+            yield Token(kind, '\n', match.start(), match.end())
+        else:
+            yield Token('op' if kind == 'other' else kind, text, match.start(), match.end())
+
+class _ConfigParser:
+    """Single pass over the tokens collecting assignments and profiles"""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.tokens = list(tokenize(content))
+        self.pos = 0
+        # (path, value) in source order, later ones override earlier ones
+        self.assignments: List[Tuple[Tuple[str, ...], Any]] = []
+        self.profiles: List[str] = []
+
+    def _peek(self) -> Optional[Token]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _is_op(self, token: Optional[Token], value: str) -> bool:
+        return token is not None and token.kind == 'op' and token.value == value
+
+    def parse_block(self, scope: Tuple[str, ...]) -> None:
+        """Parse statements up to the closing brace of scope (or the end)"""
+        while True:
+            token = self._peek()
+            if token is None:
+                return
+            if token.kind == 'newline':
+                self.pos += 1
                 continue
-        if within_manifest_scope and open_brackets==0:
-            within_manifest_scope= False
-        if description != "" and nextflowVersion != "":
-            break
-    results = {
-        'description': description.strip('"'),
-        'nextflowVersion': nextflowVersion.strip('"')
-    }
-    return results
+            if self._is_op(token, '}'):
+                self.pos += 1
+                return
+            if token.kind in ('name', 'string'):
+                start = self.pos
+                path = self._parse_path()
+                following = self._peek()
+                if self._is_op(following, '='):
+                    self.pos += 1
+                    self._add_profile(scope + path[:-1])
+                    self.assignments.append((scope + path, self._parse_value()))
+                    continue
+                if self._is_op(following, '{'):
+                    self.pos += 1
+                    if path == ('try',):
+                        # try { includeConfig ... } catch (...) { ... }
+                        self.parse_block(scope)
+                    else:
+                        self._add_profile(scope + path)
+                        self.parse_block(scope + path)
+                    continue
+                self.pos = start
+            self._skip_statement()
+
+    def _add_profile(self, path: Tuple[str, ...]) -> None:
+        """Record the profile defined by a block or assignment at path"""
+        if len(path) > 1 and path[0] == 'profiles' and path[1] not in self.profiles:
+            self.profiles.append(path[1])
+
+    def _parse_path(self) -> Tuple[str, ...]:
+        """Parse a dotted name such as process.resourceLimits or 'my-profile'"""
+        path = [self.tokens[self.pos].value]
+        self.pos += 1
+        while self._is_op(self._peek(), '.'):
+            following = self.tokens[self.pos + 1] if self.pos + 1 < len(self.tokens) else None
+            if following is None or following.kind not in ('name', 'string'):
+                break
+            path.append(following.value)
+            self.pos += 2
+        return tuple(path)
+
+    def _collect(self) -> List[Token]:
+        """Consume the tokens of one statement, stopping at its end
+
+        The statement ends at a newline outside brackets (unless the line
+        ends with an operator) or before the brace closing the scope.
+        """
+        tokens = []
+        closing = []
+        while True:
+            token = self._peek()
+            if token is None:
+                return tokens
+            if token.kind == 'newline' and not closing:
+                if tokens and tokens[-1].kind == 'op' and tokens[-1].value in _CONTINUATION:
+                    self.pos += 1
+                    continue
+                return tokens
+            if token.kind == 'op':
+                if token.value in _OPENING:
+                    closing.append(_OPENING[token.value])
+                elif token.value in (')', ']', '}'):
+                    if not closing:
+                        return tokens
+                    closing.pop()
+            self.pos += 1
+            if token.kind != 'newline':
+                tokens.append(token)
+
+    def _skip_statement(self) -> None:
+        if not self._collect():
+            # Stray closing bracket
+            self.pos += 1
 
+    def _parse_value(self) -> Any:
+        """Parse the right-hand side of an assignment
+
+        Literals (strings, numbers, booleans, null and lists of them) are
+        converted to Python values, other expressions are kept as source.
+        """
+        tokens = self._collect()
+        if not tokens:
+            return None
+        ok, value = _literal(tokens)
+        if ok:
+            return value
+        return self.content[tokens[0].start:tokens[-1].end]
+
+def _literal(tokens: List[Token]) -> Tuple[bool, Any]:
+    """Convert tokens forming a single literal, (False, None) otherwise"""
+    if len(tokens) == 1:
+        token = tokens[0]
+        if token.kind == 'string':
+            return True, token.value
+        if token.kind == 'number':
+            number = token.value.rstrip('lLgGdDfF')
+            return True, float(number) if '.' in number or 'e' in number.lower() else int(number)
+        if token.kind == 'name' and token.value in ('true', 'false', 'null'):
+            return True, {'true': True, 'false': False, 'null': None}[token.value]
+        return False, None
+    if len(tokens) == 2 and tokens[0].kind == 'op' and tokens[0].value == '-':
+        ok, value = _literal(tokens[1:])
+        if ok and isinstance(value, (int, float)):
+            return True, -value
+        return False, None
+    if tokens[0].value == '[' and tokens[-1].value == ']' and tokens[0].kind == tokens[-1].kind == 'op':
+        items = []
+        item = []
+        for token in tokens[1:-1] + [Token('op', ',', 0, 0)]:
+            if token.kind == 'op' and token.value == ',':
+                if not item:
+                    return False, None
+                ok, value = _literal(item)
+                if not ok:
+                    return False, None
+                items.append(value)
+                item = []
+            else:
+                item.append(token)
+        return True, items
+    return False, None
+
+def parse_nf_config(content: str) -> Dict:
+    """Extract manifest, params defaults and profile names of a config
+
+    Args:
+        content: nextflow.config source
+
+    Returns:
+        Dictionary with:
+            manifest: manifest scope, MANIFEST_FIELDS default to ''
+            params: default value of each parameter (nested scopes joined
+                with '.'), expressions are kept as source text
+            profiles: profile names in order of appearance
+    """
+    parser = _ConfigParser(content)
+    parser.parse_block(())
+
+    manifest = {field: '' for field in MANIFEST_FIELDS}
+    params = {}
+    for path, value in parser.assignments:
+        if path[0] == 'manifest' and len(path) == 2:
+            manifest[path[1]] = '' if value is None else value
+        elif path[0] == 'params' and len(path) > 1:
+            params['.'.join(path[1:])] = value
+    return {
+        'manifest': manifest,
+        'params': params,
+        'profiles': parser.profiles
+    }
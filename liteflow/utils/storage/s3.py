@@ -2,7 +2,7 @@ import boto3
 from datetime import datetime
 from typing import Dict, List
 from .base import BaseFile
-from ..cache import get_or_set_cache
+from ..cache import get_or_set_cache, s3_namespace
 
 class S3File(BaseFile):
     def __init__(self, settings: Dict):
@@ -64,7 +64,8 @@ class S3File(BaseFile):
                             "size": obj['Size']
                         })
             return items
-        return get_or_set_cache(cache_key, fetch_list)
+        namespace = s3_namespace(self.name, self._parse_path(path)[0]) if path else None
+        return get_or_set_cache(cache_key, fetch_list, namespace=namespace)
 
     def get_download_url(self, path: str) -> str:
         try:
@@ -90,7 +91,8 @@ class S3File(BaseFile):
                 "size": obj['ContentLength']
             }
             
-        return get_or_set_cache(cache_key, fetch_metadata)
+        namespace = s3_namespace(self.name, self._parse_path(path)[0])
+        return get_or_set_cache(cache_key, fetch_metadata, namespace=namespace)
 
     def _parse_path(self, path: str) -> tuple[str, str]:
         """Split path into bucket and key"""
@@ -1,14 +1,29 @@
 from .git_provider import GitProvider
 from .github_provider import GitHubProvider
+from .mirror_provider import MirrorProvider
 from .git_repo import GitRepo
 from .pipeline import Pipeline
+from .registry import get_provider, get_git_repo
+from .pipeline_loader import PipelineLoader
+from .refresh_scheduler import RefreshScheduler
+from .import_jobs import ImportJobManager
+from .commit_history import CommitHistory
+from .search_index import SearchIndex
 from .config import ConfigManager
 from .run_config import RunConfigManager
 __all__ = [
     'GitProvider',
     'GitRepo',
     'Pipeline',
+    'get_provider',
+    'get_git_repo',
+    'PipelineLoader',
+    'RefreshScheduler',
+    'ImportJobManager',
+    'CommitHistory',
+    'SearchIndex',
     'GitHubProvider',
+    'MirrorProvider',
     'ConfigManager',
     'RunConfigManager'
 ]
@@ -0,0 +1,46 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+from ..blob_store import is_commit_sha
+
+class CommitCache:
+    """Bounded in-process LRU of values derived from a repository commit
+
+    Content at a full commit SHA never changes, so values derived from it
+    (parsed config, compiled schema...) are computed once per process.
+    Values for other refs (branch or tag names) are never memoized.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._values: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, repo_id: str, commit_sha: str, compute: Callable[[], Any]) -> Any:
+        """Get the value of a commit, computing it on a miss
+
+        Args:
+            repo_id: Repository identifier (see GitRepo.repo_id)
+            commit_sha: Commit SHA, or another ref (then never memoized)
+            compute: Function computing the value
+
+        Returns:
+            The value (shared between callers, must not be modified)
+        """
+        key = (repo_id, commit_sha)
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                return self._values[key]
+
+        value = compute()
+        if is_commit_sha(commit_sha):
+            with self._lock:
+                self._values[key] = value
+                while len(self._values) > self.size:
+                    self._values.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
@@ -0,0 +1,200 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from flask import Flask
+from ... import models
+from .ref_index import prefix_range, unique_match
+from .registry import get_git_repo
+
+# Commits requested per provider call (GitHub returns at most 100)
+HISTORY_PAGE_SIZE = 100
+
+def _parse_date(date: str) -> datetime:
+    """ISO 8601 date to naive UTC datetime"""
+    parsed = datetime.fromisoformat(date.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+class CommitHistory:
+    def __init__(self, app: Flask):
+        """Initialize CommitHistory
+
+        The default branch history of each repository is stored in the
+        database (models.PipelineCommit). New commits are synced
+        incrementally, asking only for commits since the newest stored one
+        and revalidating with the ETag of the previous sync; older commits
+        are fetched on demand when a page past the stored ones is requested.
+
+        Args:
+            app: Flask application instance
+        """
+        self.app = app
+
+    def _filter(self, model, provider_name: str, org: str, project: str):
+        return model.query.filter_by(provider=provider_name, org_name=org, project_name=project)
+
+    def _state(self, provider_name: str, org: str, project: str) -> models.CommitHistoryState:
+        state = self._filter(models.CommitHistoryState, provider_name, org, project).first()
+        if state is None:
+            state = models.CommitHistoryState(
+                provider=provider_name,
+                org_name=org,
+                project_name=project
+            )
+            models.db.session.add(state)
+        return state
+
+    def _store(self, provider_name: str, org: str, project: str, commits: List[Dict]) -> int:
+        """Insert the commits not stored yet, returning their number"""
+        if not commits:
+            return 0
+        known = {
+            sha for (sha,) in models.db.session.query(models.PipelineCommit.sha).filter(
+                models.PipelineCommit.provider == provider_name,
+                models.PipelineCommit.org_name == org,
+                models.PipelineCommit.project_name == project,
+                models.PipelineCommit.sha.in_([commit['sha'] for commit in commits])
+            )
+        }
+        added = 0
+        for commit in commits:
+            if commit['sha'] in known:
+                continue
+            known.add(commit['sha'])
+            models.db.session.add(models.PipelineCommit(
+                provider=provider_name,
+                org_name=org,
+                project_name=project,
+                sha=commit['sha'],
+                message=commit['message'],
+                author=commit['author'],
+                committed_at=_parse_date(commit['date'])
+            ))
+            added += 1
+        return added
+
+    def _ordered(self, provider_name: str, org: str, project: str):
+        return self._filter(models.PipelineCommit, provider_name, org, project).order_by(
+            models.PipelineCommit.committed_at.desc(),
+            models.PipelineCommit.id.desc()
+        )
+
+    def sync(self, provider_name: str, org: str, project: str) -> int:
+        """Store the commits pushed to the default branch since the last sync
+
+        The first sync stores the last HISTORY_PAGE_SIZE commits only.
+
+        Args:
+            provider_name: Git provider of the pipeline
+            org: Organization name
+            project: Pipeline project name
+
+        Returns:
+            Number of new commits
+        """
+        provider = get_git_repo(provider_name, org, project).provider
+        branch = provider.get_default_branch()
+        state = self._state(provider_name, org, project)
+        if state.branch != branch:
+            # New default branch: its history is not the stored one
+            self._filter(models.PipelineCommit, provider_name, org, project).delete()
+            state.branch = branch
+            state.etag = None
+            state.complete = False
+        newest = self._ordered(provider_name, org, project).first()
+
+        if newest is None:
+            commits, etag = provider.get_commits(branch, per_page=HISTORY_PAGE_SIZE)
+            added = self._store(provider_name, org, project, commits)
+            state.complete = len(commits) < HISTORY_PAGE_SIZE
+        else:
+            since = newest.committed_at.isoformat() + 'Z'
+            commits, etag = provider.get_commits(
+                branch, since=since, per_page=HISTORY_PAGE_SIZE, etag=state.etag
+            )
+            added = 0
+            page = 1
+            # None: nothing new since the previous sync (304 Not Modified)
+            while commits is not None:
+                added += self._store(provider_name, org, project, commits)
+                if len(commits) < HISTORY_PAGE_SIZE:
+                    break
+                page += 1
+                commits, _ = provider.get_commits(
+                    branch, since=since, page=page, per_page=HISTORY_PAGE_SIZE
+                )
+        state.etag = etag
+        state.synced_at = datetime.now(timezone.utc)
+        models.db.session.commit()
+        return added
+
+    def _backfill(self, provider_name: str, org: str, project: str,
+                  state: models.CommitHistoryState) -> int:
+        """Store the commits preceding the oldest stored one, up to a page"""
+        oldest = self._filter(models.PipelineCommit, provider_name, org, project).order_by(
+            models.PipelineCommit.committed_at.asc(),
+            models.PipelineCommit.id.asc()
+        ).first()
+        provider = get_git_repo(provider_name, org, project).provider
+        # The history of a commit starts with the commit itself. per_page is
+        # capped by the provider: a short page is the end of the history
+        commits, _ = provider.get_commits(oldest.sha, per_page=HISTORY_PAGE_SIZE)
+        added = self._store(provider_name, org, project, commits)
+        if len(commits) < HISTORY_PAGE_SIZE or added == 0:
+            state.complete = True
+        models.db.session.commit()
+        return added
+
+    def get_page(self, provider_name: str, org: str, project: str,
+                 page: int = 1, per_page: int = 50) -> Dict:
+        """Get a page of the default branch history, newest first
+
+        Syncs the repository on first use and fetches older commits when
+        the page goes past the stored history.
+
+        Args:
+            provider_name: Git provider of the pipeline
+            org: Organization name
+            project: Pipeline project name
+            page: Page number, starting at 1
+            per_page: Number of commits per page
+
+        Returns:
+            Dictionary with commits, page, per_page and has_more
+        """
+        state = self._filter(models.CommitHistoryState, provider_name, org, project).first()
+        if state is None or state.synced_at is None:
+            self.sync(provider_name, org, project)
+            state = self._state(provider_name, org, project)
+
+        query = self._ordered(provider_name, org, project)
+        needed = page * per_page + 1  # One more to know if there is a next page
+        while not state.complete and query.count() < needed:
+            self._backfill(provider_name, org, project, state)
+
+        commits = query.offset((page - 1) * per_page).limit(per_page + 1).all()
+        return {
+            'commits': [commit._to_dict() for commit in commits[:per_page]],
+            'page': page,
+            'per_page': per_page,
+            'has_more': len(commits) > per_page
+        }
+
+    def resolve(self, provider_name: str, org: str, project: str, prefix: str) -> Optional[str]:
+        """Get the full SHA of a stored commit from a prefix, None if unknown
+
+        Raises:
+            ValueError: If prefix is not a valid short SHA
+            AmbiguousRefError: If several stored commits match
+        """
+        low, high = prefix_range(prefix)
+        shas = [
+            sha for (sha,) in models.db.session.query(models.PipelineCommit.sha).filter(
+                models.PipelineCommit.provider == provider_name,
+                models.PipelineCommit.org_name == org,
+                models.PipelineCommit.project_name == project,
+                models.PipelineCommit.sha >= low,
+                models.PipelineCommit.sha < high
+            ).limit(2)
+        ]
+        return unique_match(prefix, shas)
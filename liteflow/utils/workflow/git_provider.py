@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 class GitProvider(ABC):
     """Abstract base class for Git providers"""
@@ -29,3 +29,21 @@ class GitProvider(ABC):
     def get_file_content(self, path: str, ref: str) -> str:
         """Get file content at specific ref"""
         pass
+
+    @abstractmethod
+    def list_files(self, ref: str) -> List[str]:
+        """List the names of the entries at the root of the tree at ref"""
+        pass
+
+    @abstractmethod
+    def get_commits(self, ref: str, since: Optional[str] = None, page: int = 1,
+                    per_page: int = 100, etag: Optional[str] = None) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        """
+        Get the history of ref, newest first
+        Args:
+            since: Only commits after this ISO 8601 date
+            etag: ETag of a previous identical call, to revalidate it
+        Returns: (commits, etag) with commits None when unchanged since etag,
+            each commit being {'sha', 'message', 'author', 'date'}
+        """
+        pass
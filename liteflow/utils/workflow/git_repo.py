@@ -1,29 +1,101 @@
-import os
 import re
-from typing import Optional
-from markdown import markdown
+from typing import Callable, Optional
+from urllib.parse import urlparse
+from flask import current_app
+from markdown import Markdown
+from markdown.extensions import Extension
+from markdown.treeprocessors import Treeprocessor
+from ..blob_store import is_commit_sha
+from ..cache import get_or_set_cache
 from .git_provider import GitProvider
+from .ref_index import index_refs, is_short_sha, resolve_prefix
+
+# Link attributes of raw HTML fragments (e.g. <picture> logos of nf-core)
+_RAW_HTML_LINK = re.compile(r'\b(src|href|srcset)=([\'"])([^\'"]+)\2')
+
+def _is_relative(url: str) -> bool:
+    return not (urlparse(url).scheme or url.startswith(('#', '//')))
+
+class RelativeLinksTreeprocessor(Treeprocessor):
+    """Rewrite relative src/href attributes while rendering markdown"""
+
+    def __init__(self, md, rewrite: Callable[[str], str]):
+        super().__init__(md)
+        self.rewrite = rewrite
+
+    def _rewrite_srcset(self, srcset: str) -> str:
+        candidates = []
+        for candidate in srcset.split(','):
+            parts = candidate.strip().split(None, 1)
+            if parts and _is_relative(parts[0]):
+                parts[0] = self.rewrite(parts[0])
+            candidates.append(' '.join(parts))
+        return ', '.join(candidates)
+
+    def _rewrite_raw(self, match) -> str:
+        attribute, quote, url = match.groups()
+        if attribute == 'srcset':
+            url = self._rewrite_srcset(url)
+        elif _is_relative(url):
+            url = self.rewrite(url)
+        return f'{attribute}={quote}{url}{quote}'
+
+    def run(self, root):
+        for element in root.iter():
+            for attribute in ('src', 'href'):
+                url = element.get(attribute)
+                if url and _is_relative(url):
+                    element.set(attribute, self.rewrite(url))
+        # Raw HTML is kept out of the tree until postprocessing
+        blocks = self.md.htmlStash.rawHtmlBlocks
+        for i, block in enumerate(blocks):
+            if isinstance(block, str):
+                blocks[i] = _RAW_HTML_LINK.sub(self._rewrite_raw, block)
+
+class RelativeLinksExtension(Extension):
+    def __init__(self, rewrite: Callable[[str], str]):
+        super().__init__()
+        self.rewrite = rewrite
+
+    def extendMarkdown(self, md):
+        # After inline patterns (20), which stash inline raw HTML
+        md.treeprocessors.register(RelativeLinksTreeprocessor(md, self.rewrite), 'relative_links', 8)
 
 class GitRepo:
     def __init__(self, provider: GitProvider):
         self.provider = provider
-        self.refs = {'branches': {}, 'tags': {}}
-                
-        # Initialize refs
-        self.update_refs()
+        # Loaded on first use, then kept for the lifetime of the object
+        self.refs = None
         
     def get_refs(self) -> dict:
         """Get repository refs"""
+        if self.refs is None:
+            self.update_refs()
         return self.refs
         
     def update_refs(self) -> None:
-        """Update repository refs"""
+        """Update repository refs, keeping the ref table in sync"""
         self.refs = self.provider.get_refs()
+        index_refs(self.repo_id, self.refs)
         
     def resolve_ref(self, ref: str, ref_type: str) -> Optional[str]:
-        """Convert ref to commit SHA"""
+        """Convert ref to commit SHA
+
+        Short SHAs are expanded with the ref table, so content is fetched by
+        full SHA; unknown ones are returned as is.
+
+        Raises:
+            AmbiguousRefError: If a short SHA matches several known commits
+        """
         if ref_type == "commit":
-            return ref
+            if is_commit_sha(ref) or not is_short_sha(ref):
+                return ref
+            sha = resolve_prefix(self.repo_id, ref)
+            if sha is None and self.refs is None:
+                # Not indexed yet by this process: loading refs indexes them
+                self.get_refs()
+                sha = resolve_prefix(self.repo_id, ref)
+            return sha or ref
         if ref_type == "branch":
             ref_type = "branches"
         elif ref_type == "tag":
@@ -31,32 +103,60 @@ class GitRepo:
         elif ref_type not in ["branches", "tags"]:
             raise ValueError(f"Invalid ref type: {ref_type} for {self.provider.org}/{self.provider.project}")
         
-        return self.refs[ref_type][ref]
+        return self.get_refs()[ref_type][ref]
         
-    def process_html_content(self, content: str, ref: str) -> str:
-        """Process html content to replace relative URLs with raw URLs"""
-        pattern = r'(src|href)=[\'"](?!(http|ftp|https):\/\/)([^\'"]+)[\'"]'
-        raw_url_base = self.provider.get_raw_file_url("", ref)
-        return re.sub(pattern, lambda m: f'{m.group(1)}="{raw_url_base}/{m.group(3)}"', content)
-
     def fetch_file(self, path: str, ref: str) -> str:
         """Fetch file content using commit SHA with caching"""
         content = self.provider.get_file_content(path, ref)
         return content
 
+    def find_readme(self, ref: str) -> Optional[str]:
+        """Get the name of the README at the root of the tree, None if absent"""
+        names = {name.lower(): name for name in self.provider.list_files(ref)}
+        return names.get('readme.md')
+
+    def render_readme(self, ref: str) -> str:
+        """Render the README to HTML, relative links pointing to raw files"""
+        filename = self.find_readme(ref)
+        if filename is None:
+            return ""
+        content = self.fetch_file(filename, ref)
+
+        def rewrite(url: str) -> str:
+            path = url.lstrip('/')
+            if path.startswith('./'):
+                path = path[2:]
+            return self.provider.get_raw_file_url(path, ref)
+
+        # Markdown instances are not thread-safe: one per rendering
+        return Markdown(extensions=[RelativeLinksExtension(rewrite)]).convert(content)
+
     def get_readme_processed(self, ref: str) -> str:
-        """Get processed markdown content from repository
-        Tries different common markdown filenames"""
-        markdown_files = ['README.md', 'Readme.md', 'readme.md']
-        
-        for filename in markdown_files:
-            try:
-                content = self.fetch_file(filename, ref)
-                processed_content = markdown(content)
-                return self.process_html_content(processed_content, ref)
-            except:
-                continue
-        return ""  # Return empty string if no markdown file found
+        """Get the rendered README, cached per commit
+
+        Returns:
+            HTML content, empty if the repository has no README or it could
+            not be fetched. A commit without a README is cached like any
+            other (its tree never changes), a README listed but not found is
+            cached as absent for CACHE_NEGATIVE_TIMEOUT seconds, and other
+            failures are not cached
+        """
+        try:
+            if not is_commit_sha(ref):
+                return self.render_readme(ref)
+            return get_or_set_cache(
+                f"readme:{self.repo_id}:{ref}",
+                lambda: self.render_readme(ref),
+                timeout=current_app.config['CACHE_STALE_TIMEOUT']
+            )
+        except Exception as e:
+            current_app.logger.error(f"Error rendering README of {self.repo_id} at {ref}: {e}")
+            return ""
+
+    @property
+    def repo_id(self) -> str:
+        """Identifier of the repository (e.g. 'github.com/org/project')"""
+        return f"{self.provider.host}/{self.provider.org}/{self.provider.project}"
 
     @property
     def default_branch(self) -> str:
@@ -1,9 +1,134 @@
 from github import Github, Auth
 from .git_provider import GitProvider
-from ..cache import get_or_set_cache
-from typing import Dict
+from .ref_index import abbreviate
+from ..cache import (
+    get_or_revalidate_cache, refresh_cache, lookup_cache, set_negative_cache, github_namespace,
+    CACHE_NEGATIVE, NOT_MODIFIED
+)
+from ..blob_store import blob_store, is_commit_sha
+from ..github_http import github_http
+from ..github_metrics import github_metrics
+from typing import Dict, List, Optional, Tuple
 from flask import current_app
 import requests
+import threading
+
+# Number of branches/tags requested per GraphQL page (API maximum is 100)
+REFS_PAGE_SIZE = 100
+# Number of recent commits of the default branch listed in refs
+COMMITS_HISTORY_SIZE = 25
+
+REFS_QUERY = """
+query(
+  $owner: String!, $name: String!, $pageSize: Int!, $historySize: Int!,
+  $withHistory: Boolean!, $withBranches: Boolean!, $withTags: Boolean!,
+  $branchCursor: String, $tagCursor: String
+) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef @include(if: $withHistory) {
+      name
+      target {
+        ... on Commit {
+          history(first: $historySize) { nodes { oid } }
+        }
+      }
+    }
+    branches: refs(
+      refPrefix: "refs/heads/", first: $pageSize, after: $branchCursor
+    ) @include(if: $withBranches) {
+      pageInfo { hasNextPage endCursor }
+      nodes { name target { oid } }
+    }
+    tags: refs(
+      refPrefix: "refs/tags/", first: $pageSize, after: $tagCursor
+    ) @include(if: $withTags) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        target {
+          oid
+          ... on Tag {
+            target {
+              oid
+              ... on Tag { target { oid } }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# PyGithub clients shared by all providers, keyed by (API URL, token)
+_clients: Dict[tuple, Github] = {}
+_clients_lock = threading.Lock()
+
+def _get_client(api_url: str, token: Optional[str]) -> Github:
+    """Get the PyGithub client for an API URL and token, created once"""
+    key = (api_url, token)
+    with _clients_lock:
+        if key not in _clients:
+            auth = Auth.Token(token) if token else None
+            _clients[key] = Github(base_url=api_url, auth=auth)
+        return _clients[key]
+
+def _api_urls(host: str, protocol: str) -> Tuple[str, str]:
+    """REST and GraphQL API URLs of github.com or a GitHub Enterprise host"""
+    if host != "github.com":
+        return f"{protocol}://{host}/api/v3", f"{protocol}://{host}/api/graphql"
+    return "https://api.github.com", "https://api.github.com/graphql"
+
+def _api_headers(token: Optional[str]) -> Dict[str, str]:
+    """Headers for raw GitHub API calls"""
+    headers = {
+        'Accept': 'application/vnd.github+json',
+        'X-GitHub-Api-Version': '2022-11-28'
+    }
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+def list_repositories(org: str, host: str = "github.com", protocol: str = "https") -> List[str]:
+    """List the repository names of an organization (or user account)
+
+    Args:
+        org: Organization or user name
+        host: GitHub host
+        protocol: Protocol used with host
+
+    Returns:
+        Repository names, without the organization
+
+    Raises:
+        FileNotFoundError: If the organization does not exist
+    """
+    api_url, _ = _api_urls(host, protocol)
+    token = current_app.config['GITHUB_TOKEN'] or None
+    for owner_kind in ('orgs', 'users'):
+        names = []
+        page = 1
+        while True:
+            response = github_http.get(
+                f"{api_url}/{owner_kind}/{org}/repos",
+                params = {'per_page': 100, 'page': page},
+                headers = _api_headers(token)
+            )
+            if response.status_code == 404:
+                break
+            response.raise_for_status()
+            repositories = response.json()
+            names.extend(repository['name'] for repository in repositories)
+            if len(repositories) < 100:
+                return names
+            page += 1
+    raise FileNotFoundError(f"Organization {org} not found")
+
+def _peel(target: dict) -> str:
+    """Return the commit SHA pointed by a ref target, peeling annotated tags"""
+    while 'target' in target:
+        target = target['target']
+    return target['oid']
 
 class GitHubProvider(GitProvider):
 
@@ -14,86 +139,320 @@ class GitHubProvider(GitProvider):
         self.protocol = protocol
         # Get token from config
         token = current_app.config['GITHUB_TOKEN']
-        if token == "":
-            token = None
-            auth_token = None
-        else:
-            auth_token = Auth.Token(token)
-        self.token = token
-        
-
-        # Initialize GitHub client
-        if host != "github.com":
-            base_url = f"{protocol}://{host}/api/v3"
-            self.gh = Github(base_url=base_url, auth = auth_token)
-        else:
-            self.gh = Github(auth = auth_token)
-            
-        # Get repo with caching
-        self.repo = get_or_set_cache(
-            f"github:repo:{org}:{project}",
-            lambda: self.gh.get_repo(f"{org}/{project}")
+        self.token = token if token != "" else None
+
+        self.api_url, self.graphql_url = _api_urls(host, protocol)
+
+    @property
+    def gh(self) -> Github:
+        """PyGithub client from the process-wide pool"""
+        return _get_client(self.api_url, self.token)
+
+    def get_repo_info(self) -> Dict[str, str]:
+        """Plain-data description of the repository, cached and revalidated
+
+        Returns: {
+            'full_name', 'default_branch', 'url', 'html_url', 'clone_url',
+            'pushed_at'
+        }
+        """
+        return self._cached('repo', f"github:repo:{self.org}:{self.project}", self._fetch_repo)
+
+    def _fetch_repo(self, validators: dict):
+        response = self._conditional_get(
+            f"{self.api_url}/repos/{self.org}/{self.project}", validators
         )
-        
-    def get_refs(self) -> Dict[str, Dict[str, str]]:
-        cache_key = f"github:refs:{self.org}:{self.project}"
-        
-        def fetch_refs():
-            refs = {
-                'branches': {},
-                'tags': {},
-                'commits': {}
-            }
-            
-            # Get branches
-            for branch in self.repo.get_branches():
-                refs['branches'][branch.name] = branch.commit.sha
-                
-            # Get tags
-            for tag in self.repo.get_tags():
-                refs['tags'][tag.name] = tag.commit.sha
-
-            headers = {
-                    'Accept': 'application/vnd.github+json',
-                    'X-GitHub-Api-Version': '2022-11-28'
-                }
-            if self.token:
-                headers["Authorization"] = f"Bearer {self.token}"
-
-            response = requests.get(
-                url = f"https://api.github.com/repos/{self.org}/{self.project}/commits",
-                params = {'per_page': 25, "page": 1},
-                headers = headers
+        if response.status_code == 304:
+            return NOT_MODIFIED
+        if response.status_code == 404:
+            raise FileNotFoundError(f"Repository {self.org}/{self.project} not found")
+        response.raise_for_status()
+        data = response.json()
+        info = {
+            'full_name': data['full_name'],
+            'default_branch': data['default_branch'],
+            'url': data['url'],
+            'html_url': data.get('html_url'),
+            'clone_url': data.get('clone_url'),
+            'pushed_at': data.get('pushed_at')
+        }
+        return info, {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+
+    def _cached(self, kind: str, key: str, fetch_func):
+        """get_or_revalidate_cache, recording lookups that avoided GitHub"""
+        fetched = []
+
+        def tracked_fetch(validators):
+            fetched.append(True)
+            return fetch_func(validators)
+
+        value = get_or_revalidate_cache(key, tracked_fetch, github_namespace(self.org, self.project))
+        if not fetched:
+            github_metrics.record_avoided(kind)
+        return value
+
+    def _api_headers(self) -> Dict[str, str]:
+        """Headers for raw GitHub API calls"""
+        return _api_headers(self.token)
+
+    def _fetch_refs_graphql(self) -> Dict[str, Dict[str, str]]:
+        """Fetch refs with the GraphQL API
+
+        Branches, tags (peeled to their commit), the default branch and its
+        last commits come back in a single query; only repositories with
+        more than REFS_PAGE_SIZE branches or tags need follow-up pages.
+        """
+        refs = {
+            'branches': {},
+            'tags': {},
+            'commits': {}
+        }
+        variables = {
+            'owner': self.org,
+            'name': self.project,
+            'pageSize': REFS_PAGE_SIZE,
+            'historySize': COMMITS_HISTORY_SIZE,
+            'withHistory': True,
+            'withBranches': True,
+            'withTags': True,
+            'branchCursor': None,
+            'tagCursor': None
+        }
+        commits = []
+        while variables['withBranches'] or variables['withTags']:
+            response = github_http.post(
+                url = self.graphql_url,
+                json = {'query': REFS_QUERY, 'variables': variables},
+                headers = self._api_headers()
+            )
+            response.raise_for_status()
+            payload = response.json()
+            if payload.get('errors'):
+                raise RuntimeError(
+                    f"GitHub GraphQL error for {self.org}/{self.project}: "
+                    f"{payload['errors'][0].get('message')}"
+                )
+            repository = payload['data']['repository']
+
+            if variables['withHistory']:
+                default_branch_ref = repository.get('defaultBranchRef')
+                if default_branch_ref:
+                    history = default_branch_ref['target'].get('history', {})
+                    commits.extend(node['oid'] for node in history.get('nodes', []))
+                variables['withHistory'] = False
+
+            for kind, flag, cursor in (
+                ('branches', 'withBranches', 'branchCursor'),
+                ('tags', 'withTags', 'tagCursor')
+            ):
+                if not variables[flag]:
+                    continue
+                connection = repository[kind]
+                for node in connection['nodes']:
+                    refs[kind][node['name']] = _peel(node['target'])
+                page_info = connection['pageInfo']
+                variables[flag] = page_info['hasNextPage']
+                variables[cursor] = page_info['endCursor']
+
+        commits.extend(refs['tags'].values())
+        commits.extend(refs['branches'].values())
+        refs['commits'] = abbreviate(commits)
+        return refs
+
+    def _list_pages(self, path: str) -> List[Dict]:
+        """GET every page of a REST API list (e.g. 'branches')"""
+        items = []
+        page = 1
+        while True:
+            response = github_http.get(
+                url = f"{self.api_url}/repos/{self.org}/{self.project}/{path}",
+                params = {'per_page': 100, 'page': page},
+                headers = self._api_headers()
             )
-            response = response.json()
-            commits = [commit["sha"] for commit in response]
-
-            commits.extend(refs['tags'].values())
-            commits.extend(refs['branches'].values())
-            commits = list(set(commits))
-            for commit in commits:
-                refs['commits'][commit[:7]] = commit
-                
-            return refs
+            response.raise_for_status()
+            results = response.json()
+            items.extend(results)
+            if len(results) < 100:
+                return items
+            page += 1
+
+    def _fetch_refs_rest(self) -> Dict[str, Dict[str, str]]:
+        """Fetch refs with the REST API (GraphQL requires a token)"""
+        refs = {
+            'branches': {},
+            'tags': {},
+            'commits': {}
+        }
+
+        for branch in self._list_pages('branches'):
+            refs['branches'][branch['name']] = branch['commit']['sha']
+
+        # Tags are listed with the commit they point to (already peeled)
+        for tag in self._list_pages('tags'):
+            refs['tags'][tag['name']] = tag['commit']['sha']
+
+        response = github_http.get(
+            url = f"{self.api_url}/repos/{self.org}/{self.project}/commits",
+            params = {'per_page': COMMITS_HISTORY_SIZE, "page": 1},
+            headers = self._api_headers()
+        )
+        response.raise_for_status()
+        commits = [commit["sha"] for commit in response.json()]
+
+        commits.extend(refs['tags'].values())
+        commits.extend(refs['branches'].values())
+        refs['commits'] = abbreviate(commits)
             
-        return get_or_set_cache(cache_key, fetch_refs)
+        return refs
+
+    def _fetch_refs(self, validators: dict):
+        # Refs are assembled from several calls: no validators, the entry
+        # is only refreshed in the background once stale
+        if self.token:
+            return self._fetch_refs_graphql(), {}
+        return self._fetch_refs_rest(), {}
+
+    def get_refs(self) -> Dict[str, Dict[str, str]]:
+        cache_key = f"github:refs:{self.org}:{self.project}"
+        return self._cached('refs', cache_key, self._fetch_refs)
 
     def get_default_branch(self) -> str:
-        cache_key = f"github:default_branch:{self.org}:{self.project}"
-        return get_or_set_cache(
+        return self.get_repo_info()['default_branch']
+
+    def refresh(self) -> None:
+        """Refetch repository (and so default branch) and refs, ignoring freshness"""
+        namespace = github_namespace(self.org, self.project)
+        refresh_cache(f"github:repo:{self.org}:{self.project}", self._fetch_repo, namespace)
+        refresh_cache(f"github:refs:{self.org}:{self.project}", self._fetch_refs, namespace)
+
+    def get_rate_limit(self) -> Dict[str, int]:
+        """Remaining quota of the API used for refs (does not count itself)
+
+        Returns: {'remaining': int, 'reset': epoch seconds}
+        """
+        response = github_http.get(
+            f"{self.api_url}/rate_limit", headers = self._api_headers()
+        )
+        response.raise_for_status()
+        resources = response.json()['resources']
+        resource = resources['graphql'] if self.token else resources['core']
+        return {'remaining': resource['remaining'], 'reset': resource['reset']}
+
+    def get_commits(self, ref: str, since: Optional[str] = None, page: int = 1,
+                    per_page: int = 100, etag: Optional[str] = None) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        params = {'sha': ref, 'page': page, 'per_page': per_page}
+        if since:
+            params['since'] = since
+        response = self._conditional_get(
+            f"{self.api_url}/repos/{self.org}/{self.project}/commits",
+            {'etag': etag},
+            params = params
+        )
+        if response.status_code == 304:
+            return None, etag
+        if response.status_code == 404:
+            raise FileNotFoundError(f"{ref} not found in {self.org}/{self.project}")
+        response.raise_for_status()
+        commits = [
+            {
+                'sha': commit['sha'],
+                'message': commit['commit']['message'].split('\n', 1)[0],
+                'author': commit['commit']['author']['name'],
+                'date': commit['commit']['committer']['date']
+            }
+            for commit in response.json()
+        ]
+        return commits, response.headers.get('ETag')
+
+    def _fetch_tree(self, ref: str, validators: dict):
+        """Fetch root tree entry names, NOT_MODIFIED or (names, validators)"""
+        response = self._conditional_get(
+            f"{self.api_url}/repos/{self.org}/{self.project}/git/trees/{ref}",
+            validators
+        )
+        if response.status_code == 304:
+            return NOT_MODIFIED
+        if response.status_code == 404:
+            raise FileNotFoundError(f"{ref} not found in {self.org}/{self.project}")
+        response.raise_for_status()
+        return [entry['path'] for entry in response.json()['tree']], {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+
+    def list_files(self, ref: str) -> List[str]:
+        cache_key = f"github:tree:{self.org}:{self.project}:{ref}"
+        return self._cached(
+            'trees',
             cache_key,
-            lambda: self.repo.default_branch
+            lambda validators: self._fetch_tree(ref, validators)
         )
 
     def get_raw_file_url(self, path: str, ref: str) -> str:
         """Generate raw file URL for GitHub content"""
         return f"https://raw.githubusercontent.com/{self.org}/{self.project}/{ref}/{path}"
 
+    def _conditional_get(self, url: str, validators: dict, **kwargs) -> requests.Response:
+        """GET a GitHub API URL, revalidating with the stored validators
+
+        A 304 answer to a conditional request does not count against the
+        rate limit.
+        """
+        headers = self._api_headers()
+        headers.update(kwargs.pop('headers', {}))
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return github_http.get(url, headers = headers, **kwargs)
+
+    def _fetch_file(self, path: str, ref: str, validators: dict):
+        """Fetch raw file content, NOT_MODIFIED or (content, validators)"""
+        response = self._conditional_get(
+            f"{self.api_url}/repos/{self.org}/{self.project}/contents/{path}",
+            validators,
+            params = {'ref': ref},
+            headers = {'Accept': 'application/vnd.github.raw+json'}
+        )
+        if response.status_code == 304:
+            return NOT_MODIFIED
+        if response.status_code == 404:
+            raise FileNotFoundError(f"{path} not found in {self.org}/{self.project} at {ref}")
+        response.raise_for_status()
+        return response.content.decode('utf-8'), {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+
     def get_file_content(self, path: str, ref: str) -> str:
         cache_key = f"github:file:{self.org}:{self.project}:{path}:{ref}"
-        
-        def fetch_content():
-            content = self.repo.get_contents(path, ref=ref)
-            return content.decoded_content.decode('utf-8')
-            
-        return get_or_set_cache(cache_key, fetch_content)
+        if is_commit_sha(ref):
+            # Content at a commit never changes: no expiry, no revalidation
+            repo_id = f"{self.host}/{self.org}/{self.project}"
+            content = blob_store.get(repo_id, ref, path)
+            if content is not None:
+                github_metrics.record_avoided('contents')
+                return content.decode('utf-8')
+            # Files absent at a commit (e.g. no schema on an old tag) are
+            # only cached, they are not worth a blob
+            namespace = github_namespace(self.org, self.project)
+            missing = lookup_cache(cache_key, namespace)
+            if missing.status == CACHE_NEGATIVE:
+                github_metrics.record_avoided('contents')
+                raise missing.error
+            try:
+                text, _ = self._fetch_file(path, ref, {})
+            except FileNotFoundError as e:
+                set_negative_cache(cache_key, e, namespace)
+                raise
+            blob_store.put(repo_id, ref, path, text.encode('utf-8'))
+            return text
+
+        return self._cached(
+            'contents',
+            cache_key,
+            lambda validators: self._fetch_file(path, ref, validators)
+        )
@@ -0,0 +1,305 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from flask import Flask
+from ... import models
+from ..github_metrics import github_metrics
+from .git_repo import GitRepo
+from .pipeline import Pipeline
+from .ref_index import recent_tags
+from .registry import get_git_repo, get_provider
+from .search_index import SearchIndex
+
+# Number of imports running concurrently in a process
+IMPORT_WORKERS = 2
+# GitHub API calls expected to resolve one repository: the repository, then
+# its refs with one GraphQL query, or without a token with the REST API
+# (branches, tags and commits, one page each). Reserved before resolving; the
+# calls actually made are charged once done
+RESOLVE_COST = 2
+RESOLVE_COST_REST = 4
+# An unfinished job not updated for this long was lost (e.g. process restarted)
+STALE_JOB_AFTER = timedelta(minutes=10)
+
+class _Budget:
+    """Number of GitHub API calls a bulk import may spend, shared by threads
+
+    cost is the number of calls reserved to resolve one repository.
+    """
+
+    def __init__(self, calls: Optional[int], cost: int = RESOLVE_COST):
+        self.calls = calls
+        self.cost = cost
+        self.lock = threading.Lock()
+
+    def take(self, calls: int) -> bool:
+        if self.calls is None:
+            return True
+        with self.lock:
+            if self.calls < calls:
+                return False
+            self.calls -= calls
+            return True
+
+    def charge(self, calls: int) -> None:
+        """Spend calls made beyond what was taken (negative to give back)"""
+        if self.calls is None:
+            return
+        with self.lock:
+            self.calls -= calls
+
+class ImportJobManager:
+    def __init__(self, app: Flask):
+        """Initialize ImportJobManager
+
+        Imports run as background jobs whose status is kept in the database
+        (models.ImportJob), so any process can report it. A job checks the
+        repository, records the pipeline, then fills the caches (config,
+        schema and README) of the default branch and of the
+        IMPORT_WARM_TAGS most recent tags so the first views are served warm.
+
+        Args:
+            app: Flask application instance
+        """
+        self.app = app
+        self.warm_tags = app.config['IMPORT_WARM_TAGS']
+        self.search_index = SearchIndex(app)
+        self.executor = ThreadPoolExecutor(
+            max_workers=IMPORT_WORKERS,
+            thread_name_prefix='import-job'
+        )
+
+    def submit(self, provider_name: str, org: str, project: str) -> Dict:
+        """Start the import of a pipeline, reusing an unfinished job
+
+        Unfinished jobs not updated for STALE_JOB_AFTER are marked as
+        errors and a new job is started.
+
+        Args:
+            provider_name: Git provider of the pipeline
+            org: Organization name
+            project: Pipeline project name
+
+        Returns:
+            Import job dictionary
+        """
+        unfinished = models.ImportJob.query.filter(
+            models.ImportJob.provider == provider_name,
+            models.ImportJob.org_name == org,
+            models.ImportJob.project_name == project,
+            models.ImportJob.status.in_(('pending', 'validating'))
+        ).all()
+        stale_before = datetime.now() - STALE_JOB_AFTER
+        for job in unfinished:
+            if job.updated_at and job.updated_at > stale_before:
+                return job._to_dict()
+            job.status = 'error'
+            job.error = 'Import interrupted'
+        models.db.session.commit()
+
+        job = models.ImportJob(
+            id=uuid.uuid4().hex,
+            provider=provider_name,
+            org_name=org,
+            project_name=project,
+            status='pending'
+        )
+        models.db.session.add(job)
+        models.db.session.commit()
+        self.executor.submit(self._run, job.id)
+        return job._to_dict()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Get an import job dictionary, None if unknown"""
+        job = models.db.session.get(models.ImportJob, job_id)
+        return job._to_dict() if job else None
+
+    def warm(self, repo: GitRepo, ref: str, ref_type: str) -> None:
+        """Fill the caches used by the pipeline page for one ref"""
+        pipeline = Pipeline(repo, ref, ref_type)
+        try:
+            pipeline.parse_config()
+        except FileNotFoundError:
+            pass
+        try:
+            pipeline.load_schema()
+        except FileNotFoundError:
+            pass
+        repo.get_readme_processed(pipeline.commit_sha)
+
+    def warm_targets(self, repo: GitRepo) -> List[Tuple[str, str]]:
+        """Refs pre-loaded on import: default branch and most recent tags"""
+        targets = [(repo.default_branch, 'branch')]
+        targets += [(tag, 'tag') for tag in recent_tags(repo.get_refs()['tags'], self.warm_tags)]
+        return targets
+
+    def _warm_all(self, repo: GitRepo, name: str, targets: List[Tuple[str, str]]):
+        """Warm each target, yielding after each one"""
+        for ref, ref_type in targets:
+            try:
+                self.warm(repo, ref, ref_type)
+            except Exception as e:
+                # The pipeline is imported, a cold ref is not an error
+                self.app.logger.warning(f"Could not pre-load {name} at {ref}: {e}")
+            yield
+
+    def _index(self, provider_name: str, org: str, project: str) -> None:
+        """Add a pipeline to the search index, from the content just loaded"""
+        try:
+            self.search_index.update(provider_name, org, project)
+        except Exception as e:
+            self.app.logger.warning(f"Could not index {org}/{project} for search: {e}")
+
+    def _update(self, job: models.ImportJob, **fields) -> None:
+        for name, value in fields.items():
+            setattr(job, name, value)
+        models.db.session.commit()
+
+    def _run(self, job_id: str) -> None:
+        """Run an import job (worker thread)"""
+        with self.app.app_context(), github_metrics.label('import_job'):
+            job = models.db.session.get(models.ImportJob, job_id)
+            name = f"{job.org_name}/{job.project_name}"
+            try:
+                self._update(job, status='validating')
+                # Check the repository exists by loading its refs
+                repo = get_git_repo(job.provider, job.org_name, job.project_name)
+                targets = self.warm_targets(repo)
+
+                if not models.Pipeline.query.filter_by(
+                    org_name=job.org_name,
+                    project_name=job.project_name
+                ).first():
+                    models.db.session.add(models.Pipeline(
+                        provider=job.provider,
+                        org_name=job.org_name,
+                        project_name=job.project_name
+                    ))
+                self._update(job, status='warming', refs_to_warm=len(targets))
+            except Exception as e:
+                models.db.session.rollback()
+                self.app.logger.error(f"Error importing pipeline {name}: {e}")
+                self._update(job, status='error', error=str(e))
+                return
+
+            for _ in self._warm_all(repo, name, targets):
+                self._update(job, refs_warmed=job.refs_warmed + 1)
+            self._index(job.provider, job.org_name, job.project_name)
+            self._update(job, status='done')
+
+    def _resolve(self, provider_name: str, org: str, project: str, budget: _Budget) -> Dict:
+        """Check one repository of a bulk import (worker thread)"""
+        result = {'repository': f"{org}/{project}", 'status': 'imported', 'error': None}
+        if not budget.take(budget.cost):
+            result.update(status='skipped', error='GitHub API budget exhausted')
+            return result
+        with self.app.app_context(), github_metrics.label('bulk_import'), \
+                github_metrics.count_calls() as counter:
+            try:
+                repo = get_git_repo(provider_name, org, project)
+                repo.get_refs()
+                result['default_branch'] = repo.default_branch
+            except Exception as e:
+                result.update(status='error', error=str(e))
+        # Pages of refs, or fewer calls thanks to the cache
+        budget.charge(counter['calls'] - budget.cost)
+        return result
+
+    def import_many(self, provider_name: str, repositories: List[str]) -> List[Dict]:
+        """Import several pipelines at once
+
+        Repositories are resolved concurrently (PIPELINES_LOAD_WORKERS
+        threads) within a shared budget of GitHub API calls: the remaining
+        quota minus REFRESH_MIN_RATE_LIMIT. Each repository reserves the
+        calls its path is expected to make and is charged the calls it made.
+        The pipelines found are recorded in a single transaction, then
+        pre-loaded in the background like single imports.
+
+        Args:
+            provider_name: Git provider of the pipelines
+            repositories: 'organization/name' items
+
+        Returns:
+            One result per distinct item, in order: repository, status
+            ('imported', 'exists', 'invalid', 'skipped' or 'error') and error
+        """
+        existing = {
+            f"{pipeline.org_name}/{pipeline.project_name}"
+            for pipeline in models.Pipeline.query.all()
+        }
+        results = []
+        to_resolve = []
+        for repository in dict.fromkeys(repositories):
+            parts = repository.split('/')
+            if len(parts) != 2 or not all(parts):
+                results.append({'repository': repository, 'status': 'invalid',
+                                'error': 'Use "organization/pipeline_name"'})
+            elif repository in existing:
+                results.append({'repository': repository, 'status': 'exists', 'error': None})
+            else:
+                results.append(None)
+                to_resolve.append((len(results) - 1, parts[0], parts[1]))
+        if not to_resolve:
+            return results
+
+        budget = _Budget(None)
+        if provider_name == 'github':
+            org, project = to_resolve[0][1:]
+            try:
+                provider = get_provider(provider_name, org, project)
+                quota = provider.get_rate_limit()
+                budget = _Budget(
+                    quota['remaining'] - self.app.config['REFRESH_MIN_RATE_LIMIT'],
+                    RESOLVE_COST if provider.token else RESOLVE_COST_REST
+                )
+            except Exception as e:
+                self.app.logger.warning(f"Could not get the GitHub quota for a bulk import: {e}")
+
+        with ThreadPoolExecutor(
+            max_workers=self.app.config['PIPELINES_LOAD_WORKERS'],
+            thread_name_prefix='bulk-import'
+        ) as executor:
+            futures = [
+                (index, executor.submit(self._resolve, provider_name, org, project, budget))
+                for index, org, project in to_resolve
+            ]
+            for index, future in futures:
+                results[index] = future.result()
+
+        imported = [
+            result['repository'].split('/') for result in results
+            if result['status'] == 'imported'
+        ]
+        try:
+            for org, project in imported:
+                models.db.session.add(models.Pipeline(
+                    provider=provider_name,
+                    org_name=org,
+                    project_name=project
+                ))
+            models.db.session.commit()
+        except Exception as e:
+            models.db.session.rollback()
+            for result in results:
+                if result['status'] == 'imported':
+                    result.update(status='error', error=f"Database error: {e}")
+            return results
+
+        for org, project in imported:
+            self.executor.submit(self._warm_imported, provider_name, org, project)
+        return results
+
+    def _warm_imported(self, provider_name: str, org: str, project: str) -> None:
+        """Pre-load a pipeline recorded by a bulk import (worker thread)"""
+        with self.app.app_context(), github_metrics.label('bulk_import'):
+            try:
+                repo = get_git_repo(provider_name, org, project)
+                targets = self.warm_targets(repo)
+            except Exception as e:
+                self.app.logger.warning(f"Could not pre-load {org}/{project}: {e}")
+                return
+            for _ in self._warm_all(repo, f"{org}/{project}", targets):
+                pass
+            self._index(provider_name, org, project)
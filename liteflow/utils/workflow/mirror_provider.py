@@ -0,0 +1,222 @@
+import base64
+import os
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from flask import current_app
+from .git_provider import GitProvider
+from .ref_index import abbreviate
+
+# Number of recent commits of the default branch listed in refs
+COMMITS_HISTORY_SIZE = 25
+# Seconds a git command (e.g. the first clone of a mirror) may run
+GIT_TIMEOUT = 600
+
+class _CatFileBatch:
+    """Long-lived `git cat-file --batch` process serving object reads"""
+
+    def __init__(self, git_dir: Path):
+        self.git_dir = git_dir
+        self.lock = threading.Lock()
+        self.process = None
+
+    def _start(self):
+        self.process = subprocess.Popen(
+            ['git', '--git-dir', str(self.git_dir), 'cat-file', '--batch'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+
+    def read(self, spec: str) -> Optional[bytes]:
+        """Read object content by spec (e.g. '<ref>:<path>'), None if missing"""
+        with self.lock:
+            if self.process is None or self.process.poll() is not None:
+                self._start()
+            self.process.stdin.write(spec.encode('utf-8') + b'\n')
+            self.process.stdin.flush()
+            header = self.process.stdout.readline().decode('utf-8').rstrip('\n')
+            if header.endswith((' missing', ' ambiguous')):
+                return None
+            _, object_type, size = header.split()
+            content = self.process.stdout.read(int(size))
+            self.process.stdout.read(1)  # Trailing newline
+            if object_type != 'blob':
+                return None
+            return content
+
+    def close(self):
+        """Stop the process; it is restarted on next read"""
+        with self.lock:
+            if self.process is not None and self.process.poll() is None:
+                self.process.stdin.close()
+                self.process.wait()
+            self.process = None
+
+class MirrorProvider(GitProvider):
+    """Git provider serving a local bare mirror clone
+
+    The mirror lives under PIPELINES_DIR/<org>/<project>.git and is refreshed
+    with `git fetch` by the first read of refs or files once older than
+    CACHE_DEFAULT_TIMEOUT. Refs come from `git for-each-ref` and files from a
+    `git cat-file --batch` process kept open for the whole process lifetime,
+    so reads between two fetches never leave the machine.
+    """
+
+    # Per mirror state shared by all instances of the process
+    _batches: Dict[Path, _CatFileBatch] = {}
+    _fetch_locks: Dict[Path, threading.Lock] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, org: str, project: str, host: str = "github.com", protocol: str = "https",
+                 remote_url: Optional[str] = None):
+        self.org = org
+        self.project = project
+        self.host = host
+        self.protocol = protocol
+        self.remote_url = remote_url or f"{protocol}://{host}/{org}/{project}.git"
+        self.git_dir = Path(current_app.config['PIPELINES_DIR']) / org / f"{project}.git"
+        self.refresh_interval = current_app.config['CACHE_DEFAULT_TIMEOUT']
+        token = current_app.config['GITHUB_TOKEN']
+        self.token = token if token and host == "github.com" else None
+
+        with self._registry_lock:
+            if self.git_dir not in self._batches:
+                self._batches[self.git_dir] = _CatFileBatch(self.git_dir)
+                self._fetch_locks[self.git_dir] = threading.Lock()
+        self._batch = self._batches[self.git_dir]
+        self._fetch_lock = self._fetch_locks[self.git_dir]
+
+        self.refresh()
+
+    def _git(self, *args: str, git_dir: bool = True) -> str:
+        """Run a git command and return its stdout"""
+        command = ['git']
+        env = {**os.environ, 'GIT_TERMINAL_PROMPT': '0'}
+        if self.token:
+            # Passed in the environment: the command line is visible to all users
+            credentials = base64.b64encode(f"x-access-token:{self.token}".encode()).decode()
+            env.update({
+                'GIT_CONFIG_COUNT': '1',
+                'GIT_CONFIG_KEY_0': 'http.extraHeader',
+                'GIT_CONFIG_VALUE_0': f"Authorization: Basic {credentials}"
+            })
+        if git_dir:
+            command += ['--git-dir', str(self.git_dir)]
+        try:
+            result = subprocess.run(
+                command + list(args),
+                capture_output=True,
+                text=True,
+                env=env,
+                timeout=GIT_TIMEOUT
+            )
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(
+                f"git {args[0]} timed out after {GIT_TIMEOUT}s for {self.org}/{self.project}"
+            )
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"git {args[0]} failed for {self.org}/{self.project}: {result.stderr.strip()}"
+            )
+        return result.stdout
+
+    @property
+    def last_fetch(self) -> Optional[float]:
+        """Timestamp of the last clone or fetch of the mirror"""
+        marker = self.git_dir / 'FETCH_HEAD'
+        if not marker.exists():
+            marker = self.git_dir / 'HEAD'
+        return marker.stat().st_mtime if marker.exists() else None
+
+    def refresh(self, force: bool = False) -> None:
+        """Clone the mirror or fetch it when older than the refresh interval
+
+        Args:
+            force: Fetch even if the mirror is recent
+        """
+        with self._fetch_lock:
+            last_fetch = self.last_fetch
+            if last_fetch is None:
+                self.git_dir.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    self._git('clone', '--mirror', '--quiet', self.remote_url, str(self.git_dir), git_dir=False)
+                except RuntimeError:
+                    # A clone killed on timeout leaves a partial mirror behind
+                    shutil.rmtree(self.git_dir, ignore_errors=True)
+                    raise
+                return
+            if not force and time.time() - last_fetch < self.refresh_interval:
+                return
+            self._git('fetch', '--prune', '--quiet', 'origin')
+            (self.git_dir / 'FETCH_HEAD').touch()
+            # Follow changes of the remote default branch
+            for line in self._git('ls-remote', '--symref', 'origin', 'HEAD').splitlines():
+                if line.startswith('ref: ') and line.endswith('\tHEAD'):
+                    self._git('symbolic-ref', 'HEAD', line[len('ref: '):-len('\tHEAD')])
+            # New packs are picked up by a fresh cat-file process
+            self._batch.close()
+
+    def get_refs(self) -> Dict[str, Dict[str, str]]:
+        self.refresh()
+        refs = {
+            'branches': {},
+            'tags': {},
+            'commits': {}
+        }
+        output = self._git(
+            'for-each-ref',
+            '--format=%(refname)%00%(objectname)%00%(*objectname)',
+            'refs/heads', 'refs/tags'
+        )
+        for line in output.splitlines():
+            refname, sha, peeled = line.split('\0')
+            if refname.startswith('refs/heads/'):
+                refs['branches'][refname[len('refs/heads/'):]] = sha
+            else:
+                # Annotated tags are peeled to their commit
+                refs['tags'][refname[len('refs/tags/'):]] = peeled or sha
+
+        commits = self._git('rev-list', f'--max-count={COMMITS_HISTORY_SIZE}', 'HEAD').split()
+        commits.extend(refs['tags'].values())
+        commits.extend(refs['branches'].values())
+        refs['commits'] = abbreviate(commits)
+        return refs
+
+    def get_default_branch(self) -> str:
+        return self._git('symbolic-ref', '--short', 'HEAD').strip()
+
+    def get_raw_file_url(self, path: str, ref: str) -> str:
+        """Generate raw file URL for the remote repository"""
+        if self.host == "github.com":
+            return f"https://raw.githubusercontent.com/{self.org}/{self.project}/{ref}/{path}"
+        return f"{self.protocol}://{self.host}/{self.org}/{self.project}/raw/{ref}/{path}"
+
+    def get_commits(self, ref: str, since: Optional[str] = None, page: int = 1,
+                    per_page: int = 100, etag: Optional[str] = None) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        args = [
+            'log', '--format=%H%x00%s%x00%an%x00%cI',
+            f'--max-count={per_page}', f'--skip={(page - 1) * per_page}'
+        ]
+        if since:
+            args.append(f'--since={since}')
+        commits = []
+        for line in self._git(*args, ref, '--').splitlines():
+            sha, message, author, date = line.split('\0')
+            commits.append({'sha': sha, 'message': message, 'author': author, 'date': date})
+        return commits, None
+
+    def list_files(self, ref: str) -> List[str]:
+        self.refresh()
+        output = self._git('ls-tree', '--name-only', '-z', ref)
+        return [name for name in output.split('\0') if name]
+
+    def get_file_content(self, path: str, ref: str) -> str:
+        self.refresh()
+        content = self._batch.read(f"{ref}:{path}")
+        if content is None:
+            raise FileNotFoundError(f"{path} not found in {self.org}/{self.project} at {ref}")
+        return content.decode('utf-8')
@@ -1,6 +1,13 @@
 from typing import Dict, Optional
 from .git_repo import GitRepo
-from ..nf import parse_nf_manifest
+from ..nf import parse_nf_config
+from .commit_cache import CommitCache
+from .schema import PipelineSchema, get_pipeline_schema
+
+# Number of parsed nextflow.config kept in memory (one per repository commit)
+CONFIG_CACHE_SIZE = 256
+
+_configs = CommitCache(CONFIG_CACHE_SIZE)
 
 class Pipeline:
     def __init__(self, git_repo: GitRepo, release: str = None, release_type: str = None):
@@ -11,9 +18,6 @@ class Pipeline:
         # Initialize commit_sha as None
         self.commit_sha = None
         
-        # Update refs on init
-        self.git_repo.update_refs()
-        
         # If no release specified, try to use default branch
         if not (release and release_type):
             refs = self.get_refs()
@@ -51,13 +55,31 @@ class Pipeline:
             raise ValueError("No commit SHA available. Initialize with valid release and release_type.")
         return self.git_repo.fetch_file("nextflow.config", self.commit_sha)
         
+    def parse_config(self) -> dict:
+        """Parse nextflow.config, once per commit (see parse_nf_config)
+
+        The result is shared and must not be modified.
+        """
+        if not self.commit_sha:
+            raise ValueError("No commit SHA available. Initialize with valid release and release_type.")
+        return _configs.get_or_compute(
+            self.git_repo.repo_id,
+            self.commit_sha,
+            lambda: parse_nf_config(self.fetch_config())
+        )
+
     def parse_metadata(self) -> dict:
-        """Parse nextflow.config for metadata"""
-        config = self.fetch_config()
-        return parse_nf_manifest(config)
+        """Parse nextflow.config for metadata (manifest scope)"""
+        return dict(self.parse_config()['manifest'])
         
     def fetch_schema(self) -> str:
         """Get nextflow_schema.json content"""
         if not self.commit_sha:
             raise ValueError("No commit SHA available. Initialize with valid release and release_type.")
         return self.git_repo.fetch_file("nextflow_schema.json", self.commit_sha)
+
+    def load_schema(self) -> PipelineSchema:
+        """Get the processed nextflow_schema.json and its validator"""
+        if not self.commit_sha:
+            raise ValueError("No commit SHA available. Initialize with valid release and release_type.")
+        return get_pipeline_schema(self.git_repo, self.commit_sha)
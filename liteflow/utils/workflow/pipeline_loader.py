@@ -0,0 +1,172 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from typing import Dict, List
+from flask import Flask, request, has_request_context
+from ... import models
+from ..github_metrics import github_metrics
+from .pipeline import Pipeline
+from .registry import get_git_repo
+
+# Pipelines per page of the pipelines list (first page rendered with the HTML)
+PIPELINES_PAGE_SIZE = 50
+
+class PipelineLoader:
+    def __init__(self, app: Flask):
+        """Initialize PipelineLoader
+
+        Metadata of every pipeline is fetched in a bounded, process-wide
+        thread pool. Loads that do not finish before the page deadline keep
+        running in the background and are reused by the next call, so they
+        end up warming the cache instead of being thrown away.
+
+        Args:
+            app: Flask application instance
+        """
+        self.app = app
+        self.executor = ThreadPoolExecutor(
+            max_workers=app.config['PIPELINES_LOAD_WORKERS'],
+            thread_name_prefix='pipeline-loader'
+        )
+        self._pending: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    def load_summary(self, provider_name: str, org: str, project: str) -> Dict:
+        """Fetch the summary of one pipeline at its default branch
+
+        Args:
+            provider_name: Git provider of the pipeline
+            org: Organization name
+            project: Pipeline project name
+
+        Returns:
+            Pipeline summary dictionary as rendered on the pipelines page
+
+        Raises:
+            ValueError: If the provider is not supported
+        """
+        repo = get_git_repo(provider_name, org, project)
+        default_branch = repo.default_branch
+        pipeline = Pipeline(repo, default_branch, 'branch')
+        metadata = pipeline.parse_metadata()
+        # Refs themselves are served separately (see /api/pipelines/<org>/<project>/refs)
+        refs = repo.get_refs()
+        return {
+            'organization': org,
+            'project': project,
+            'status': 'ready',
+            'description': metadata['description'],
+            'tag': None,  # Will be set by frontend when user selects
+            'branch': default_branch,  # GitHub's default branch
+            'commit': refs['branches'][default_branch][:7],
+            'ref_type': 'branch',  # Default to branch
+            'default_branch': default_branch
+        }
+
+    def _run(self, route: str, provider_name: str, org: str, project: str) -> Dict:
+        """Run load_summary inside an application context (worker thread)"""
+        with self.app.app_context(), github_metrics.label(route):
+            return self.load_summary(provider_name, org, project)
+
+    def submit(self, provider_name: str, org: str, project: str) -> Future:
+        """Schedule the load of one pipeline, reusing an in-flight load
+
+        Args:
+            provider_name: Git provider of the pipeline
+            org: Organization name
+            project: Pipeline project name
+
+        Returns:
+            Future resolving to the pipeline summary dictionary
+        """
+        key = (provider_name, org, project)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            # Attribute GitHub calls to the page that triggered the load
+            route = request.endpoint if has_request_context() else 'pipeline_loader'
+            future = self.executor.submit(self._run, route, provider_name, org, project)
+            self._pending[key] = future
+        # Outside the lock: the callback runs right away if the load is done
+        future.add_done_callback(lambda f, key=key: self._forget(key, f))
+        return future
+
+    def _forget(self, key: tuple, future: Future) -> None:
+        """Drop a finished load from the in-flight registry"""
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def load_all(self, items: List, timeout: float) -> List[Dict]:
+        """Load the summaries of several pipelines concurrently
+
+        Args:
+            items: models.Pipeline rows
+            timeout: Deadline in seconds for the whole batch
+
+        Returns:
+            List of pipeline summaries in the order of items. Pipelines that
+            did not finish in time have status 'loading', failed ones have
+            status 'error'.
+        """
+        futures = [
+            self.submit(item.provider, item.org_name, item.project_name)
+            for item in items
+        ]
+        wait(futures, timeout=timeout)
+
+        pipeline_list = []
+        for item, future in zip(items, futures):
+            if not future.done():
+                pipeline_list.append(self._placeholder(item, 'loading'))
+            elif future.exception() is not None:
+                self.app.logger.error(
+                    f"Error loading pipeline {item.org_name}/{item.project_name}: "
+                    f"{future.exception()}"
+                )
+                pipeline_list.append(self._placeholder(item, 'error'))
+            else:
+                pipeline_list.append(future.result())
+        return pipeline_list
+
+    def load_page(self, page: int = 1, per_page: int = PIPELINES_PAGE_SIZE) -> Dict:
+        """Load the summaries of one page of imported pipelines
+
+        Pipelines are ordered by organization then name; the page is loaded
+        with load_all and the PIPELINES_LOAD_TIMEOUT deadline.
+
+        Args:
+            page: Page number, starting at 1
+            per_page: Number of pipelines per page
+
+        Returns:
+            Dictionary with pipelines, page, per_page, total and has_more
+        """
+        query = models.Pipeline.query.order_by(
+            models.Pipeline.org_name,
+            models.Pipeline.project_name
+        )
+        total = query.count()
+        items = query.offset((page - 1) * per_page).limit(per_page).all()
+        return {
+            'pipelines': self.load_all(items, timeout=self.app.config['PIPELINES_LOAD_TIMEOUT']),
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'has_more': page * per_page < total
+        }
+
+    @staticmethod
+    def _placeholder(item, status: str) -> Dict:
+        """Build a summary without Git information for an unfinished load"""
+        return {
+            'organization': item.org_name,
+            'project': item.project_name,
+            'status': status,
+            'description': '',
+            'tag': None,
+            'branch': None,
+            'commit': None,
+            'ref_type': None,
+            'default_branch': None
+        }
@@ -0,0 +1,161 @@
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from flask import current_app
+from ... import models
+
+# Shortest prefix accepted for commit lookups (as git)
+MIN_PREFIX_LENGTH = 4
+# Length of the short SHAs shown for commits, longer on collisions
+SHORT_SHA_LENGTH = 7
+
+_HEX = re.compile(r'^[0-9a-f]+$')
+
+# Fingerprint of the refs last indexed per repository, to skip unchanged writes
+_indexed: Dict[str, int] = {}
+_indexed_lock = threading.Lock()
+
+class AmbiguousRefError(ValueError):
+    """Raised when a short SHA matches several commits"""
+
+    def __init__(self, prefix: str, shas: List[str]):
+        super().__init__(f"Short SHA {prefix} is ambiguous: matches {', '.join(sorted(shas))}")
+        self.prefix = prefix
+        self.shas = shas
+
+def abbreviate(shas: Iterable[str], length: int = SHORT_SHA_LENGTH) -> Dict[str, str]:
+    """Map commits by their shortest unambiguous prefix of at least length
+
+    Args:
+        shas: Full commit SHAs (duplicates are ignored)
+        length: Minimum prefix length
+
+    Returns:
+        Dictionary of short SHA to full SHA
+    """
+    ordered = sorted(set(shas))
+    short = {}
+    for i, sha in enumerate(ordered):
+        # In sorted order, the longest common prefix is with a neighbour
+        common = 0
+        for neighbour in ordered[max(i - 1, 0):i] + ordered[i + 1:i + 2]:
+            n = 0
+            while n < len(sha) and n < len(neighbour) and sha[n] == neighbour[n]:
+                n += 1
+            common = max(common, n)
+        short[sha[:max(length, common + 1)]] = sha
+    return short
+
+def is_short_sha(ref: str) -> bool:
+    """Whether ref can be a commit prefix (hexadecimal, MIN_PREFIX_LENGTH or more)"""
+    return len(ref) >= MIN_PREFIX_LENGTH and bool(_HEX.match(ref.lower()))
+
+def _version_key(name: str) -> List[tuple]:
+    """Sort key ordering tag names as versions (1.10.0 after 1.9.0)"""
+    return [
+        (0, int(part), '') if part.isdigit() else (1, 0, part)
+        for part in re.split(r'(\d+)', name) if part
+    ]
+
+def recent_tags(tags: Dict[str, str], count: int) -> List[str]:
+    """Get the names of the count most recent tags, by version order"""
+    if count <= 0:
+        return []
+    return sorted(tags, key=_version_key, reverse=True)[:count]
+
+def prefix_range(prefix: str) -> Tuple[str, str]:
+    """Bounds of the SHAs starting with prefix: low <= sha < high
+
+    Raises:
+        ValueError: If prefix is not hexadecimal or too short
+    """
+    prefix = prefix.lower()
+    if not is_short_sha(prefix):
+        raise ValueError(f"Invalid short SHA: {prefix} (at least {MIN_PREFIX_LENGTH} hexadecimal characters)")
+    # 'g' sorts after every hexadecimal digit
+    return prefix, prefix + 'g'
+
+def unique_match(prefix: str, shas: List[str]) -> Optional[str]:
+    """The single SHA matching prefix, None if none
+
+    Raises:
+        AmbiguousRefError: If several SHAs match
+    """
+    if len(shas) > 1:
+        raise AmbiguousRefError(prefix, shas)
+    return shas[0] if shas else None
+
+def _fingerprint(refs: Dict[str, Dict[str, str]]) -> int:
+    return hash((
+        frozenset(refs['branches'].items()),
+        frozenset(refs['tags'].items()),
+        frozenset(refs['commits'].values())
+    ))
+
+def index_refs(repo_id: str, refs: Dict[str, Dict[str, str]]) -> bool:
+    """Store the refs of a repository in the ref table
+
+    Branches and tags are replaced by the given ones. Commits are only
+    added: a commit stays resolvable once it left the recent history.
+    Nothing is written when the refs did not change since the last call
+    of this process.
+
+    Args:
+        repo_id: Repository identifier (see GitRepo.repo_id)
+        refs: Refs as returned by GitProvider.get_refs
+
+    Returns:
+        Whether the table was written
+    """
+    fingerprint = _fingerprint(refs)
+    with _indexed_lock:
+        if _indexed.get(repo_id) == fingerprint:
+            return False
+
+    wanted = {('branch', name): sha for name, sha in refs['branches'].items()}
+    wanted.update({('tag', name): sha for name, sha in refs['tags'].items()})
+    wanted.update({('commit', sha): sha for sha in refs['commits'].values()})
+    try:
+        for row in models.PipelineRef.query.filter_by(repo=repo_id):
+            sha = wanted.pop((row.kind, row.name), None)
+            if sha is None:
+                if row.kind != 'commit':
+                    models.db.session.delete(row)
+            elif row.sha != sha:
+                row.sha = sha
+        for (kind, name), sha in wanted.items():
+            models.db.session.add(models.PipelineRef(repo=repo_id, kind=kind, name=name, sha=sha))
+        models.db.session.commit()
+    except Exception as e:
+        # e.g. another process indexed the same refs concurrently
+        models.db.session.rollback()
+        current_app.logger.warning(f"Could not index refs of {repo_id}: {e}")
+        return False
+
+    with _indexed_lock:
+        _indexed[repo_id] = fingerprint
+    return True
+
+def resolve_prefix(repo_id: str, prefix: str) -> Optional[str]:
+    """Get the indexed commit whose SHA starts with prefix
+
+    Args:
+        repo_id: Repository identifier (see GitRepo.repo_id)
+        prefix: Short SHA, at least MIN_PREFIX_LENGTH characters
+
+    Returns:
+        Full SHA, None if no indexed commit matches
+
+    Raises:
+        ValueError: If prefix is not a valid short SHA
+        AmbiguousRefError: If several commits match
+    """
+    low, high = prefix_range(prefix)
+    shas = [
+        sha for (sha,) in models.db.session.query(models.PipelineRef.sha).filter(
+            models.PipelineRef.repo == repo_id,
+            models.PipelineRef.sha >= low,
+            models.PipelineRef.sha < high
+        ).distinct().limit(2)
+    ]
+    return unique_match(prefix, shas)
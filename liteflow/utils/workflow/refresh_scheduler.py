@@ -0,0 +1,186 @@
+import fcntl
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+from flask import Flask
+from ... import models
+from ..github_metrics import github_metrics
+from .commit_history import CommitHistory
+from .registry import get_provider
+from .search_index import SearchIndex
+
+# Maximum random delay in seconds between two pipelines of a cycle
+PIPELINE_SPREAD = 2.0
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+class RateLimitReached(Exception):
+    """Raised when the GitHub quota is too low for background refreshes"""
+
+    def __init__(self, reset: float):
+        super().__init__(f"GitHub rate limit reached, reset at {reset}")
+        self.reset = reset
+
+class RefreshScheduler:
+    def __init__(self, app: Flask):
+        """Initialize RefreshScheduler
+
+        Periodically refreshes refs, default branch and manifest of every
+        imported pipeline so interactive requests are served from a warm
+        cache. Only one process (the one holding the lock file in ROOT_DIR)
+        runs the loop; the status is shared through a JSON file in DATA_DIR.
+
+        Args:
+            app: Flask application instance
+        """
+        self.app = app
+        self.interval = app.config['REFRESH_INTERVAL']
+        self.min_remaining = app.config['REFRESH_MIN_RATE_LIMIT']
+        self.lock_path = Path(app.config['ROOT_DIR']) / 'refresh_scheduler.lock'
+        self.status_path = Path(app.config['DATA_DIR']) / 'refresh_status.json'
+        self.loader = app.extensions['pipeline_loader']
+        self.commit_history = CommitHistory(app)
+        self.search_index = SearchIndex(app)
+        self._lock_file = None
+        self._stop = threading.Event()
+
+    def start(self) -> bool:
+        """Start the refresh loop unless disabled or run by another process
+
+        Returns:
+            Whether this process runs the scheduler
+        """
+        if self.interval <= 0:
+            return False
+        lock_file = open(self.lock_path, 'w')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        # Keep the file open: the lock lasts as long as the process
+        self._lock_file = lock_file
+        threading.Thread(target=self._loop, name='refresh-scheduler', daemon=True).start()
+        self.app.logger.info(f"Refresh scheduler started (every {self.interval}s)")
+        return True
+
+    def stop(self) -> None:
+        """Stop the refresh loop after the current cycle"""
+        self._stop.set()
+
+    def _loop(self) -> None:
+        # Initial jitter so restarts of several deployments do not align
+        delay = random.uniform(0, min(60, self.interval))
+        while not self._stop.wait(delay):
+            try:
+                self.run_once()
+            except Exception as e:
+                self.app.logger.error(f"Refresh scheduler cycle failed: {e}")
+            delay = self.interval * random.uniform(0.9, 1.1)
+
+    def status(self) -> Dict:
+        """Get the status of the last refresh cycle
+
+        Returns:
+            Dictionary with last_run, duration, next_run, rate_limited_until
+            and, per pipeline, last_refresh, duration, error and failures
+        """
+        try:
+            return json.loads(self.status_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {
+                'last_run': None,
+                'duration': None,
+                'next_run': None,
+                'rate_limited_until': None,
+                'pipelines': {}
+            }
+
+    def _write_status(self, status: Dict) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.status_path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(status, f, indent=2)
+        os.replace(tmp_path, self.status_path)
+
+    def refresh_pipeline(self, item) -> None:
+        """Refresh refs, default branch, manifest, commit history and search index of one pipeline
+
+        Args:
+            item: models.Pipeline row
+        """
+        provider = get_provider(item.provider, item.org_name, item.project_name)
+        if item.provider == 'github':
+            # Mirrors are fetched with git, outside the API quota
+            quota = provider.get_rate_limit()
+            if quota['remaining'] < self.min_remaining:
+                raise RateLimitReached(quota['reset'])
+        provider.refresh()
+        # Warms nextflow.config of the (possibly new) default branch commit
+        self.loader.load_summary(item.provider, item.org_name, item.project_name)
+        self.commit_history.sync(item.provider, item.org_name, item.project_name)
+        self.search_index.update(item.provider, item.org_name, item.project_name)
+
+    def run_once(self) -> Dict:
+        """Refresh every pipeline once
+
+        Stops early when the remaining GitHub quota falls below
+        REFRESH_MIN_RATE_LIMIT, leaving the quota to interactive requests.
+
+        Returns:
+            The new status (see status)
+        """
+        with self.app.app_context(), github_metrics.label('refresh_scheduler'):
+            status = self.status()
+            started = time.time()
+            status['rate_limited_until'] = None
+            items = models.Pipeline.query.all()
+            for i, item in enumerate(items):
+                name = f"{item.org_name}/{item.project_name}"
+                previous = status['pipelines'].get(name, {})
+                pipeline_started = time.time()
+                try:
+                    self.refresh_pipeline(item)
+                except RateLimitReached as e:
+                    status['rate_limited_until'] = _isoformat(e.reset)
+                    self.app.logger.warning(
+                        f"Refresh scheduler paused until {status['rate_limited_until']}: "
+                        f"GitHub quota below {self.min_remaining}"
+                    )
+                    break
+                except Exception as e:
+                    self.app.logger.error(f"Refresh of {name} failed: {e}")
+                    status['pipelines'][name] = {
+                        'last_refresh': previous.get('last_refresh'),
+                        'last_attempt': _isoformat(pipeline_started),
+                        'duration': time.time() - pipeline_started,
+                        'error': str(e),
+                        'failures': previous.get('failures', 0) + 1
+                    }
+                else:
+                    status['pipelines'][name] = {
+                        'last_refresh': _isoformat(pipeline_started),
+                        'last_attempt': _isoformat(pipeline_started),
+                        'duration': time.time() - pipeline_started,
+                        'error': None,
+                        'failures': 0
+                    }
+                if i < len(items) - 1:
+                    time.sleep(random.uniform(0, PIPELINE_SPREAD))
+
+            # Forget pipelines that were deleted
+            names = {f"{item.org_name}/{item.project_name}" for item in items}
+            status['pipelines'] = {
+                name: value for name, value in status['pipelines'].items() if name in names
+            }
+            status['last_run'] = _isoformat(started)
+            status['duration'] = time.time() - started
+            status['next_run'] = _isoformat(time.time() + self.interval)
+            self._write_status(status)
+            return status
@@ -0,0 +1,92 @@
+import threading
+from concurrent.futures import Future
+from typing import Dict, Tuple
+from flask import g, current_app
+from .git_provider import GitProvider
+from .github_provider import GitHubProvider
+from .mirror_provider import MirrorProvider
+from .git_repo import GitRepo
+
+# Provider implementations by models.Pipeline.provider value
+PROVIDERS = {
+    'github': GitHubProvider,
+    'mirror': MirrorProvider
+}
+
+# Process-wide identity map of providers, keyed by (provider, org, project)
+_providers: Dict[Tuple[str, str, str], GitProvider] = {}
+# Providers being created (e.g. a mirror being cloned), by key
+_creating: Dict[Tuple[str, str, str], Future] = {}
+_providers_lock = threading.Lock()
+
+def get_provider(provider_name: str, org: str, project: str) -> GitProvider:
+    """Get the provider of a repository, shared by the whole process
+
+    A provider is created once, outside the process-wide lock: callers
+    asking for the same repository meanwhile wait for it, others do not.
+
+    Args:
+        provider_name: Git provider ('github' or 'mirror')
+        org: Organization name
+        project: Project name
+
+    Returns:
+        GitProvider instance
+
+    Raises:
+        ValueError: If the provider is not supported
+    """
+    if provider_name not in PROVIDERS:
+        raise ValueError(f"Unsupported provider: {provider_name}")
+    key = (provider_name, org, project)
+    provider = _providers.get(key)
+    if provider is not None:
+        return provider
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is not None:
+            return provider
+        future = _creating.get(key)
+        creator = future is None
+        if creator:
+            future = _creating[key] = Future()
+    if not creator:
+        return future.result()
+
+    try:
+        provider = PROVIDERS[provider_name](
+            org,
+            project,
+            host=current_app.config['GITHUB_HOST'],
+            protocol=current_app.config['GITHUB_PROTOCOL']
+        )
+    except BaseException as e:
+        with _providers_lock:
+            del _creating[key]
+        future.set_exception(e)
+        raise
+    with _providers_lock:
+        _providers[key] = provider
+        del _creating[key]
+    future.set_result(provider)
+    return provider
+
+def get_git_repo(provider_name: str, org: str, project: str) -> GitRepo:
+    """Get the GitRepo of a repository, shared by the current request
+
+    Refs are loaded at most once per request (or application context, for
+    background threads) and then reused by every caller.
+
+    Args:
+        provider_name: Git provider ('github' or 'mirror')
+        org: Organization name
+        project: Project name
+
+    Returns:
+        GitRepo instance
+    """
+    repos = g.setdefault('git_repos', {})
+    key = (provider_name, org, project)
+    if key not in repos:
+        repos[key] = GitRepo(get_provider(provider_name, org, project))
+    return repos[key]
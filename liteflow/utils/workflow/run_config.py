@@ -6,6 +6,8 @@ import shutil
 from datetime import datetime
 from flask import Flask
 from ... import models
+from .registry import get_git_repo
+from .schema_diff import get_schema_diff, migrate_parameters
 
 class RunConfigManager:
     def __init__(self, app: Flask):
@@ -173,3 +175,67 @@ class RunConfigManager:
         # Delete database entry
         self.db.session.delete(run_config)
         self.db.session.commit()
+
+    def migrate_run_configs(self, organization: str, pipeline_name: str, run_names: List[str],
+                            to_ref: str, to_ref_type: str, dry_run: bool = True) -> List[Dict]:
+        """Move run configs to another ref, migrating their parameters
+
+        Parameters are migrated with the schema diff between the commit of
+        each run config ref (the current head for branches) and the target
+        commit (see schema_diff.migrate_parameters).
+
+        Args:
+            organization: Organization name
+            pipeline_name: Pipeline project name
+            run_names: Run configs to migrate
+            to_ref: Target Git reference
+            to_ref_type: Type of the target reference ('branch', 'tag', or 'commit')
+            dry_run: Only report the changes
+
+        Returns:
+            One result per run config: run_name, from_ref, from_ref_type,
+            parameters (migrated) and changes
+
+        Raises:
+            FileNotFoundError: If a run config doesn't exist
+        """
+        run_configs = []
+        for run_name in run_names:
+            run_config = models.RunConfig.query.filter_by(
+                organization=organization,
+                pipeline_name=pipeline_name,
+                run_name=run_name
+            ).first()
+            if not run_config:
+                raise FileNotFoundError(f"Run config {organization}/{pipeline_name}/{run_name} not found")
+            run_configs.append(run_config)
+
+        results = []
+        for run_config in run_configs:
+            repo = get_git_repo(run_config.pipeline.provider, organization, pipeline_name)
+            diff = get_schema_diff(
+                repo,
+                repo.resolve_ref(run_config.ref, run_config.ref_type),
+                repo.resolve_ref(to_ref, to_ref_type)
+            )
+            parameters, changes = migrate_parameters(run_config.parameters or {}, diff)
+            results.append({
+                'run_name': run_config.run_name,
+                'from_ref': run_config.ref,
+                'from_ref_type': run_config.ref_type,
+                'parameters': parameters,
+                'changes': changes
+            })
+            if dry_run:
+                continue
+
+            run_config.ref = to_ref
+            run_config.ref_type = to_ref_type
+            run_config.parameters = parameters
+            params_path = self.run_configs_dir / organization / pipeline_name / run_config.run_name / 'params.yaml'
+            if params_path.parent.exists():
+                with params_path.open('w') as f:
+                    yaml.dump(parameters, f, indent=2)
+        if not dry_run:
+            self.db.session.commit()
+        return results
@@ -0,0 +1,73 @@
+import json
+from typing import Dict, List
+from jsonschema.validators import validator_for
+from .commit_cache import CommitCache
+from .git_repo import GitRepo
+
+# Number of processed schemas kept in memory (one per repository commit)
+SCHEMA_CACHE_SIZE = 64
+
+class PipelineSchema:
+    """Normalized nextflow_schema.json with its compiled validator"""
+
+    def __init__(self, schema: Dict):
+        """Initialize PipelineSchema
+
+        Args:
+            schema: Parsed nextflow_schema.json. 'defs' or '$defs' (nf-schema)
+                are exposed as 'definitions' for the pipeline page.
+        """
+        if "definitions" not in schema:
+            if "defs" in schema:
+                schema["definitions"] = schema["defs"]
+            elif "$defs" in schema:
+                schema["definitions"] = schema["$defs"]
+            else:
+                schema["definitions"] = {}
+        self.schema = schema
+        # Draft from $schema (draft-07 for nf-core, 2020-12 for nf-schema).
+        # Unknown formats (file-path...) and keywords (fa_icon...) are ignored.
+        self.validator = validator_for(schema)(schema)
+
+    def validate(self, parameters: Dict, allow_missing: bool = False) -> List[str]:
+        """Validate run parameters against the schema
+
+        Args:
+            parameters: Pipeline parameters
+            allow_missing: Ignore missing required parameters (e.g. when a
+                config file may provide them)
+
+        Returns:
+            Error messages, empty if the parameters are valid
+        """
+        errors = []
+        for error in self.validator.iter_errors(parameters):
+            if allow_missing and error.validator == 'required':
+                continue
+            location = '.'.join(str(part) for part in error.absolute_path)
+            errors.append(f"{location}: {error.message}" if location else error.message)
+        return errors
+
+_schemas = CommitCache(SCHEMA_CACHE_SIZE)
+
+def get_pipeline_schema(git_repo: GitRepo, commit_sha: str) -> PipelineSchema:
+    """Get the processed schema of a repository at a commit
+
+    The schema at a full commit SHA never changes, so it is parsed and its
+    validator compiled once per process, then served from memory.
+
+    Args:
+        git_repo: Pipeline repository
+        commit_sha: Commit SHA
+
+    Returns:
+        PipelineSchema (shared, must not be modified)
+
+    Raises:
+        FileNotFoundError: If the repository has no nextflow_schema.json
+    """
+    return _schemas.get_or_compute(
+        git_repo.repo_id,
+        commit_sha,
+        lambda: PipelineSchema(json.loads(git_repo.fetch_file('nextflow_schema.json', commit_sha)))
+    )
@@ -0,0 +1,184 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from ..blob_store import is_commit_sha
+from .commit_cache import CommitCache
+from .git_repo import GitRepo
+from .pipeline import Pipeline
+from .schema import PipelineSchema
+
+# Number of schema diffs kept in memory (one per pair of commits)
+DIFF_CACHE_SIZE = 128
+
+# Parameter attributes compared between two schemas
+COMPARED_FIELDS = ('type', 'default', 'required', 'enum', 'format', 'pattern', 'minimum', 'maximum')
+
+_diffs = CommitCache(DIFF_CACHE_SIZE)
+
+def schema_params(schema: Dict) -> Dict[str, Dict]:
+    """Flatten the parameters of a schema, whatever their group
+
+    Args:
+        schema: Normalized schema (see PipelineSchema)
+
+    Returns:
+        Attributes (COMPARED_FIELDS and group) of each parameter by name
+    """
+    params = {}
+    groups = [(None, schema)] + list(schema.get('definitions', {}).items())
+    for group_name, group in groups:
+        required = set(group.get('required', []))
+        for name, spec in group.get('properties', {}).items():
+            if not isinstance(spec, dict):
+                continue
+            param = {field: spec.get(field) for field in COMPARED_FIELDS}
+            param['required'] = name in required
+            param['group'] = group_name
+            params[name] = param
+    return params
+
+def diff_schemas(old: Dict, new: Dict) -> Dict:
+    """Compare the parameters of two schemas
+
+    Returns:
+        Dictionary with added and removed parameters (name and attributes),
+        changed ones (name and {field: {'from', 'to'}}) sorted by name, and
+        the number of unchanged ones
+    """
+    old_params = schema_params(old)
+    new_params = schema_params(new)
+    changed = []
+    unchanged = 0
+    for name in sorted(old_params.keys() & new_params.keys()):
+        changes = {
+            field: {'from': old_params[name][field], 'to': new_params[name][field]}
+            for field in COMPARED_FIELDS
+            if old_params[name][field] != new_params[name][field]
+        }
+        if changes:
+            changed.append({'name': name, 'changes': changes})
+        else:
+            unchanged += 1
+    return {
+        'added': [{'name': name, **new_params[name]} for name in sorted(new_params.keys() - old_params.keys())],
+        'removed': [{'name': name, **old_params[name]} for name in sorted(old_params.keys() - new_params.keys())],
+        'changed': changed,
+        'unchanged': unchanged
+    }
+
+def _load(git_repo: GitRepo, commit_sha: str) -> Tuple[Dict, str]:
+    """Schema (empty when absent) and nextflowVersion of a commit"""
+    pipeline = Pipeline(git_repo, commit_sha, 'commit')
+    try:
+        schema = pipeline.load_schema().schema
+    except FileNotFoundError:
+        schema = PipelineSchema({}).schema
+    try:
+        nextflow_version = pipeline.parse_config()['manifest']['nextflowVersion']
+    except FileNotFoundError:
+        nextflow_version = ''
+    return schema, nextflow_version
+
+def get_schema_diff(git_repo: GitRepo, sha_a: str, sha_b: str) -> Dict:
+    """Diff the schema and nextflowVersion of a pipeline between two commits
+
+    Both sides come from the per-commit schema and config caches, and the
+    diff of two full SHAs is computed once per process.
+
+    Args:
+        git_repo: Pipeline repository
+        sha_a: Commit SHA of the current version
+        sha_b: Commit SHA of the target version
+
+    Returns:
+        diff_schemas result with from_sha, to_sha and nextflow_version
+        ({'from', 'to'}, None if unchanged)
+    """
+    def compute():
+        schema_a, version_a = _load(git_repo, sha_a)
+        schema_b, version_b = _load(git_repo, sha_b)
+        diff = diff_schemas(schema_a, schema_b)
+        diff['from_sha'] = sha_a
+        diff['to_sha'] = sha_b
+        diff['nextflow_version'] = (
+            {'from': version_a, 'to': version_b} if version_a != version_b else None
+        )
+        return diff
+
+    if not is_commit_sha(sha_a):
+        return compute()
+    # Memoized when sha_b is a full SHA too (see CommitCache)
+    return _diffs.get_or_compute(f"{git_repo.repo_id}@{sha_a}", sha_b, compute)
+
+def _coerce(value: Any, schema_type: Optional[str]) -> Any:
+    """Convert a parameter value to a new schema type
+
+    Raises:
+        ValueError: If the value can not be converted
+    """
+    if schema_type == 'string':
+        return value if isinstance(value, str) else json.dumps(value) if isinstance(value, bool) else str(value)
+    if schema_type == 'integer':
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            raise ValueError(f"{value!r} is not an integer")
+        return int(value)
+    if schema_type == 'number':
+        if isinstance(value, bool):
+            raise ValueError(f"{value!r} is not a number")
+        return float(value) if isinstance(value, str) else value
+    if schema_type == 'boolean':
+        if isinstance(value, bool):
+            return value
+        if str(value).lower() in ('true', 'false'):
+            return str(value).lower() == 'true'
+        raise ValueError(f"{value!r} is not a boolean")
+    return value
+
+def migrate_parameters(parameters: Dict, diff: Dict) -> Tuple[Dict, List[Dict]]:
+    """Apply a schema diff to run parameters
+
+    Removed parameters are dropped, values left at the previous default
+    follow the new default (or are dropped if it was removed), and values
+    are converted to a changed type. Values that can not be converted are
+    kept and reported.
+
+    Args:
+        parameters: Run parameters valid for the 'from' side of diff
+        diff: get_schema_diff result
+
+    Returns:
+        (migrated parameters, changes), each change being a dictionary with
+        name, action ('removed', 'default', 'converted', 'invalid' or
+        'required') and detail
+    """
+    migrated = dict(parameters)
+    changes = []
+    for param in diff['removed']:
+        if param['name'] in migrated:
+            value = migrated.pop(param['name'])
+            changes.append({'name': param['name'], 'action': 'removed', 'detail': f"was {value!r}"})
+    for param in diff['changed']:
+        name, fields = param['name'], param['changes']
+        if name not in migrated:
+            continue
+        if 'default' in fields and migrated[name] == fields['default']['from']:
+            if fields['default']['to'] is None:
+                # No new default: leave the parameter unset rather than null
+                migrated.pop(name)
+            else:
+                migrated[name] = fields['default']['to']
+            changes.append({'name': name, 'action': 'default',
+                            'detail': f"{fields['default']['from']!r} -> {fields['default']['to']!r}"})
+        elif 'type' in fields:
+            try:
+                converted = _coerce(migrated[name], fields['type']['to'])
+            except (TypeError, ValueError) as e:
+                changes.append({'name': name, 'action': 'invalid', 'detail': str(e)})
+                continue
+            if converted != migrated[name] or type(converted) is not type(migrated[name]):
+                changes.append({'name': name, 'action': 'converted',
+                                'detail': f"{migrated[name]!r} -> {converted!r}"})
+                migrated[name] = converted
+    for param in diff['added']:
+        if param['required'] and param['default'] is None and param['name'] not in migrated:
+            changes.append({'name': param['name'], 'action': 'required', 'detail': 'new required parameter'})
+    return migrated, changes
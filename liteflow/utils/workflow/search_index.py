@@ -0,0 +1,202 @@
+import html
+import re
+from typing import Dict, List, Optional, Tuple
+from flask import Flask
+from sqlalchemy import text
+from ... import models
+from .git_repo import GitRepo
+from .pipeline import Pipeline
+from .ref_index import recent_tags
+from .registry import get_git_repo
+
+# Columns searched with the 'field' filter, by ranking weight
+SEARCH_FIELDS = {'manifest': 10.0, 'params': 5.0, 'readme': 1.0}
+
+# Snippet delimiters, replaced by <mark> once the snippet is escaped
+_MARK_START, _MARK_END = '\x02', '\x03'
+
+_TAG = re.compile(r'<[^>]+>')
+_WORD = re.compile(r'\w+')
+
+def _html_to_text(content: str) -> str:
+    return html.unescape(_TAG.sub(' ', content))
+
+def _schema_params(schema: Dict) -> List[str]:
+    """Name, description and help text of each schema parameter"""
+    groups = [schema] + list(schema.get('definitions', {}).values())
+    lines = []
+    for group in groups:
+        for name, spec in group.get('properties', {}).items():
+            if isinstance(spec, dict):
+                lines.append(' '.join(filter(None, [name, spec.get('description'), spec.get('help_text')])))
+    return lines
+
+def match_query(query: str, field: Optional[str] = None) -> Optional[str]:
+    """Convert user input to an FTS5 query: every word as a prefix
+
+    Punctuation is dropped ('--genome' searches genome), so the input can
+    not inject FTS5 syntax.
+    """
+    words = _WORD.findall(query)
+    if not words:
+        return None
+    match = ' '.join(f'"{word}"*' for word in words)
+    return f'{field} : ({match})' if field else match
+
+class SearchIndex:
+    def __init__(self, app: Flask):
+        """Initialize SearchIndex
+
+        Full-text index (SQLite FTS5 table pipeline_search) of the manifest,
+        schema and nextflow.config parameters and README of every imported
+        pipeline, at its default branch and latest tag. Documents are
+        rebuilt only when the commit of their ref changed, from the cached
+        content; searching makes no GitHub calls.
+
+        Args:
+            app: Flask application instance
+        """
+        self.app = app
+        # FTS5 is an SQLite extension
+        self.enabled = app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite')
+
+    def create_table(self) -> bool:
+        """Create the FTS5 table if needed (application context)
+
+        Returns:
+            Whether full-text search is available
+        """
+        if not self.enabled:
+            self.app.logger.warning("Full-text search disabled: it requires an SQLite database")
+            return False
+        try:
+            models.db.session.execute(text(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS pipeline_search USING fts5("
+                "provider UNINDEXED, organization UNINDEXED, project UNINDEXED, "
+                "ref UNINDEXED, ref_type UNINDEXED, sha UNINDEXED, "
+                "manifest, params, readme, tokenize = 'unicode61')"
+            ))
+            models.db.session.commit()
+        except Exception as e:
+            models.db.session.rollback()
+            self.app.logger.warning(f"Full-text search disabled: {e}")
+            return False
+        return True
+
+    def targets(self, repo: GitRepo) -> List[Tuple[str, str]]:
+        """Indexed refs of a repository: default branch and latest tag"""
+        targets = [(repo.default_branch, 'branch')]
+        targets += [(tag, 'tag') for tag in recent_tags(repo.get_refs()['tags'], 1)]
+        return targets
+
+    def document(self, repo: GitRepo, org: str, project: str, ref: str, ref_type: str) -> Dict:
+        """Build the indexed text of a pipeline at a ref"""
+        pipeline = Pipeline(repo, ref, ref_type)
+        manifest = [f"{org}/{project}"]
+        params = []
+        try:
+            params += _schema_params(pipeline.load_schema().schema)
+        except FileNotFoundError:
+            pass
+        try:
+            config = pipeline.parse_config()
+            manifest += [str(value) for value in config['manifest'].values() if value]
+            # Parameters missing from the schema
+            documented = {line.split(' ', 1)[0] for line in params}
+            params += [name for name in config['params'] if name not in documented]
+        except FileNotFoundError:
+            pass
+        return {
+            'sha': pipeline.commit_sha,
+            'manifest': '\n'.join(manifest),
+            'params': '\n'.join(params),
+            'readme': _html_to_text(repo.get_readme_processed(pipeline.commit_sha))
+        }
+
+    def update(self, provider_name: str, org: str, project: str) -> int:
+        """Reindex the refs of a pipeline whose commit changed
+
+        Args:
+            provider_name: Git provider of the pipeline
+            org: Organization name
+            project: Pipeline project name
+
+        Returns:
+            Number of documents rebuilt
+        """
+        if not self.enabled:
+            return 0
+        repo = get_git_repo(provider_name, org, project)
+        indexed = {
+            (row.ref_type, row.ref): (row.rowid, row.sha)
+            for row in models.db.session.execute(text(
+                "SELECT rowid, ref, ref_type, sha FROM pipeline_search "
+                "WHERE organization = :org AND project = :project"
+            ), {'org': org, 'project': project})
+        }
+        rebuilt = 0
+        for ref, ref_type in self.targets(repo):
+            rowid, sha = indexed.pop((ref_type, ref), (None, None))
+            if sha is not None and sha == repo.resolve_ref(ref, ref_type):
+                continue
+            document = self.document(repo, org, project, ref, ref_type)
+            if rowid is not None:
+                models.db.session.execute(text("DELETE FROM pipeline_search WHERE rowid = :rowid"), {'rowid': rowid})
+            models.db.session.execute(text(
+                "INSERT INTO pipeline_search "
+                "(provider, organization, project, ref, ref_type, sha, manifest, params, readme) "
+                "VALUES (:provider, :org, :project, :ref, :ref_type, :sha, :manifest, :params, :readme)"
+            ), {'provider': provider_name, 'org': org, 'project': project, 'ref': ref, 'ref_type': ref_type, **document})
+            rebuilt += 1
+        # Refs no longer indexed (previous latest tag, renamed default branch)
+        for rowid, _ in indexed.values():
+            models.db.session.execute(text("DELETE FROM pipeline_search WHERE rowid = :rowid"), {'rowid': rowid})
+        models.db.session.commit()
+        return rebuilt
+
+    def search(self, query: str, field: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Search the indexed pipelines, best matches first
+
+        Args:
+            query: Words to find (prefixes match)
+            field: Restrict to one of SEARCH_FIELDS
+            limit: Maximum number of results
+
+        Returns:
+            One result per matching pipeline ref: provider, organization,
+            project, ref, ref_type, sha and an HTML snippet with the
+            matches in <mark>
+
+        Raises:
+            ValueError: If field is unknown
+            RuntimeError: If the database is not SQLite
+        """
+        if not self.enabled:
+            raise RuntimeError("Full-text search requires an SQLite database")
+        if field is not None and field not in SEARCH_FIELDS:
+            raise ValueError(f"Unknown search field: {field}")
+        match = match_query(query, field)
+        if match is None:
+            return []
+        # bm25 takes one weight per column, unindexed ones included
+        weights = ', '.join(['0'] * 6 + [str(weight) for weight in SEARCH_FIELDS.values()])
+        rows = models.db.session.execute(text(
+            "SELECT provider, organization, project, ref, ref_type, sha, "
+            "snippet(pipeline_search, -1, :start, :end, '…', 16) AS snippet "
+            "FROM pipeline_search WHERE pipeline_search MATCH :match "
+            f"ORDER BY bm25(pipeline_search, {weights}) LIMIT :limit"
+        ), {'start': _MARK_START, 'end': _MARK_END, 'match': match, 'limit': limit})
+        return [
+            {
+                'provider': row.provider,
+                'organization': row.organization,
+                'project': row.project,
+                'ref': row.ref,
+                'ref_type': row.ref_type,
+                'sha': row.sha,
+                'snippet': html.escape(row.snippet)
+                    .replace(_MARK_START, '<mark>')
+                    .replace(_MARK_END, '</mark>')
+            }
+            for row in rows
+        ]
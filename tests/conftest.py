@@ -9,3 +9,4 @@ ensure_firefox_installed()
 
 from tests.fixtures.base import *
 from tests.fixtures.loaded import *
+from tests.fixtures.github import *
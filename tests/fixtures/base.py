@@ -8,8 +8,8 @@ from playwright.sync_api import sync_playwright
 
 playwright = sync_playwright().start()
 
-def gen_flask_server():
-    """Start a Flask server for testing on a specific port."""
+def gen_test_app():
+    """Create a Flask application for testing in a temporary root directory."""
 
     test_dir = tempfile.mkdtemp()
 
@@ -21,9 +21,19 @@ def gen_flask_server():
 
     for key, value in envs.items():
         os.environ[key] = value
-    
+
     from liteflow import create_app
-    flask_app = create_app()
+    try:
+        yield create_app()
+    finally:
+        for key in envs.keys():
+            os.environ.pop(key, None)
+
+def gen_flask_server():
+    """Start a Flask server for testing on a specific port."""
+
+    gapp = gen_test_app()
+    flask_app = next(gapp)
     
     for port in range(5000, 6000):
         try:
@@ -42,8 +52,15 @@ def gen_flask_server():
     
     time.sleep(1)
     yield f"http://127.0.0.1:{port}"
-    for key in envs.keys():
-        os.environ.pop(key, None)
+    gapp.close()
+
+@pytest.fixture(scope="session")
+def flask_app():
+    """Create a Flask application for tests that do not need a browser."""
+
+    gapp = gen_test_app()
+    yield next(gapp)
+    gapp.close()
 
 def gen_page():
     """Create a Playwright browser for testing."""
@@ -0,0 +1,91 @@
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeGitHubServer:
+    """Minimal local stand-in for the GitHub REST and GraphQL APIs.
+
+    REST responses are registered per path in `rest` as (status, payload,
+    headers) or as a callable receiving the request handler and returning
+    that tuple; str payloads are sent as raw text. GraphQL responses are
+    produced by `graphql_handler(variables)`. Every request is recorded in
+    `requests` as (method, path, body).
+    """
+
+    def __init__(self):
+        self.rest = {}
+        self.graphql_handler = None
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, payload, headers=None):
+                if isinstance(payload, str):
+                    body, content_type = payload.encode('utf-8'), 'text/plain'
+                else:
+                    body, content_type = json.dumps(payload).encode('utf-8'), 'application/json'
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                server.requests.append(('GET', self.path, None))
+                if path not in server.rest:
+                    return self._send(404, {'message': 'Not Found'})
+                response = server.rest[path]
+                if callable(response):
+                    response = response(self)
+                status, payload, headers = response
+                if status == 304:
+                    self.send_response(304)
+                    for key, value in (headers or {}).items():
+                        self.send_header(key, value)
+                    self.end_headers()
+                    return
+                self._send(status, payload, headers)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                server.requests.append(('POST', self.path, body))
+                if self.path.endswith('/graphql') and server.graphql_handler:
+                    return self._send(200, server.graphql_handler(body.get('variables', {})))
+                self._send(404, {'message': 'Not Found'})
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.host = f"127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def add_repo(self, org, project, default_branch='main'):
+        """Register the repository endpoint used by GitHubProvider"""
+        self.rest[f'/api/v3/repos/{org}/{project}'] = (200, {
+            'id': 1,
+            'name': project,
+            'full_name': f'{org}/{project}',
+            'default_branch': default_branch,
+            'url': f'http://{self.host}/api/v3/repos/{org}/{project}',
+            'pushed_at': '2024-01-01T00:00:00Z'
+        }, None)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+@pytest.fixture
+def fake_github():
+    server = FakeGitHubServer()
+    server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,41 @@
+import os
+import time
+
+def make_store(tmp_path, max_size):
+    from liteflow.utils.blob_store import BlobStore
+
+    class App:
+        config = {'BLOB_STORE_DIR': tmp_path / 'blobs', 'BLOB_STORE_MAX_SIZE': max_size}
+
+    store = BlobStore()
+    store.init_app(App)
+    return store
+
+def test_blob_store_roundtrip_compressed(flask_app, tmp_path):
+    """Blobs are stored compressed and keyed by repo, commit and path."""
+    store = make_store(tmp_path, 1024 * 1024)
+    content = b'params { outdir = null }\n' * 100
+    store.put('github.com/org/proj', 'a' * 40, 'nextflow.config', content)
+
+    assert store.get('github.com/org/proj', 'a' * 40, 'nextflow.config') == content
+    assert store.get('github.com/org/proj', 'b' * 40, 'nextflow.config') is None
+    assert store.get('github.com/org/other', 'a' * 40, 'nextflow.config') is None
+    blobs = list((tmp_path / 'blobs').glob('*/*.z'))
+    assert len(blobs) == 1
+    assert blobs[0].stat().st_size < len(content)
+
+def test_blob_store_evicts_least_recently_used(flask_app, tmp_path):
+    """Once over its size bound, the least recently read blobs are evicted."""
+    store = make_store(tmp_path, 3000)
+    for i in range(3):
+        store.put('repo', f'{i:040d}', 'file', os.urandom(900))
+    # Make blob 0 the most recently used one
+    past = time.time() - 100
+    for i in (1, 2):
+        os.utime(store._path('repo', f'{i:040d}', 'file'), (past, past))
+    store.get('repo', f'{0:040d}', 'file')
+
+    store.put('repo', f'{3:040d}', 'file', os.urandom(900))
+    assert store.get('repo', f'{0:040d}', 'file') is not None
+    assert store.get('repo', f'{1:040d}', 'file') is None
+    assert store.get('repo', f'{3:040d}', 'file') is not None
@@ -0,0 +1,238 @@
+def test_clear_prefix_invalidates_every_key(flask_app):
+    """Clearing a prefix drops the keys of all workers, not just the seen ones."""
+    from liteflow.utils.cache import cache, get_or_set_cache, clear_github_cache, stored_key
+    with flask_app.app_context():
+        assert get_or_set_cache('github:test:a', lambda: 'a1') == 'a1'
+        # Written by another worker: never looked up in this process
+        cache.set(stored_key('github:test:b'), 'b1')
+        assert get_or_set_cache('s3:test:a', lambda: 's1') == 's1'
+
+        clear_github_cache()
+        assert get_or_set_cache('github:test:a') is None
+        assert get_or_set_cache('github:test:b') is None
+        assert get_or_set_cache('s3:test:a') == 's1'
+        assert get_or_set_cache('github:test:a', lambda: 'a2') == 'a2'
+
+def test_clear_namespace_of_one_repository(flask_app):
+    """Clearing a repository keeps the entries of other repositories."""
+    from liteflow.utils.cache import get_or_set_cache, clear_github_cache, github_namespace
+    with flask_app.app_context():
+        get_or_set_cache('github:test:org:one', lambda: 1, namespace=github_namespace('org', 'one'))
+        get_or_set_cache('github:test:org:two', lambda: 2, namespace=github_namespace('org', 'two'))
+
+        clear_github_cache('org', 'one')
+        assert get_or_set_cache('github:test:org:one', namespace=github_namespace('org', 'one')) is None
+        assert get_or_set_cache('github:test:org:two', namespace=github_namespace('org', 'two')) == 2
+
+def test_memory_tier_serves_hot_keys(flask_app):
+    """Hits are served from memory, bounded in bytes and by CACHE_MEMORY_TIMEOUT."""
+    from liteflow.utils.cache import TwoTierCache
+    memory_cache = TwoTierCache()
+    memory_cache.init_app(flask_app)
+    memory_cache.max_size = 3000
+    with flask_app.app_context():
+        memory_cache.set('test:refs', {'branches': ['main']})
+        memory_cache.shared.delete('test:refs')
+        # Served from memory, as a copy
+        value = memory_cache.get('test:refs')
+        assert value == {'branches': ['main']}
+        value['branches'].append('dev')
+        assert memory_cache.get('test:refs') == {'branches': ['main']}
+
+        # Least recently used values are evicted past max_size bytes
+        for i in range(3):
+            memory_cache.set(f'test:blob:{i}', 'x' * 1000)
+        assert memory_cache.get('test:refs') is None
+        assert memory_cache._size <= 3000
+
+        # Expired memory entries are read again from the shared tier
+        other_worker = TwoTierCache()
+        other_worker.init_app(flask_app)
+        other_worker.set('test:blob:2', 'updated')
+        memory_cache._entries['test:blob:2'] = (0, memory_cache._entries['test:blob:2'][1])
+        assert memory_cache.get('test:blob:2') == 'updated'
+
+def test_concurrent_misses_fill_once(flask_app):
+    """Threads missing the same key wait for a single call of value_func."""
+    import threading
+    import time
+    from liteflow.utils.cache import get_or_set_cache
+    calls = []
+    results = []
+
+    def fetch_refs():
+        calls.append(True)
+        time.sleep(0.3)
+        return {'branches': ['main']}
+
+    def request():
+        with flask_app.app_context():
+            results.append(get_or_set_cache('github:test:refs:single-flight', fetch_refs))
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [{'branches': ['main']}] * 8
+
+def test_fill_waits_for_other_process(flask_app):
+    """A worker waits for the fill lock held by another one, then reads its value."""
+    import subprocess
+    import sys
+    import textwrap
+    from liteflow.utils.cache import cache, get_or_set_cache, stored_key, _fill_lock, _fill_lock_path
+    with flask_app.app_context():
+        backend_key = stored_key('github:test:refs:other-process')
+        with _fill_lock(backend_key, 0) as locked:
+            assert locked
+            # Another process can not take the lock meanwhile
+            probe = subprocess.run([sys.executable, '-c', textwrap.dedent(f"""
+                import fcntl
+                with open({_fill_lock_path(backend_key)!r}, 'w') as f:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            """)], capture_output=True)
+            assert probe.returncode != 0
+            # Filled by the lock holder
+            cache.set(backend_key, 'filled elsewhere')
+            cache.clear_memory()
+        assert get_or_set_cache('github:test:refs:other-process', lambda: 'filled here') == 'filled elsewhere'
+
+def test_nested_fill_sharing_lock_file(flask_app, monkeypatch):
+    """A fill nested in another one of the same lock file does not wait on itself."""
+    import time
+    from liteflow.utils.cache import get_or_set_cache, stored_key, _fill_lock_path
+    monkeypatch.setitem(flask_app.config, 'CACHE_FILL_TIMEOUT', 30)
+    with flask_app.app_context():
+        outer = 'github:test:nested:outer'
+        for i in range(10000):
+            inner = f"github:test:nested:{i}"
+            if _fill_lock_path(stored_key(inner)) == _fill_lock_path(stored_key(outer)):
+                break
+        start = time.monotonic()
+        value = get_or_set_cache(outer, lambda: get_or_set_cache(inner, lambda: 'inner') + ' outer')
+        assert value == 'inner outer'
+        assert time.monotonic() - start < 5
+
+def test_absent_values_are_cached_negative(flask_app):
+    """404s and None are cached for CACHE_NEGATIVE_TIMEOUT, apart from misses."""
+    import time
+    import pytest
+    from liteflow.utils.cache import get_or_set_cache, lookup_cache, CACHE_MISS, CACHE_NEGATIVE
+    calls = []
+
+    def fetch_readme():
+        calls.append(True)
+        raise FileNotFoundError('Readme.md not found')
+
+    with flask_app.app_context():
+        assert lookup_cache('github:test:readme:negative').status == CACHE_MISS
+        for _ in range(3):
+            with pytest.raises(FileNotFoundError):
+                get_or_set_cache('github:test:readme:negative', fetch_readme)
+        assert len(calls) == 1
+        result = lookup_cache('github:test:readme:negative')
+        assert result.status == CACHE_NEGATIVE
+        assert isinstance(result.error, FileNotFoundError)
+
+        assert get_or_set_cache('github:test:none:negative', lambda: calls.append(True)) is None
+        assert get_or_set_cache('github:test:none:negative', lambda: calls.append(True)) is None
+        assert len(calls) == 2
+        assert lookup_cache('github:test:none:negative') == (CACHE_NEGATIVE, None, None)
+
+        # Negative entries expire after negative_timeout
+        with pytest.raises(FileNotFoundError):
+            get_or_set_cache('github:test:readme:expiring', fetch_readme, negative_timeout=1)
+        time.sleep(1.1)
+        with pytest.raises(FileNotFoundError):
+            get_or_set_cache('github:test:readme:expiring', fetch_readme, negative_timeout=1)
+        assert len(calls) == 4
+
+def test_cache_stats_per_prefix(flask_app):
+    """Lookups, fills and bytes written are counted per key prefix."""
+    from liteflow.utils.cache import cache, get_or_set_cache
+    from liteflow.utils.cache_metrics import cache_metrics
+    cache_metrics.reset()
+    with flask_app.app_context():
+        for _ in range(3):
+            get_or_set_cache('readme:test:stats', lambda: '<h1>Title</h1>')
+        get_or_set_cache('s3:test:stats', lambda: [])
+        tiers = cache.stats()
+
+    stats = cache_metrics.snapshot()
+    readme = stats['prefixes']['readme']
+    assert readme['misses'] == 1
+    assert readme['hits'] == 2
+    assert readme['fills'] == 1
+    assert readme['bytes_stored'] > len('<h1>Title</h1>')
+    assert abs(readme['hit_ratio'] - 2 / 3) < 1e-9
+    assert sum(bucket['count'] for bucket in readme['fill_latency']) == 1
+    assert stats['prefixes']['s3']['fills'] == 1
+    assert stats['totals']['fills'] == 2
+    assert tiers['memory']['items'] >= 2
+    assert tiers['shared']['threshold'] == flask_app.config['CACHE_THRESHOLD']
+
+def test_memory_hits_count_caller_lookups_only(flask_app):
+    """Internal reads of the memory tier are not counted as memory hits."""
+    from liteflow.utils.cache import get_or_revalidate_cache, refresh_cache
+    from liteflow.utils.cache_metrics import cache_metrics
+    cache_metrics.reset()
+    with flask_app.app_context():
+        get_or_revalidate_cache('readme:test:memory-hits', lambda validators: ('v1', {}))
+        refresh_cache('readme:test:memory-hits', lambda validators: ('v2', {}))
+        assert cache_metrics.snapshot()['prefixes']['readme']['memory_hits'] == 0
+        assert get_or_revalidate_cache('readme:test:memory-hits', lambda validators: ('v3', {})) == 'v2'
+
+    readme = cache_metrics.snapshot()['prefixes']['readme']
+    assert (readme['hits'], readme['memory_hits']) == (1, 1)
+
+def test_generations_kept_in_memory(flask_app, monkeypatch):
+    """Lookups reuse the generations read less than GENERATION_TTL ago; clears of other workers show up after it."""
+    import time
+    from liteflow.utils import cache as module
+    from liteflow.utils.cache import get_or_set_cache, github_namespace
+    monkeypatch.setattr(module, 'GENERATION_TTL', 0.2)
+    namespace = github_namespace('org', 'generations')
+    with flask_app.app_context():
+        assert get_or_set_cache('github:test:generations', lambda: 1, namespace=namespace) == 1
+
+        # Another worker clears the namespace (the file only)
+        reads = []
+        generation_path = module._generation_path
+        monkeypatch.setattr(module, '_generation_path', lambda name: reads.append(name) or generation_path(name))
+        with open(generation_path(namespace), 'w') as f:
+            f.write('other-worker')
+        assert get_or_set_cache('github:test:generations', namespace=namespace) == 1
+        assert reads == []
+
+        time.sleep(0.2)
+        assert get_or_set_cache('github:test:generations', namespace=namespace) is None
+        assert namespace in reads
+
+def test_stuck_fill_does_not_block_waiting_threads(flask_app, monkeypatch):
+    """A thread waiting on another thread's fill fetches itself after CACHE_FILL_TIMEOUT."""
+    import threading
+    from liteflow.utils.cache import get_or_set_cache
+    monkeypatch.setitem(flask_app.config, 'CACHE_FILL_TIMEOUT', 0.2)
+    stuck = threading.Event()
+    release = threading.Event()
+
+    def hung_fetch():
+        stuck.set()
+        release.wait(10)
+        return 'late'
+
+    def first():
+        with flask_app.app_context():
+            get_or_set_cache('github:test:stuck-fill', hung_fetch)
+
+    thread = threading.Thread(target=first)
+    thread.start()
+    try:
+        assert stuck.wait(10)
+        with flask_app.app_context():
+            assert get_or_set_cache('github:test:stuck-fill', lambda: 'direct') == 'direct'
+    finally:
+        release.set()
+        thread.join(10)
@@ -0,0 +1,65 @@
+def test_commit_history_sync_and_backfill(flask_app, monkeypatch):
+    """New commits are synced incrementally, older ones fetched on demand."""
+    from datetime import datetime, timedelta
+    from liteflow.utils.workflow import registry, CommitHistory
+    from liteflow.utils.workflow import commit_history as module
+    # Linear history, oldest first, one commit per minute
+    start = datetime(2024, 1, 1)
+    history = [
+        {'sha': f"{i:02x}" * 20, 'message': f"commit {i}", 'author': 'dev',
+         'date': (start + timedelta(minutes=i)).isoformat() + 'Z'}
+        for i in range(25)
+    ]
+    calls = []
+    # Stands for the GitHub per_page cap (100), HISTORY_PAGE_SIZE being patched to it
+    max_per_page = 10
+
+    class FakeProvider:
+        host = 'example.org'
+
+        def __init__(self, org, project, **kwargs):
+            self.org = org
+            self.project = project
+
+        def get_default_branch(self):
+            return 'main'
+
+        def get_commits(self, ref, since=None, page=1, per_page=100, etag=None):
+            calls.append((ref, since, page, etag))
+            per_page = min(per_page, max_per_page)
+            shas = [commit['sha'] for commit in history]
+            end = len(history) if ref == 'main' else shas.index(ref) + 1
+            commits = history[:end][::-1]
+            if since:
+                commits = [commit for commit in commits if commit['date'] > since]
+            if etag == f"etag-{len(history)}":
+                return None, etag
+            return commits[(page - 1) * per_page:page * per_page], f"etag-{len(history)}"
+
+    monkeypatch.setitem(registry.PROVIDERS, 'fake', FakeProvider)
+    monkeypatch.setattr(registry, '_providers', {})
+    monkeypatch.setattr(module, 'HISTORY_PAGE_SIZE', max_per_page)
+
+    commit_history = CommitHistory(flask_app)
+    with flask_app.app_context():
+        # First sync: one page only
+        assert commit_history.sync('fake', 'org', 'history') == 10
+        # Unchanged since the last sync: revalidated with the ETag
+        assert commit_history.sync('fake', 'org', 'history') == 0
+        assert calls[-1][3] == 'etag-25'
+
+        history.append({'sha': "19" * 20, 'message': 'commit 25', 'author': 'dev',
+                        'date': (start + timedelta(minutes=25)).isoformat() + 'Z'})
+        assert commit_history.sync('fake', 'org', 'history') == 1
+
+        page = commit_history.get_page('fake', 'org', 'history', page=1, per_page=5)
+        assert [commit['message'] for commit in page['commits']] == [f"commit {i}" for i in range(25, 20, -1)]
+        assert page['has_more']
+
+        # Past the stored commits: older ones are fetched from the oldest stored
+        page = commit_history.get_page('fake', 'org', 'history', page=3, per_page=10)
+        assert [commit['message'] for commit in page['commits']] == [f"commit {i}" for i in range(5, -1, -1)]
+        assert not page['has_more']
+
+        assert commit_history.resolve('fake', 'org', 'history', "0303030") == "03" * 20
+        assert commit_history.resolve('fake', 'org', 'history', "ffff") is None
@@ -0,0 +1,52 @@
+import time
+import pytest
+
+@pytest.fixture
+def http_client(flask_app):
+    """Client with short delays, configured like the application one"""
+    from liteflow.utils.github_http import GitHubHTTPClient
+    client = GitHubHTTPClient()
+    client.init_app(flask_app)
+    client.backoff = 0.01
+    client.max_wait = 2
+    return client
+
+def test_retries_server_errors(http_client, fake_github):
+    """5xx answers are retried with backoff until a success."""
+    answers = [(502, {'message': 'Bad Gateway'}, None), (200, {'ok': True}, None)]
+    fake_github.rest['/api/v3/flaky'] = lambda handler: answers.pop(0)
+    response = http_client.get(f'http://{fake_github.host}/api/v3/flaky')
+    assert response.status_code == 200
+    assert len(fake_github.requests) == 2
+
+def test_honours_retry_after(http_client, fake_github):
+    """Secondary rate limits are retried after the Retry-After delay."""
+    answers = [
+        (403, {'message': 'secondary rate limit'}, {'Retry-After': '1'}),
+        (200, {'ok': True}, None)
+    ]
+    fake_github.rest['/api/v3/limited'] = lambda handler: answers.pop(0)
+    started = time.monotonic()
+    response = http_client.get(f'http://{fake_github.host}/api/v3/limited')
+    assert response.status_code == 200
+    assert time.monotonic() - started >= 1
+
+def test_long_rate_limit_returned_to_caller(http_client, fake_github):
+    """An exhausted quota resetting later than max_wait is not waited for."""
+    reset = str(int(time.time()) + 3600)
+    fake_github.rest['/api/v3/exhausted'] = (
+        403, {'message': 'API rate limit exceeded'},
+        {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': reset}
+    )
+    response = http_client.get(f'http://{fake_github.host}/api/v3/exhausted')
+    assert response.status_code == 403
+    assert len(fake_github.requests) == 1
+
+def test_token_bucket_limits_rate(flask_app):
+    """Requests beyond the burst wait for tokens at the configured rate."""
+    from liteflow.utils.github_http import TokenBucket
+    bucket = TokenBucket(rate=20, capacity=2)
+    started = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - started >= 0.15
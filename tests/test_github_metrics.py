@@ -0,0 +1,37 @@
+import time
+
+def test_metrics_aggregate_calls_and_project_exhaustion(flask_app):
+    """Calls are aggregated per route and kind, quota exhaustion is projected."""
+    from liteflow.utils.github_metrics import GitHubMetrics
+    metrics = GitHubMetrics()
+    reset = int(time.time()) + 3600
+    headers = {
+        'X-RateLimit-Resource': 'core',
+        'X-RateLimit-Limit': '5000',
+        'X-RateLimit-Remaining': '100',
+        'X-RateLimit-Reset': str(reset)
+    }
+    with metrics.label('pipelines'):
+        for _ in range(10):
+            metrics.record_call('GET', 'https://api.github.com/repos/o/p/contents/README.md?ref=main',
+                                200, 0.1, 50, headers)
+        metrics.record_call('GET', 'https://api.github.com/repos/o/p', 304, 0.05, 0, headers)
+        metrics.record_avoided('contents')
+    metrics.record_call('POST', 'https://api.github.com/graphql', 502, 0.2, 10)
+
+    snapshot = metrics.snapshot()
+    contents = snapshot['routes']['pipelines']['contents']
+    assert contents['calls'] == 10
+    assert contents['avoided'] == 1
+    assert contents['bytes'] == 500
+    assert abs(contents['latency_avg'] - 0.1) < 1e-9
+    assert snapshot['routes']['pipelines']['repo']['not_modified'] == 1
+    assert snapshot['routes']['background']['refs']['errors'] == 1
+    assert snapshot['totals']['calls'] == 12
+
+    # 10 quota consuming calls within the first second: 100 left run out
+    # well before the reset, the 304 is not counted
+    core = snapshot['quota']['core']
+    assert core['remaining'] == 100
+    assert core['projected_exhaustion_in'] is not None
+    assert core['projected_exhaustion_in'] < core['seconds_to_reset']
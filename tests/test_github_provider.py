@@ -0,0 +1,260 @@
+import pytest
+
+def refs_page(kind, names, has_next, cursor):
+    return {
+        'pageInfo': {'hasNextPage': has_next, 'endCursor': cursor},
+        'nodes': [{'name': name, 'target': target} for name, target in names]
+    }
+
+@pytest.fixture
+def github_app(flask_app, fake_github, monkeypatch):
+    """Application context with a token, so refs are fetched with GraphQL"""
+    from liteflow.utils.cache import cache
+    from liteflow.utils.github_http import github_http
+    monkeypatch.setitem(flask_app.config, 'GITHUB_TOKEN', 'test-token')
+    # Failures of the fake server are asserted, not retried
+    monkeypatch.setattr(github_http, 'max_retries', 0)
+    with flask_app.app_context():
+        cache.clear()
+        yield flask_app
+        cache.clear()
+
+def test_get_refs_graphql_paginates_and_peels_tags(github_app, fake_github):
+    """Refs come from GraphQL, annotated tags are peeled to their commit."""
+    from liteflow.utils.workflow import GitHubProvider
+    fake_github.add_repo('org', 'proj')
+
+    def graphql(variables):
+        repository = {}
+        if variables['withHistory']:
+            repository['defaultBranchRef'] = {
+                'name': 'main',
+                'target': {'history': {'nodes': [{'oid': 'c' * 40}, {'oid': 'a' * 40}]}}
+            }
+        if variables['withBranches']:
+            repository['branches'] = refs_page('branches', [
+                ('main', {'oid': 'a' * 40}),
+                ('dev', {'oid': 'b' * 40})
+            ], False, 'b1')
+        if variables['withTags']:
+            if variables['tagCursor'] is None:
+                repository['tags'] = refs_page('tags', [
+                    ('1.0.0', {'oid': 'd' * 40})
+                ], True, 't1')
+            else:
+                repository['tags'] = refs_page('tags', [
+                    ('2.0.0', {'oid': 'e' * 40, 'target': {'oid': 'f' * 40}})
+                ], False, 't2')
+        return {'data': {'repository': repository}}
+
+    fake_github.graphql_handler = graphql
+    provider = GitHubProvider('org', 'proj', host=fake_github.host, protocol='http')
+    refs = provider.get_refs()
+
+    assert refs['branches'] == {'main': 'a' * 40, 'dev': 'b' * 40}
+    assert refs['tags'] == {'1.0.0': 'd' * 40, '2.0.0': 'f' * 40}
+    assert refs['commits'] == {sha[:7]: sha for sha in ['a' * 40, 'b' * 40, 'c' * 40, 'd' * 40, 'f' * 40]}
+
+    graphql_calls = [body for method, path, body in fake_github.requests if path == '/api/graphql']
+    assert len(graphql_calls) == 2
+    assert graphql_calls[1]['variables']['withBranches'] is False
+    assert graphql_calls[1]['variables']['tagCursor'] == 't1'
+
+def test_get_refs_graphql_error(github_app, fake_github):
+    """GraphQL errors are raised instead of caching empty refs."""
+    from liteflow.utils.workflow import GitHubProvider
+    fake_github.add_repo('org', 'missing')
+    fake_github.graphql_handler = lambda variables: {
+        'data': {'repository': None},
+        'errors': [{'message': 'Could not resolve to a Repository'}]
+    }
+    provider = GitHubProvider('org', 'missing', host=fake_github.host, protocol='http')
+    with pytest.raises(RuntimeError, match='Could not resolve'):
+        provider.get_refs()
+
+def test_get_refs_rest_pages_through_github_http(github_app, fake_github, monkeypatch):
+    """Without a token, branches and tags are paged with the REST API."""
+    from liteflow.utils.workflow import GitHubProvider
+    monkeypatch.setitem(github_app.config, 'GITHUB_TOKEN', '')
+    fake_github.add_repo('org', 'proj')
+    base = '/api/v3/repos/org/proj'
+
+    def branches(handler):
+        if 'page=2' in handler.path:
+            return 200, [{'name': 'dev', 'commit': {'sha': 'b' * 40}}], None
+        return 200, [{'name': f'feature-{i}', 'commit': {'sha': 'a' * 40}} for i in range(100)], None
+
+    fake_github.rest[f'{base}/branches'] = branches
+    fake_github.rest[f'{base}/tags'] = (200, [{'name': '1.0.0', 'commit': {'sha': 'c' * 40}}], None)
+    fake_github.rest[f'{base}/commits'] = (200, [{'sha': 'a' * 40}], None)
+    provider = GitHubProvider('org', 'proj', host=fake_github.host, protocol='http')
+
+    refs = provider.get_refs()
+    assert len(refs['branches']) == 101
+    assert refs['branches']['dev'] == 'b' * 40
+    assert refs['tags'] == {'1.0.0': 'c' * 40}
+    assert set(refs['commits'].values()) == {'a' * 40, 'b' * 40, 'c' * 40}
+    assert [p for _, p, _ in fake_github.requests if p.startswith(f'{base}/branches')] == [
+        f'{base}/branches?per_page=100&page=1', f'{base}/branches?per_page=100&page=2'
+    ]
+
+def test_get_refs_rest_commits_error_is_not_cached(github_app, fake_github, monkeypatch):
+    """An error listing the commits (e.g. empty repository) fails the refs fetch."""
+    import requests
+    from liteflow.utils.workflow import GitHubProvider
+    monkeypatch.setitem(github_app.config, 'GITHUB_TOKEN', '')
+    fake_github.add_repo('org', 'empty')
+    base = '/api/v3/repos/org/empty'
+    fake_github.rest[f'{base}/branches'] = (200, [], None)
+    fake_github.rest[f'{base}/tags'] = (200, [], None)
+    fake_github.rest[f'{base}/commits'] = (409, {'message': 'Git Repository is empty.'}, None)
+    provider = GitHubProvider('org', 'empty', host=fake_github.host, protocol='http')
+
+    with pytest.raises(requests.HTTPError):
+        provider.get_refs()
+    fake_github.rest[f'{base}/commits'] = (200, [], None)
+    assert provider.get_refs() == {'branches': {}, 'tags': {}, 'commits': {}}
+
+def test_get_file_content_revalidates_with_etag(github_app, fake_github):
+    """Stale files are served immediately and revalidated with If-None-Match."""
+    import time
+    from liteflow.utils.cache import cache, stored_key
+    from liteflow.utils.workflow import GitHubProvider
+    fake_github.add_repo('org', 'proj')
+    seen = []
+
+    def contents(handler):
+        seen.append(handler.headers.get('If-None-Match'))
+        if handler.headers.get('If-None-Match') == '"v1"':
+            return 304, None, {'ETag': '"v1"'}
+        return 200, 'manifest {}', {'ETag': '"v1"'}
+
+    fake_github.rest['/api/v3/repos/org/proj/contents/nextflow.config'] = contents
+    provider = GitHubProvider('org', 'proj', host=fake_github.host, protocol='http')
+    assert provider.get_file_content('nextflow.config', 'main') == 'manifest {}'
+    assert seen == [None]
+
+    # Expire the entry: the stale value is served and refreshed in background
+    key = stored_key('github:file:org:proj:nextflow.config:main', 'github:org:proj')
+    entry = cache.get(key)
+    entry['expires_at'] = 0
+    cache.set(key, entry)
+    assert provider.get_file_content('nextflow.config', 'main') == 'manifest {}'
+    for _ in range(50):
+        if cache.get(key)['expires_at'] > time.time():
+            break
+        time.sleep(0.1)
+    assert seen == [None, '"v1"']
+    assert cache.get(key)['expires_at'] > time.time()
+
+def test_get_file_content_stale_if_error(github_app, fake_github):
+    """A stale file is still served when GitHub fails to revalidate it."""
+    import time
+    from liteflow.utils.cache import cache, stored_key
+    from liteflow.utils.workflow import GitHubProvider
+    fake_github.add_repo('org', 'proj')
+    path = '/api/v3/repos/org/proj/contents/README.md'
+    fake_github.rest[path] = (200, '# Title', {'ETag': '"r1"'})
+    provider = GitHubProvider('org', 'proj', host=fake_github.host, protocol='http')
+    assert provider.get_file_content('README.md', 'main') == '# Title'
+
+    key = stored_key('github:file:org:proj:README.md:main', 'github:org:proj')
+    entry = cache.get(key)
+    entry['expires_at'] = time.time() - 1
+    cache.set(key, entry)
+    fake_github.rest[path] = (502, {'message': 'Bad Gateway'}, None)
+    assert provider.get_file_content('README.md', 'main') == '# Title'
+    for _ in range(50):
+        if cache.get(key)['expires_at'] > time.time():
+            break
+        time.sleep(0.1)
+    assert cache.get(key)['value'] == '# Title'
+    assert provider.get_file_content('README.md', 'main') == '# Title'
+
+def test_get_file_content_stale_if_error_is_bounded(github_app, fake_github):
+    """Stale-if-error ends CACHE_STALE_TIMEOUT after the first expiry, or on a 404."""
+    import time
+    import pytest
+    from liteflow.utils.cache import cache, stored_key, _revalidate
+    from liteflow.utils.workflow import GitHubProvider
+    fake_github.add_repo('org', 'proj')
+    path = '/api/v3/repos/org/proj/contents/CHANGELOG.md'
+    fake_github.rest[path] = (200, 'content-v1', {'ETag': '"c1"'})
+    provider = GitHubProvider('org', 'proj', host=fake_github.host, protocol='http')
+    assert provider.get_file_content('CHANGELOG.md', 'main') == 'content-v1'
+    key = stored_key('github:file:org:proj:CHANGELOG.md:main', 'github:org:proj')
+    fetch = lambda validators: provider._fetch_file('CHANGELOG.md', 'main', validators)
+
+    # Failed revalidations keep the time the entry first expired
+    expired_at = time.time() - 10
+    entry = cache.get(key)
+    entry['expires_at'] = expired_at
+    cache.set(key, entry)
+    fake_github.rest[path] = (502, {'message': 'Bad Gateway'}, None)
+    assert provider.get_file_content('CHANGELOG.md', 'main') == 'content-v1'
+    for _ in range(50):
+        if cache.get(key)['expires_at'] > time.time():
+            break
+        time.sleep(0.1)
+    assert cache.get(key)['expired_at'] == expired_at
+
+    # Past the window the error is raised
+    entry = cache.get(key)
+    entry.update(expires_at=0, expired_at=time.time() - github_app.config['CACHE_STALE_TIMEOUT'] - 1)
+    cache.set(key, entry)
+    with pytest.raises(Exception):
+        _revalidate('github:file:org:proj:CHANGELOG.md:main', key, entry, fetch)
+
+    # A deleted file is stored as absent instead of served stale
+    entry.update(expires_at=0, expired_at=time.time())
+    cache.set(key, entry)
+    fake_github.rest[path] = (404, {'message': 'Not Found'}, None)
+    assert provider.get_file_content('CHANGELOG.md', 'main') == 'content-v1'
+    for _ in range(50):
+        if cache.get(key).get('error') is not None:
+            break
+        time.sleep(0.1)
+    with pytest.raises(FileNotFoundError):
+        provider.get_file_content('CHANGELOG.md', 'main')
+
+def test_get_file_content_at_commit_uses_blob_store(github_app, fake_github):
+    """Files at a full commit SHA are downloaded once, then read from disk."""
+    from liteflow.utils.cache import cache
+    from liteflow.utils.workflow import GitHubProvider
+    fake_github.add_repo('org', 'proj')
+    sha = '1' * 40
+    path = '/api/v3/repos/org/proj/contents/nextflow_schema.json'
+    fake_github.rest[path] = (200, '{"definitions": {}}', None)
+    provider = GitHubProvider('org', 'proj', host=fake_github.host, protocol='http')
+
+    assert provider.get_file_content('nextflow_schema.json', sha) == '{"definitions": {}}'
+    cache.clear()
+    assert provider.get_file_content('nextflow_schema.json', sha) == '{"definitions": {}}'
+    assert [p for _, p, _ in fake_github.requests if p.startswith(path)] == [f'{path}?ref={sha}']
+
+def test_repo_info_is_plain_data(github_app, fake_github):
+    """The cached repository is a plain dict, not a PyGithub object."""
+    from liteflow.utils.cache import cache, stored_key
+    from liteflow.utils.workflow import GitHubProvider
+    fake_github.add_repo('org', 'proj', default_branch='dev')
+    provider = GitHubProvider('org', 'proj', host=fake_github.host, protocol='http')
+
+    assert provider.get_default_branch() == 'dev'
+    entry = cache.get(stored_key('github:repo:org:proj', 'github:org:proj'))
+    assert type(entry['value']) is dict
+    assert entry['value']['full_name'] == 'org/proj'
+    assert entry['value']['pushed_at'] == '2024-01-01T00:00:00Z'
+
+def test_missing_file_is_cached_negative(github_app, fake_github):
+    """Files answering 404 are not asked again until CACHE_NEGATIVE_TIMEOUT."""
+    import pytest
+    from liteflow.utils.workflow import GitHubProvider
+    fake_github.add_repo('org', 'proj')
+    provider = GitHubProvider('org', 'proj', host=fake_github.host, protocol='http')
+    path = '/api/v3/repos/org/proj/contents/nextflow_schema.json'
+
+    for ref in ['main', '2' * 40]:
+        for _ in range(3):
+            with pytest.raises(FileNotFoundError):
+                provider.get_file_content('nextflow_schema.json', ref)
+        assert len([p for _, p, _ in fake_github.requests if p == f'{path}?ref={ref}']) == 1
@@ -0,0 +1,158 @@
+def test_recent_tags_version_order(flask_app):
+    """Recent tags are picked by version order, not by name order."""
+    from liteflow.utils.workflow.import_jobs import recent_tags
+    tags = {name: 'a' * 40 for name in ['1.9.0', '1.10.0', '1.2.0', 'v2.0']}
+    assert recent_tags(tags, 2) == ['v2.0', '1.10.0']
+    assert recent_tags(tags, 0) == []
+
+def test_import_job_records_pipeline_and_warms_refs(flask_app, monkeypatch):
+    """A job records the pipeline then loads the default branch and recent tags."""
+    from liteflow import models
+    from liteflow.utils.cache import cache
+    from liteflow.utils.workflow import registry, ImportJobManager
+    reads = []
+
+    class FakeProvider:
+        host = 'example.org'
+
+        def __init__(self, org, project, **kwargs):
+            self.org = org
+            self.project = project
+
+        def get_refs(self):
+            return {
+                'branches': {'main': 'a' * 40},
+                'tags': {'1.0': 'b' * 40, '2.0': 'c' * 40, '0.1': 'd' * 40},
+                'commits': {}
+            }
+
+        def get_default_branch(self):
+            return 'main'
+
+        def list_files(self, ref):
+            return ['README.md', 'nextflow.config']
+
+        def get_raw_file_url(self, path, ref):
+            return f"https://example.org/{ref}/{path}"
+
+        def get_file_content(self, path, ref):
+            reads.append((path, ref[0]))
+            if path == 'nextflow_schema.json':
+                raise FileNotFoundError(path)
+            return "manifest { description = 'demo' }" if path == 'nextflow.config' else '# demo'
+
+    monkeypatch.setitem(registry.PROVIDERS, 'fake', FakeProvider)
+    monkeypatch.setattr(registry, '_providers', {})
+    monkeypatch.setitem(flask_app.config, 'IMPORT_WARM_TAGS', 2)
+
+    manager = ImportJobManager(flask_app)
+    with flask_app.app_context():
+        cache.clear()
+        job = manager.submit('fake', 'org', 'warmed')
+        assert job['status'] == 'pending'
+        manager.executor.shutdown(wait=True)
+
+        job = manager.get(job['id'])
+        assert job['status'] == 'done'
+        assert (job['refs_warmed'], job['refs_to_warm']) == (3, 3)
+        assert models.Pipeline.query.filter_by(org_name='org', project_name='warmed').count() == 1
+    # Default branch and the two most recent tags, not 0.1
+    assert {ref for _, ref in reads} == {'a', 'b', 'c'}
+
+def test_bulk_import_reports_each_item(flask_app, monkeypatch):
+    """Bulk imports resolve items concurrently and record the found ones."""
+    from liteflow import models
+    from liteflow.utils.workflow import registry, ImportJobManager
+
+    class FakeProvider:
+        host = 'example.org'
+
+        def __init__(self, org, project, **kwargs):
+            self.org = org
+            self.project = project
+
+        def get_refs(self):
+            if self.project == 'missing':
+                raise FileNotFoundError(f"Repository {self.org}/{self.project} not found")
+            return {'branches': {'main': 'a' * 40}, 'tags': {}, 'commits': {}}
+
+        def get_default_branch(self):
+            return 'main'
+
+    monkeypatch.setitem(registry.PROVIDERS, 'fake', FakeProvider)
+    monkeypatch.setattr(registry, '_providers', {})
+    monkeypatch.setattr(ImportJobManager, '_warm_imported', lambda self, *args: None)
+
+    manager = ImportJobManager(flask_app)
+    with flask_app.app_context():
+        models.db.session.add(models.Pipeline(provider='fake', org_name='bulk', project_name='old'))
+        models.db.session.commit()
+        results = manager.import_many('fake', [
+            'bulk/one', 'bulk/old', 'bulk/missing', 'not-a-repo', 'bulk/two', 'bulk/one'
+        ])
+
+        assert [(result['repository'], result['status']) for result in results] == [
+            ('bulk/one', 'imported'),
+            ('bulk/old', 'exists'),
+            ('bulk/missing', 'error'),
+            ('not-a-repo', 'invalid'),
+            ('bulk/two', 'imported')
+        ]
+        assert 'not found' in results[2]['error']
+        names = {p.project_name for p in models.Pipeline.query.filter_by(org_name='bulk')}
+        assert names == {'old', 'one', 'two'}
+
+def test_import_job_stale_job_is_not_reused(flask_app, monkeypatch):
+    """An unfinished job is reused until it stops being updated."""
+    from datetime import datetime
+    from liteflow import models
+    from liteflow.utils.workflow import ImportJobManager
+    from liteflow.utils.workflow.import_jobs import STALE_JOB_AFTER
+
+    manager = ImportJobManager(flask_app)
+    monkeypatch.setattr(manager, '_run', lambda job_id: None)
+    with flask_app.app_context():
+        first = manager.submit('github', 'org', 'stale')
+        assert manager.submit('github', 'org', 'stale')['id'] == first['id']
+
+        job = models.db.session.get(models.ImportJob, first['id'])
+        models.ImportJob.query.filter_by(id=job.id).update(
+            {'updated_at': datetime.now() - STALE_JOB_AFTER * 2}
+        )
+        models.db.session.commit()
+
+        second = manager.submit('github', 'org', 'stale')
+        assert second['id'] != first['id']
+        assert second['status'] == 'pending'
+        assert manager.get(first['id'])['status'] == 'error'
+    manager.executor.shutdown(wait=True)
+
+def test_bulk_import_budget_counts_rest_calls(flask_app, fake_github, monkeypatch):
+    """Without a token, resolving a repository costs its REST calls, not the GraphQL estimate."""
+    from liteflow.utils.cache import cache
+    from liteflow.utils.github_http import github_http
+    from liteflow.utils.workflow import registry, ImportJobManager
+    monkeypatch.setitem(flask_app.config, 'GITHUB_TOKEN', '')
+    monkeypatch.setitem(flask_app.config, 'GITHUB_HOST', fake_github.host)
+    monkeypatch.setitem(flask_app.config, 'GITHUB_PROTOCOL', 'http')
+    monkeypatch.setitem(flask_app.config, 'PIPELINES_LOAD_WORKERS', 1)
+    monkeypatch.setattr(github_http, 'max_retries', 0)
+    monkeypatch.setattr(registry, '_providers', {})
+    monkeypatch.setattr(ImportJobManager, '_warm_imported', lambda self, *args: None)
+    # Five calls to spend: one repository resolved through REST (4 calls)
+    fake_github.rest['/api/v3/rate_limit'] = (200, {'resources': {
+        'core': {'remaining': flask_app.config['REFRESH_MIN_RATE_LIMIT'] + 5, 'reset': 0},
+        'graphql': {'remaining': 5000, 'reset': 0}
+    }}, None)
+    for project in ('one', 'two', 'three'):
+        fake_github.add_repo('budget', project)
+        base = f'/api/v3/repos/budget/{project}'
+        fake_github.rest[f'{base}/branches'] = (200, [{'name': 'main', 'commit': {'sha': 'a' * 40}}], None)
+        fake_github.rest[f'{base}/tags'] = (200, [], None)
+        fake_github.rest[f'{base}/commits'] = (200, [{'sha': 'a' * 40}], None)
+
+    manager = ImportJobManager(flask_app)
+    with flask_app.app_context():
+        cache.clear()
+        results = manager.import_many('github', ['budget/one', 'budget/two', 'budget/three'])
+    assert [result['status'] for result in results] == ['imported', 'skipped', 'skipped']
@@ -0,0 +1,106 @@
+import subprocess
+import pytest
+
+def git(cwd, *args):
+    subprocess.run(
+        ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+        cwd=cwd, check=True, capture_output=True
+    )
+
+@pytest.fixture
+def origin_repo(tmp_path):
+    """Local origin repository with a branch, a lightweight and an annotated tag"""
+    origin = tmp_path / 'origin'
+    origin.mkdir()
+    git(origin, 'init', '--quiet', '--initial-branch=main')
+    (origin / 'nextflow.config').write_text("manifest { description = 'v1' }\n")
+    git(origin, 'add', '.')
+    git(origin, 'commit', '--quiet', '-m', 'first')
+    git(origin, 'tag', '1.0.0')
+    (origin / 'nextflow.config').write_text("manifest { description = 'v2' }\n")
+    git(origin, 'commit', '--quiet', '-am', 'second')
+    git(origin, 'tag', '-a', '2.0.0', '-m', 'release')
+    git(origin, 'branch', 'dev')
+    return origin
+
+def rev_parse(cwd, ref):
+    return subprocess.run(
+        ['git', 'rev-parse', ref], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+def test_mirror_provider_refs_and_files(flask_app, origin_repo):
+    """Refs and file contents are served from the local bare mirror."""
+    from liteflow.utils.workflow import MirrorProvider
+    with flask_app.app_context():
+        provider = MirrorProvider('local', 'origin', remote_url=str(origin_repo))
+        assert provider.git_dir.is_dir()
+        assert provider.get_default_branch() == 'main'
+
+        refs = provider.get_refs()
+        head = rev_parse(origin_repo, 'main')
+        first = rev_parse(origin_repo, '1.0.0')
+        assert refs['branches'] == {'main': head, 'dev': head}
+        assert refs['tags'] == {'1.0.0': first, '2.0.0': head}
+        assert refs['commits'] == {head[:7]: head, first[:7]: first}
+
+        assert "'v1'" in provider.get_file_content('nextflow.config', first)
+        assert "'v2'" in provider.get_file_content('nextflow.config', '2.0.0')
+        with pytest.raises(FileNotFoundError):
+            provider.get_file_content('README.md', 'main')
+        assert provider.list_files('main') == ['nextflow.config']
+
+def test_mirror_provider_refresh_fetches_new_commits(flask_app, origin_repo):
+    """A forced refresh fetches new commits and follows the default branch."""
+    from liteflow.utils.workflow import MirrorProvider
+    with flask_app.app_context():
+        provider = MirrorProvider('local', 'refresh', remote_url=str(origin_repo))
+        assert "'v2'" in provider.get_file_content('nextflow.config', 'main')
+
+        git(origin_repo, 'checkout', '--quiet', '-b', 'next')
+        (origin_repo / 'nextflow.config').write_text("manifest { description = 'v3' }\n")
+        git(origin_repo, 'commit', '--quiet', '-am', 'third')
+
+        provider.refresh(force=True)
+        assert provider.get_default_branch() == 'next'
+        assert provider.get_refs()['branches']['next'] == rev_parse(origin_repo, 'next')
+        assert "'v3'" in provider.get_file_content('nextflow.config', 'next')
+
+def test_mirror_provider_token_not_on_command_line(flask_app, origin_repo, monkeypatch):
+    """The GitHub token is passed to git in the environment, not in argv."""
+    from liteflow.utils.workflow import mirror_provider
+    calls = []
+    run = subprocess.run
+
+    def recording_run(command, **kwargs):
+        calls.append((command, kwargs['env']))
+        return run(command, **kwargs)
+
+    monkeypatch.setitem(flask_app.config, 'GITHUB_TOKEN', 'secret-token')
+    monkeypatch.setattr(mirror_provider.subprocess, 'run', recording_run)
+    with flask_app.app_context():
+        mirror_provider.MirrorProvider('local', 'token', remote_url=str(origin_repo))
+
+    assert calls
+    for command, env in calls:
+        assert not any('Authorization' in arg for arg in command)
+        assert env['GIT_CONFIG_KEY_0'] == 'http.extraHeader'
+        assert env['GIT_CONFIG_VALUE_0'].startswith('Authorization: Basic ')
+
+def test_mirror_provider_fetches_again_once_stale(flask_app, origin_repo):
+    """Reads fetch the mirror again once it is older than the refresh interval."""
+    import os
+    from liteflow.utils.workflow import MirrorProvider
+    with flask_app.app_context():
+        provider = MirrorProvider('local', 'stale', remote_url=str(origin_repo))
+        assert "'v2'" in provider.get_file_content('nextflow.config', 'main')
+
+        (origin_repo / 'nextflow.config').write_text("manifest { description = 'v3' }\n")
+        git(origin_repo, 'commit', '--quiet', '-am', 'third')
+        # Still fresh: the mirror is not fetched
+        assert "'v2'" in provider.get_file_content('nextflow.config', 'main')
+
+        for marker in ('FETCH_HEAD', 'HEAD'):
+            if (provider.git_dir / marker).exists():
+                os.utime(provider.git_dir / marker, (0, 0))
+        assert provider.get_refs()['branches']['main'] == rev_parse(origin_repo, 'main')
+        assert "'v3'" in provider.get_file_content('nextflow.config', 'main')
@@ -0,0 +1,73 @@
+CONFIG = r'''
+params {
+    input  = null   // samplesheet { csv }
+    outdir = 'results'
+    title  = "Report {of} \"runs\""
+    genome = params.igenomes_ignore ? null :
+        'GRCh38'
+    tools  = ['fastqc', "multiqc"]
+    max_cpus = 16
+}
+params.extra = true
+
+try { includeConfig "${params.custom_config_base}/nfcore_custom.config" } catch (Exception e) { }
+
+profiles {
+    debug { dumpHashes = true; process.beforeScript = 'echo $HOSTNAME' }
+    docker {
+        docker.enabled = true
+        docker.runOptions = '-u $(id -u):$(id -g)'
+    }
+    test { includeConfig 'conf/test.config' }
+}
+
+process {
+    withName: 'FASTQC' {
+        ext.args = { "--quiet" }
+    }
+}
+
+manifest {
+    name            = 'nf-core/demo'
+    author          = 'A. Author'
+    homePage        = 'https://github.com/nf-core/demo'
+    description     = """A pipeline with {braces} in its description"""
+    nextflowVersion = '!>=23.04.0'
+    version         = '1.0.0'
+}
+manifest.defaultBranch = 'dev'
+'''
+
+def test_parse_nf_config(flask_app):
+    """Manifest, params defaults and profiles are extracted in one pass."""
+    from liteflow.utils.nf import parse_nf_config
+    config = parse_nf_config(CONFIG)
+
+    assert config['manifest'] == {
+        'name': 'nf-core/demo',
+        'version': '1.0.0',
+        'homePage': 'https://github.com/nf-core/demo',
+        'defaultBranch': 'dev',
+        'author': 'A. Author',
+        'description': 'A pipeline with {braces} in its description',
+        'nextflowVersion': '!>=23.04.0'
+    }
+    assert config['params'] == {
+        'input': None,
+        'outdir': 'results',
+        'title': 'Report {of} "runs"',
+        'genome': "params.igenomes_ignore ? null :\n        'GRCh38'",
+        'tools': ['fastqc', 'multiqc'],
+        'max_cpus': 16,
+        'extra': True
+    }
+    assert config['profiles'] == ['debug', 'docker', 'test']
+
+def test_parse_nf_config_defaults(flask_app):
+    """Manifest fields default to empty strings."""
+    from liteflow.utils.nf import parse_nf_config
+    config = parse_nf_config("manifest.description = 'Only a description'\n")
+    assert config['manifest']['description'] == 'Only a description'
+    assert config['manifest']['nextflowVersion'] == ''
+    assert config['params'] == {}
+    assert config['profiles'] == []
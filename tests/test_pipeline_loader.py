@@ -0,0 +1,30 @@
+def test_load_page_orders_and_paginates(flask_app, monkeypatch):
+    """Pipelines are listed by organization and name, one page at a time."""
+    from liteflow import models
+    from liteflow.utils.workflow import PipelineLoader
+    loader = PipelineLoader(flask_app)
+    monkeypatch.setattr(loader, 'load_summary', lambda provider_name, org, project: {
+        'organization': org, 'project': project, 'status': 'ready'
+    })
+    with flask_app.app_context():
+        rows = [
+            models.Pipeline(provider='github', org_name=org, project_name=project)
+            for org, project in [('zeta', 'a'), ('alpha', 'b'), ('alpha', 'a')]
+        ]
+        models.db.session.add_all(rows)
+        models.db.session.commit()
+        try:
+            # Other tests may have left pipelines
+            expected = sorted((p.org_name, p.project_name) for p in models.Pipeline.query.all())
+            pages = [loader.load_page(page=page, per_page=2) for page in range(1, (len(expected) + 1) // 2 + 1)]
+        finally:
+            for row in rows:
+                models.db.session.delete(row)
+            models.db.session.commit()
+
+    listed = [(p['organization'], p['project']) for page in pages for p in page['pipelines']]
+    assert listed == expected
+    assert all(page['total'] == len(expected) for page in pages)
+    assert [page['has_more'] for page in pages] == [True] * (len(pages) - 1) + [False]
+    # Summaries leave refs to /api/pipelines/<org>/<project>/refs
+    assert 'refs' not in loader._placeholder(rows[0], 'loading')
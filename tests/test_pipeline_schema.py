@@ -0,0 +1,51 @@
+import json
+
+SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "$defs": {
+        "input_output_options": {
+            "type": "object",
+            "required": ["outdir"],
+            "properties": {
+                "outdir": {"type": "string", "format": "directory-path"},
+                "mode": {"type": "string", "enum": ["fast", "full"]}
+            }
+        }
+    },
+    "allOf": [{"$ref": "#/$defs/input_output_options"}]
+}
+
+class FakeRepo:
+    repo_id = 'github.com/org/proj'
+
+    def __init__(self):
+        self.fetches = 0
+
+    def fetch_file(self, path, ref):
+        self.fetches += 1
+        return json.dumps(SCHEMA)
+
+def test_schema_parsed_once_per_commit(flask_app):
+    """The processed schema is shared by every lookup of a commit."""
+    from liteflow.utils.workflow.schema import get_pipeline_schema
+    repo = FakeRepo()
+    first = get_pipeline_schema(repo, 'c' * 40)
+    assert get_pipeline_schema(repo, 'c' * 40) is first
+    assert repo.fetches == 1
+    assert first.schema['definitions'] is first.schema['$defs']
+
+    # Mutable refs are not memoized
+    get_pipeline_schema(repo, 'main')
+    get_pipeline_schema(repo, 'main')
+    assert repo.fetches == 3
+
+def test_schema_validates_parameters(flask_app):
+    """Parameters are checked against the definitions referenced by allOf."""
+    from liteflow.utils.workflow.schema import get_pipeline_schema
+    schema = get_pipeline_schema(FakeRepo(), 'd' * 40)
+
+    assert schema.validate({'outdir': 'results', 'mode': 'fast'}) == []
+    errors = schema.validate({'mode': 'slow'})
+    assert len(errors) == 2
+    assert any(error.startswith('mode:') for error in errors)
+    assert schema.validate({'mode': 'full'}, allow_missing=True) == []
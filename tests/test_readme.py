@@ -0,0 +1,58 @@
+README = """# Pipeline
+
+<h1><picture><source srcset="docs/images/logo_dark.png 2x" media="(prefers-color-scheme: dark)"><img alt="logo" src="docs/images/logo.png"></picture></h1>
+
+See the [usage](docs/usage.md), the [parameters](#parameters), [nf-core](https://nf-co.re)
+and ![metro map](./docs/images/metro.png) or <a href="/CITATIONS.md">citations</a>.
+"""
+
+class FakeProvider:
+    host = 'github.com'
+    org = 'org'
+    project = 'proj'
+
+    def __init__(self, files):
+        self.files = files
+        self.reads = []
+
+    def list_files(self, ref):
+        return list(self.files)
+
+    def get_file_content(self, path, ref):
+        self.reads.append(path)
+        if path not in self.files:
+            raise FileNotFoundError(path)
+        return self.files[path]
+
+    def get_raw_file_url(self, path, ref):
+        return f"https://raw.example/{ref}/{path}"
+
+def test_readme_links_rewritten_while_rendering(flask_app):
+    """Relative links of markdown and raw HTML point to raw files."""
+    from liteflow.utils.workflow.git_repo import GitRepo
+    provider = FakeProvider({'Readme.md': README, 'main.nf': ''})
+    html = GitRepo(provider).render_readme('main')
+
+    assert provider.reads == ['Readme.md']
+    assert 'href="https://raw.example/main/docs/usage.md"' in html
+    assert 'src="https://raw.example/main/docs/images/metro.png"' in html
+    assert 'srcset="https://raw.example/main/docs/images/logo_dark.png 2x"' in html
+    assert 'src="https://raw.example/main/docs/images/logo.png"' in html
+    assert 'href="https://raw.example/main/CITATIONS.md"' in html
+    assert 'href="#parameters"' in html
+    assert 'href="https://nf-co.re"' in html
+
+def test_readme_rendered_once_per_commit(flask_app):
+    """The rendered README of a commit is served from the cache."""
+    from liteflow.utils.cache import cache, lookup_cache, CACHE_HIT
+    from liteflow.utils.workflow.git_repo import GitRepo
+    provider = FakeProvider({'README.md': '# Title'})
+    repo = GitRepo(provider)
+    with flask_app.app_context():
+        cache.clear()
+        first = repo.get_readme_processed('e' * 40)
+        assert repo.get_readme_processed('e' * 40) == first
+        assert provider.reads == ['README.md']
+        assert GitRepo(FakeProvider({'main.nf': ''})).get_readme_processed('f' * 40) == ''
+        # No README at a commit is final: cached as an empty rendering
+        assert lookup_cache(f"readme:github.com/org/proj:{'f' * 40}") == (CACHE_HIT, '', None)
@@ -0,0 +1,42 @@
+import pytest
+
+def test_abbreviate_lengthens_colliding_prefixes(flask_app):
+    """Commits sharing their first 7 characters get longer short SHAs."""
+    from liteflow.utils.workflow.ref_index import abbreviate
+    shas = ['abcdef1' + '0' * 33, 'abcdef1' + '1' * 33, '1234567' + '0' * 33]
+    assert abbreviate(shas) == {
+        'abcdef10': shas[0],
+        'abcdef11': shas[1],
+        '1234567': shas[2]
+    }
+
+def test_index_refs_and_resolve_prefix(flask_app):
+    """Indexed commits resolve from any unambiguous prefix."""
+    from liteflow import models
+    from liteflow.utils.workflow.ref_index import AmbiguousRefError, index_refs, resolve_prefix
+    first, second, tag = 'abcd1' + '0' * 35, 'abcd2' + '0' * 35, 'ffff' + '0' * 36
+    refs = {
+        'branches': {'main': first, 'dev': second},
+        'tags': {'1.0': tag},
+        'commits': {'abcd1': first, 'abcd2': second, 'ffff': tag}
+    }
+    with flask_app.app_context():
+        assert index_refs('example.org/org/indexed', refs)
+        assert not index_refs('example.org/org/indexed', refs)  # Unchanged
+
+        assert resolve_prefix('example.org/org/indexed', 'ABCD1') == first
+        assert resolve_prefix('example.org/org/indexed', 'abcd2000') == second
+        assert resolve_prefix('example.org/org/indexed', 'eeee') is None
+        with pytest.raises(AmbiguousRefError):
+            resolve_prefix('example.org/org/indexed', 'abcd')
+        with pytest.raises(ValueError):
+            resolve_prefix('example.org/org/indexed', 'abc')
+
+        # Deleted branches are dropped, known commits are kept
+        refs = {'branches': {'main': second}, 'tags': {}, 'commits': {'abcd2': second}}
+        assert index_refs('example.org/org/indexed', refs)
+        rows = models.PipelineRef.query.filter_by(repo='example.org/org/indexed')
+        assert {(row.kind, row.name) for row in rows} == {
+            ('branch', 'main'), ('commit', first), ('commit', second), ('commit', tag)
+        }
+        assert resolve_prefix('example.org/org/indexed', 'ffff') == tag
@@ -0,0 +1,100 @@
+import pytest
+
+@pytest.fixture
+def scheduled_pipelines(flask_app):
+    """Two imported pipelines, removed after the test"""
+    from liteflow import models
+    with flask_app.app_context():
+        rows = [
+            models.Pipeline(provider='github', org_name='org', project_name='ok'),
+            models.Pipeline(provider='github', org_name='org', project_name='broken')
+        ]
+        models.db.session.add_all(rows)
+        models.db.session.commit()
+        yield rows
+        for row in rows:
+            models.db.session.delete(row)
+        models.db.session.commit()
+
+def test_refresh_scheduler_run_once(flask_app, scheduled_pipelines, monkeypatch):
+    """Each pipeline is refreshed and its outcome recorded in the status."""
+    from liteflow.utils.workflow import RefreshScheduler
+    from liteflow.utils.workflow import refresh_scheduler as module
+    refreshed = []
+
+    class FakeProvider:
+        def __init__(self, provider_name, org, project):
+            self.project = project
+
+        def get_rate_limit(self):
+            return {'remaining': 5000, 'reset': 0}
+
+        def refresh(self):
+            if self.project == 'broken':
+                raise RuntimeError('boom')
+            refreshed.append(self.project)
+
+    monkeypatch.setattr(module, 'get_provider', FakeProvider)
+    monkeypatch.setattr(module, 'PIPELINE_SPREAD', 0)
+    scheduler = RefreshScheduler(flask_app)
+    monkeypatch.setattr(scheduler.loader, 'load_summary', lambda *args: None)
+    monkeypatch.setattr(scheduler.commit_history, 'sync', lambda *args: None)
+    monkeypatch.setattr(scheduler.search_index, 'update', lambda *args: None)
+
+    status = scheduler.run_once()
+    # Other tests may have left pipelines, of any provider
+    assert [project for project in refreshed if project in ('ok', 'broken')] == ['ok']
+    assert status['pipelines']['org/ok']['error'] is None
+    assert status['pipelines']['org/broken']['error'] == 'boom'
+    assert status['pipelines']['org/broken']['failures'] == 1
+
+    status = scheduler.run_once()
+    assert status['pipelines']['org/broken']['failures'] == 2
+    assert RefreshScheduler(flask_app).status() == status
+
+def test_refresh_scheduler_stops_on_low_quota(flask_app, scheduled_pipelines, monkeypatch):
+    """The cycle stops when the remaining quota is under the threshold."""
+    from liteflow.utils.workflow import RefreshScheduler
+    from liteflow.utils.workflow import refresh_scheduler as module
+
+    class LowQuotaProvider:
+        def __init__(self, provider_name, org, project):
+            pass
+
+        def get_rate_limit(self):
+            return {'remaining': 1, 'reset': 2000000000}
+
+        def refresh(self):
+            raise AssertionError('should not refresh')
+
+    monkeypatch.setattr(module, 'get_provider', LowQuotaProvider)
+    status = RefreshScheduler(flask_app).run_once()
+    assert status['rate_limited_until'] is not None
+
+def test_refresh_scheduler_shares_pipeline_loader(flask_app):
+    """The scheduler reuses the loader of the app instead of its own pool."""
+    from liteflow.utils.workflow import RefreshScheduler
+    assert RefreshScheduler(flask_app).loader is flask_app.extensions['pipeline_loader']
+    assert isinstance(flask_app.extensions['refresh_scheduler'], RefreshScheduler)
+
+def test_refresh_scheduler_refreshes_mirrors(flask_app, monkeypatch):
+    """Mirror pipelines are refreshed too, without asking for the API quota."""
+    from liteflow import models
+    from liteflow.utils.workflow import RefreshScheduler
+    from liteflow.utils.workflow import refresh_scheduler as module
+    refreshed = []
+
+    class FakeMirror:
+        def __init__(self, provider_name, org, project):
+            self.provider_name = provider_name
+
+        def refresh(self):
+            refreshed.append(self.provider_name)
+
+    monkeypatch.setattr(module, 'get_provider', FakeMirror)
+    scheduler = RefreshScheduler(flask_app)
+    monkeypatch.setattr(scheduler.loader, 'load_summary', lambda *args: None)
+    monkeypatch.setattr(scheduler.commit_history, 'sync', lambda *args: None)
+    monkeypatch.setattr(scheduler.search_index, 'update', lambda *args: None)
+    scheduler.refresh_pipeline(models.Pipeline(provider='mirror', org_name='org', project_name='mirrored'))
+    assert refreshed == ['mirror']
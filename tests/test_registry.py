@@ -0,0 +1,69 @@
+def test_identity_map_reuses_providers_and_refs(flask_app, monkeypatch):
+    """One provider per repository per process, refs loaded once per request."""
+    from liteflow.utils.workflow import registry, get_provider, get_git_repo
+    calls = []
+
+    class CountingProvider:
+        host = 'example.org'
+
+        def __init__(self, org, project, **kwargs):
+            calls.append(('init', org, project))
+            self.org = org
+            self.project = project
+
+        def get_refs(self):
+            calls.append(('refs',))
+            return {'branches': {'main': 'a' * 40}, 'tags': {}, 'commits': {'aaaaaaa': 'a' * 40}}
+
+    monkeypatch.setitem(registry.PROVIDERS, 'counting', CountingProvider)
+    monkeypatch.setattr(registry, '_providers', {})
+
+    with flask_app.app_context():
+        repo = get_git_repo('counting', 'org', 'proj')
+        assert get_git_repo('counting', 'org', 'proj') is repo
+        assert repo.resolve_ref('main', 'branch') == 'a' * 40
+        assert repo.resolve_ref('aaaaaaa', 'commit') == 'a' * 40
+        assert repo.get_refs()['tags'] == {}
+    with flask_app.app_context():
+        other = get_git_repo('counting', 'org', 'proj')
+        assert other is not repo
+        assert other.provider is repo.provider is get_provider('counting', 'org', 'proj')
+        other.get_refs()
+
+    assert calls == [('init', 'org', 'proj'), ('refs',), ('refs',)]
+
+def test_slow_provider_creation_does_not_block_others(flask_app, monkeypatch):
+    """A provider being created (e.g. a mirror clone) only blocks its own repository."""
+    import threading
+    from liteflow.utils.workflow import registry, get_provider
+    release = threading.Event()
+    started = threading.Event()
+    created = []
+
+    class SlowProvider:
+        def __init__(self, org, project, **kwargs):
+            created.append(project)
+            if project == 'slow':
+                started.set()
+                assert release.wait(10)
+
+    monkeypatch.setitem(registry.PROVIDERS, 'slow', SlowProvider)
+    monkeypatch.setattr(registry, '_providers', {})
+    results = []
+
+    def get(project):
+        with flask_app.app_context():
+            results.append(get_provider('slow', 'org', project))
+
+    threads = [threading.Thread(target=get, args=('slow',)) for _ in range(2)]
+    threads[0].start()
+    assert started.wait(10)
+    threads[1].start()
+    with flask_app.app_context():
+        assert get_provider('slow', 'org', 'fast') is not None
+    release.set()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(results) == 2 and results[0] is results[1]
+    assert sorted(created) == ['fast', 'slow']
@@ -0,0 +1,81 @@
+def test_diff_schemas_and_migrate_parameters(flask_app):
+    """Parameters are compared across groups and run parameters migrated."""
+    from liteflow.utils.workflow.schema_diff import diff_schemas, migrate_parameters
+    old = {'definitions': {
+        'io': {'properties': {
+            'input': {'type': 'string'},
+            'outdir': {'type': 'string'},
+            'legacy': {'type': 'boolean'}
+        }},
+        'options': {'properties': {
+            'max_cpus': {'type': 'string', 'default': '4'},
+            'aligner': {'type': 'string', 'default': 'star'}
+        }}
+    }}
+    new = {'definitions': {
+        'io': {'required': ['outdir'], 'properties': {
+            'input': {'type': 'string'},
+            'outdir': {'type': 'string'},
+            'genome': {'type': 'string'}
+        }},
+        'options': {'required': ['sample_sheet'], 'properties': {
+            'max_cpus': {'type': 'integer', 'default': 4},
+            'aligner': {'type': 'string', 'default': 'star_salmon'},
+            'sample_sheet': {'type': 'string'}
+        }}
+    }}
+    diff = diff_schemas(old, new)
+    assert [param['name'] for param in diff['added']] == ['genome', 'sample_sheet']
+    assert [param['name'] for param in diff['removed']] == ['legacy']
+    assert {param['name']: set(param['changes']) for param in diff['changed']} == {
+        'aligner': {'default'},
+        'max_cpus': {'type', 'default'},
+        'outdir': {'required'}
+    }
+    assert diff['unchanged'] == 1
+
+    parameters, changes = migrate_parameters(
+        {'input': 'a.csv', 'outdir': 'out', 'legacy': True, 'max_cpus': '8', 'aligner': 'star'},
+        diff
+    )
+    assert parameters == {'input': 'a.csv', 'outdir': 'out', 'max_cpus': 8, 'aligner': 'star_salmon'}
+    assert {(change['name'], change['action']) for change in changes} == {
+        ('legacy', 'removed'), ('max_cpus', 'converted'), ('aligner', 'default'),
+        ('sample_sheet', 'required')
+    }
+
+def test_schema_diff_is_memoized_per_commit_pair(flask_app):
+    """The diff of two full SHAs is computed once."""
+    import json
+    from liteflow.utils.workflow.git_repo import GitRepo
+    from liteflow.utils.workflow.schema_diff import get_schema_diff
+    reads = []
+
+    class FakeProvider:
+        host = 'example.org'
+        org = 'org'
+        project = 'diffed'
+
+        def get_file_content(self, path, ref):
+            reads.append((path, ref))
+            if path == 'nextflow.config':
+                return "manifest { nextflowVersion = '!>=%s' }" % ('23.04' if ref[0] == 'a' else '24.04')
+            return json.dumps({'properties': {'input': {'type': 'string'}, ref[0]: {'type': 'string'}}})
+
+    repo = GitRepo(FakeProvider())
+    with flask_app.app_context():
+        diff = get_schema_diff(repo, 'a' * 40, 'b' * 40)
+        assert [param['name'] for param in diff['added']] == ['b']
+        assert diff['nextflow_version'] == {'from': '!>=23.04', 'to': '!>=24.04'}
+        count = len(reads)
+        assert get_schema_diff(repo, 'a' * 40, 'b' * 40) is diff
+        assert len(reads) == count
+
+def test_migrate_parameters_drops_removed_default(flask_app):
+    """A value left at a default that no longer exists is unset, not null."""
+    from liteflow.utils.workflow.schema_diff import diff_schemas, migrate_parameters
+    old = {'properties': {'genome': {'type': 'string', 'default': 'GRCh38'}}}
+    new = {'properties': {'genome': {'type': 'string'}}}
+    parameters, changes = migrate_parameters({'genome': 'GRCh38'}, diff_schemas(old, new))
+    assert parameters == {}
+    assert [(change['name'], change['action']) for change in changes] == [('genome', 'default')]
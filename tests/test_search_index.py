@@ -0,0 +1,71 @@
+def test_match_query_drops_fts_syntax(flask_app):
+    """User input becomes quoted prefix terms, optionally on one column."""
+    from liteflow.utils.workflow.search_index import match_query
+    assert match_query('--genome ONT') == '"genome"* "ONT"*'
+    assert match_query('genome', 'params') == 'params : ("genome"*)'
+    assert match_query('"*()') is None
+
+def test_search_index_update_and_search(flask_app, monkeypatch):
+    """Pipelines are indexed per ref, reindexed only when their commit changes."""
+    import json
+    from liteflow.utils.workflow import registry, SearchIndex
+    refs = {
+        'branches': {'main': 'a' * 40},
+        'tags': {'1.0': 'b' * 40, '1.1': 'c' * 40},
+        'commits': {}
+    }
+    reads = []
+
+    class FakeProvider:
+        host = 'example.org'
+
+        def __init__(self, org, project, **kwargs):
+            self.org = org
+            self.project = project
+
+        def get_refs(self):
+            return refs
+
+        def get_default_branch(self):
+            return 'main'
+
+        def list_files(self, ref):
+            return ['README.md']
+
+        def get_raw_file_url(self, path, ref):
+            return f"https://example.org/{ref}/{path}"
+
+        def get_file_content(self, path, ref):
+            reads.append((path, ref))
+            if path == 'nextflow.config':
+                return "manifest { description = 'Variant calling' }\nparams { outdir = null }"
+            if path == 'nextflow_schema.json':
+                return json.dumps({'definitions': {'reference': {'properties': {
+                    'genome': {'type': 'string', 'description': 'Reference genome <b>name</b>'}
+                }}}})
+            return f"# Searched\n\nSupports ONT reads at {ref[0]}."
+
+    monkeypatch.setitem(registry.PROVIDERS, 'fake', FakeProvider)
+    monkeypatch.setattr(registry, '_providers', {})
+    search_index = SearchIndex(flask_app)
+    with flask_app.app_context():
+        assert search_index.create_table()
+        # Default branch and latest tag
+        assert search_index.update('fake', 'org', 'searched') == 2
+        assert search_index.update('fake', 'org', 'searched') == 0
+
+        results = search_index.search('--genome', field='params')
+        assert {(r['project'], r['ref_type'], r['ref']) for r in results} == {
+            ('searched', 'branch', 'main'), ('searched', 'tag', '1.1')
+        }
+        assert '<mark>genome</mark>' in results[0]['snippet']
+        assert '&lt;b&gt;' in results[0]['snippet']  # Indexed text is escaped
+        assert search_index.search('genome', field='readme') == []
+        assert [r['ref'] for r in search_index.search('variant')]
+
+        # A new tag replaces the previous latest one, the branch is kept
+        refs['tags']['1.2'] = 'd' * 40
+        reads.clear()
+        assert search_index.update('fake', 'org', 'searched') == 1
+        assert {ref for _, ref in reads} == {'d' * 40}
+        assert {r['ref'] for r in search_index.search('ONT')} == {'main', '1.2'}